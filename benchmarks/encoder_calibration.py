@@ -0,0 +1,92 @@
+# encoder_calibration.py
+"""
+Encoder profile calibration.
+
+Encodes one sample clip with every encoder profile on this machine and reports
+encode speed against output size, so a profile can be picked on evidence:
+
+    python -m benchmarks.encoder_calibration
+    python -m benchmarks.encoder_calibration --sample my_clip.mp4 --seconds 5
+
+Results go to encoder_calibration.json in the working directory, where HunyClip
+shows them next to the profile names. Without --sample a testsrc2 clip is
+generated; synthetic patterns compress unusually well, so real footage gives
+better size numbers. Needs ffmpeg on PATH.
+"""
+import argparse, json, os, shutil, sys, tempfile, time
+import ffmpeg
+
+from benchmarks.export_benchmark import generate_source, git_commit
+from scripts.encoder_profiles import ENCODER_PROFILES, CALIBRATION_FILE, encoder_settings
+
+
+def calibrate(sample_path, work_dir, seconds):
+    probe = ffmpeg.probe(sample_path, select_streams='v:0', count_packets=None,
+                         show_entries='stream=width,height,nb_read_packets')['streams'][0]
+    width, height = int(probe['width']), int(probe['height'])
+    results = []
+    for name in ENCODER_PROFILES:
+        output_args, container, _ = encoder_settings(name)
+        output_path = os.path.join(work_dir, f"calibration_{len(results)}{container or os.path.splitext(sample_path)[1]}")
+        start = time.perf_counter()
+        try:
+            (
+                ffmpeg.input(sample_path, t=seconds)
+                .output(output_path, an=None, map_metadata='-1', **output_args)
+                .run(overwrite_output=True, quiet=True)
+            )
+        except ffmpeg.Error as e:
+            lines = e.stderr.decode('utf8', errors='replace').strip().splitlines() if e.stderr else []
+            results.append({"profile": name, "error": lines[-1] if lines else str(e)})
+            continue
+        wall = time.perf_counter() - start
+        frames = int(ffmpeg.probe(output_path, select_streams='v:0', count_packets=None,
+                                  show_entries='stream=nb_read_packets')['streams'][0]['nb_read_packets'])
+        size = os.path.getsize(output_path)
+        results.append({
+            "profile": name,
+            "fps": round(frames / wall, 1) if wall > 0 else None,
+            "wall_s": round(wall, 3),
+            "bytes": size,
+            "bits_per_pixel": round(size * 8 / (width * height * frames), 4) if frames else None,
+        })
+    return {"width": width, "height": height, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure every HunyClip encoder profile on this machine.")
+    parser.add_argument("--sample", help="Clip to encode; a testsrc2 clip is generated when omitted")
+    parser.add_argument("--seconds", type=float, default=4, help="Length of the sample to encode")
+    parser.add_argument("--width", type=int, default=1920, help="Generated sample width")
+    parser.add_argument("--height", type=int, default=1080, help="Generated sample height")
+    parser.add_argument("--out", default=CALIBRATION_FILE, help="JSON file to write results to")
+    args = parser.parse_args(argv)
+
+    if shutil.which("ffmpeg") is None:
+        print("ffmpeg was not found on PATH.")
+        return 1
+
+    work_dir = tempfile.mkdtemp(prefix="hunyclip_calibration_")
+    try:
+        sample = args.sample or generate_source(work_dir, "sample", args.width, args.height, 30,
+                                                max(1, round(args.seconds)), "libx264", 30)
+        report = calibrate(sample, work_dir, args.seconds)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"\n{'profile':20} {'fps':>8} {'MB':>8} {'bits/px':>8}")
+    for r in report["results"]:
+        if "error" in r:
+            print(f"{r['profile']:20} failed: {r['error']}")
+            continue
+        print(f"{r['profile']:20} {r['fps'] or 0:8.1f} {r['bytes'] / 1e6:8.2f} {r['bits_per_pixel'] or 0:8.4f}")
+
+    report.update(commit=git_commit(), sample=args.sample or "testsrc2", cpu_count=os.cpu_count())
+    with open(args.out, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nWrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# export_benchmark.py
+"""
+Export benchmark with synthetic sources.
+
+Generates test videos locally with ffmpeg's lavfi `testsrc2`, runs the
+VideoExporter paths headlessly and writes timings to a JSON file that can be
+compared across commits:
+
+    python -m benchmarks.export_benchmark --out bench_export.json
+    python -m benchmarks.export_benchmark --quick --compare bench_export.json
+
+Needs ffmpeg on PATH and the packages from requirements.txt; no display or network.
+"""
+import argparse, contextlib, io, json, multiprocessing, os, platform, resource, shutil, subprocess, sys, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+import ffmpeg
+
+from scripts.video_exporter import VideoExporter
+from scripts.encoder_profiles import ENCODER_PROFILES, DEFAULT_ENCODER_PROFILE
+
+# (name, width, height, fps, seconds, codec, gop)
+SOURCES = [
+    ("360p_h264_gop12", 640, 360, 30, 4, "libx264", 12),
+    ("720p_mpeg4_gop30", 1280, 720, 25, 4, "mpeg4", 30),
+    ("1080p_h264_gop250", 1920, 1080, 30, 8, "libx264", 250),
+    ("1080p_h264_gop24_60fps", 1920, 1080, 60, 4, "libx264", 24),
+    ("2160p_h264_gop60", 3840, 2160, 30, 3, "libx264", 60),
+]
+QUICK_SOURCES = ["360p_h264_gop12", "1080p_h264_gop250"]
+
+# (mode name, export_cropped, export_uncropped, export_image)
+MODES = [
+    ("cropped", True, False, False),
+    ("uncropped", False, True, False),
+    ("image", False, False, True),
+    ("cropped+uncropped", True, True, False),
+    ("all", True, True, True),
+]
+
+
+def generate_source(folder, name, width, height, fps, seconds, codec, gop):
+    path = os.path.join(folder, f"{name}.mp4")
+    if not os.path.exists(path):
+        (
+            ffmpeg.input(f"testsrc2=size={width}x{height}:rate={fps}:duration={seconds}", f="lavfi")
+            .output(path, vcodec=codec, g=gop, pix_fmt="yuv420p")
+            .run(overwrite_output=True, quiet=True)
+        )
+    return path
+
+
+def headless_session(folder, source_path, width, height, fps, seconds, trim_length, longest_edge,
+                     encoder_profile=DEFAULT_ENCODER_PROFILE):
+    """Minimal stand-in for the VideoCropper state that VideoExporter reads."""
+    display_name = os.path.basename(source_path)
+    frame_count = fps * seconds
+    return SimpleNamespace(
+        folder_path=folder,
+        video_files=[{
+            "original_path": source_path,
+            "display_name": display_name,
+            "copy_number": 0,
+            "export_enabled": True,
+        }],
+        crop_regions={display_name: (width // 4, height // 4, width // 2, height // 2)},
+        trim_points={display_name: max(0, frame_count // 2 - trim_length // 2)},
+        trim_length=trim_length,
+        longest_edge=longest_edge,
+        simple_caption="benchmark caption",
+        export_prefix="",
+        encoder_profile=encoder_profile,
+    )
+
+
+def planned_frames(jobs):
+    """Frames a planned export writes: the window of every video output and one per still."""
+    return sum(len(job["outputs"]) if job["kind"] == "stills" else job["expected_frames"] for job in jobs)
+
+
+def measure(fn):
+    """Run fn and return wall time, CPU seconds (self + ffmpeg children) and peak RSS in MB."""
+    before_self = resource.getrusage(resource.RUSAGE_SELF)
+    before_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    fn()
+    wall = time.perf_counter() - start
+    after_self = resource.getrusage(resource.RUSAGE_SELF)
+    after_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = sum(
+        (getattr(after, field) - getattr(before, field))
+        for before, after in ((before_self, after_self), (before_children, after_children))
+        for field in ("ru_utime", "ru_stime")
+    )
+    # ru_maxrss is in KiB on Linux and is a running maximum over the process (and over its
+    # children). Runs go through export_once in a fresh process, so both belong to one case.
+    peak_rss = max(after_self.ru_maxrss, after_children.ru_maxrss) / 1024
+    return wall, cpu, peak_rss
+
+
+def export_once(session, flags):
+    """Run one export in this (fresh) process and return measure()'s (wall, cpu, peak RSS)."""
+    exporter = VideoExporter(session)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return measure(lambda: exporter.run_export(*flags))
+
+
+def run_case(work_dir, source, mode, trim_length, longest_edge, repeat, encoder_profile=DEFAULT_ENCODER_PROFILE):
+    name, width, height, fps, seconds, codec, gop = source
+    mode_name, export_cropped, export_uncropped, export_image = mode
+    source_path = generate_source(os.path.join(work_dir, "sources"), *source)
+    planner = VideoExporter(headless_session(os.path.join(work_dir, "out"), source_path, width, height, fps,
+                                             seconds, trim_length, longest_edge, encoder_profile))
+    frames = planned_frames(planner.plan_jobs(export_cropped, export_uncropped, export_image))
+
+    runs = []
+    for _ in range(repeat):
+        out_dir = os.path.join(work_dir, "out", f"{name}_{mode_name}")
+        shutil.rmtree(out_dir, ignore_errors=True)
+        os.makedirs(out_dir)
+        session = headless_session(out_dir, source_path, width, height, fps, seconds, trim_length, longest_edge,
+                                   encoder_profile)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            runs.append(pool.submit(export_once, session, (export_cropped, export_uncropped, export_image)).result())
+
+    wall = min(r[0] for r in runs)
+    return {
+        "source": name,
+        "codec": codec,
+        "resolution": f"{width}x{height}",
+        "fps": fps,
+        "gop": gop,
+        "mode": mode_name,
+        "frames": frames,
+        "wall_s": round(wall, 4),
+        "frames_per_s": round(frames / wall, 2) if wall > 0 else None,
+        "cpu_s": round(min(r[1] for r in runs), 4),
+        "peak_rss_mb": round(max(r[2] for r in runs), 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, "r") as file:
+        baseline = {(r["source"], r["mode"]): r for r in json.load(file)["results"]}
+    print(f"\n{'source':28} {'mode':20} {'wall_s':>9} {'baseline':>9} {'change':>8}")
+    for r in results:
+        old = baseline.get((r["source"], r["mode"]))
+        if not old:
+            continue
+        change = (r["wall_s"] - old["wall_s"]) / old["wall_s"] * 100 if old["wall_s"] else 0.0
+        print(f"{r['source']:28} {r['mode']:20} {r['wall_s']:9.3f} {old['wall_s']:9.3f} {change:+7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HunyClip export paths on synthetic sources.")
+    parser.add_argument("--out", default="bench_export.json", help="JSON file to write results to")
+    parser.add_argument("--work-dir", help="Keep generated sources and outputs here instead of a temp dir")
+    parser.add_argument("--quick", action="store_true", help="Only run a small subset of sources")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is reported")
+    parser.add_argument("--trim-length", type=int, default=60)
+    parser.add_argument("--longest-edge", type=int, default=1024)
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--encoder-profile", default=DEFAULT_ENCODER_PROFILE, choices=list(ENCODER_PROFILES))
+    args = parser.parse_args(argv)
+
+    if shutil.which("ffmpeg") is None:
+        print("ffmpeg was not found on PATH.")
+        return 1
+
+    sources = [s for s in SOURCES if not args.quick or s[0] in QUICK_SOURCES]
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="hunyclip_bench_")
+    os.makedirs(os.path.join(work_dir, "sources"), exist_ok=True)
+
+    results = []
+    try:
+        for source in sources:
+            for mode in MODES:
+                result = run_case(work_dir, source, mode, args.trim_length, args.longest_edge, args.repeat,
+                                  args.encoder_profile)
+                results.append(result)
+                print(f"{result['source']:28} {result['mode']:20} {result['wall_s']:8.3f}s "
+                      f"{result['frames_per_s'] or 0:8.1f} fps  cpu {result['cpu_s']:.2f}s  "
+                      f"rss {result['peak_rss_mb']:.0f} MB")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "trim_length": args.trim_length,
+        "longest_edge": args.longest_edge,
+        "encoder_profile": args.encoder_profile,
+        "results": results,
+    }
+    with open(args.out, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nWrote {len(results)} result(s) to {args.out}")
+
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# interactive_benchmark.py
+"""
+Latency benchmark for the interactive editing paths.
+
+Drives VideoEditor and VideoLoader headlessly on the Qt offscreen platform
+against generated test videos and folders, and reports p50/p95/p99 latency
+per operation:
+
+    python -m benchmarks.interactive_benchmark --out bench_interactive.json
+    python -m benchmarks.interactive_benchmark --budget scrub_video=50 --budget move_trim=33
+    python -m benchmarks.interactive_benchmark --budget crop_drag=16
+
+With --budget, the exit code is 1 if any operation's p95 exceeds its budget (ms),
+so the run can gate CI. Needs ffmpeg on PATH; no display or network.
+"""
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse, contextlib, io, json, platform, random, shutil, signal, sys, tempfile, time
+import numpy as np
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QPointF
+
+from benchmarks.export_benchmark import generate_source, git_commit
+from scripts.video_cropper import VideoCropper
+
+# (name, width, height, fps, seconds, codec, gop)
+SOURCES = [
+    ("720p_h264_gop30", 1280, 720, 30, 20, "libx264", 30),
+    ("1080p_h264_gop250", 1920, 1080, 30, 20, "libx264", 250),
+    ("2160p_h264_gop60", 3840, 2160, 30, 10, "libx264", 60),
+]
+FOLDER_SIZES = [10, 1000, 50000]
+
+
+class OperationTimeout(Exception):
+    pass
+
+
+class SliderHover:
+    """Stand-in for the slider hover event show_thumbnail reads its position from."""
+
+    def __init__(self, x):
+        self._pos = QPointF(x, 5)
+
+    def position(self):
+        return self._pos
+
+
+def percentiles(samples_ms):
+    if not samples_ms:
+        return {}
+    p50, p95, p99 = np.percentile(samples_ms, [50, 95, 99])
+    return {
+        "count": len(samples_ms),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(max(samples_ms)), 3),
+    }
+
+
+def timed(app, fn, timeout):
+    """Run one operation plus the event processing it triggers; return its latency in ms."""
+    signal.alarm(timeout)
+    try:
+        start = time.perf_counter()
+        fn()
+        app.processEvents()
+        return (time.perf_counter() - start) * 1000
+    finally:
+        signal.alarm(0)
+
+
+def make_folder(root, source_path, count):
+    """Folder of `count` clips, hard-linked to one source so large folders cost no disk space."""
+    folder = os.path.join(root, f"folder_{count}")
+    if os.path.isdir(folder):
+        return folder
+    os.makedirs(folder)
+    for i in range(count):
+        target = os.path.join(folder, f"clip_{i:06d}.mp4")
+        try:
+            os.link(source_path, target)
+        except OSError:
+            os.symlink(source_path, target)
+    return folder
+
+
+def open_folder(window, folder):
+    window.folder_sessions.pop(folder, None)
+    window.workspace.open_folder(folder)
+
+
+def bench_clip_operations(app, window, folder, iterations, timeout):
+    """Seek/scrub/display/thumbnail/next-clip latencies on the clips of a small folder."""
+    open_folder(window, folder)
+    window.video_list.setCurrentRow(0)
+    window.loader.load_video(window.video_list.currentIndex())
+    frame_count = window.frame_count
+    rng = random.Random(0)
+    samples = {name: [] for name in ("scrub_video", "move_trim", "display_frame", "show_thumbnail", "crop_drag",
+                                     "next_clip")}
+
+    for _ in range(iterations):
+        position = rng.randrange(frame_count)
+        samples["scrub_video"].append(timed(app, lambda: window.editor.scrub_video(position), timeout))
+
+    for i in range(iterations):
+        step = 1 if (i // 20) % 2 == 0 else -1
+        samples["move_trim"].append(timed(app, lambda: window.editor.move_trim(step), timeout))
+
+    ret, frame = window.cap.read()
+    if ret:
+        for _ in range(iterations):
+            samples["display_frame"].append(timed(app, lambda: window.editor.display_frame(frame), timeout))
+
+    slider_width = max(1, window.slider.width())
+    for _ in range(iterations):
+        hover = SliderHover(rng.uniform(0, slider_width))
+        samples["show_thumbnail"].append(timed(app, lambda: window.editor.show_thumbnail(hover), timeout))
+    window.thumbnail_label.hide()
+
+    # Drag a crop region back and forth; each sample includes the canvas repaint it triggers.
+    pixmap_rect = window.pixmap_item.boundingRect()
+    window.editor.draw_crop_rectangle(pixmap_rect.width() / 4, pixmap_rect.height() / 4,
+                                      pixmap_rect.width() / 2, pixmap_rect.height() / 2)
+    crop_item = window.current_rect
+    window.graphics_view.set_fast_rendering(True)
+    for i in range(iterations):
+        step = 2 if (i // 20) % 2 == 0 else -2
+        samples["crop_drag"].append(timed(app, lambda: crop_item.moveBy(step, 0), timeout))
+    window.graphics_view.set_fast_rendering(False)
+
+    for _ in range(iterations):
+        if window.video_list.currentRow() >= window.video_list.count() - 1:
+            window.video_list.setCurrentRow(0)
+        samples["next_clip"].append(timed(app, window.editor.next_clip, timeout))
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HunyClip interactive latencies headlessly.")
+    parser.add_argument("--out", default="bench_interactive.json", help="JSON file to write results to")
+    parser.add_argument("--work-dir", help="Keep generated videos and folders here instead of a temp dir")
+    parser.add_argument("--iterations", type=int, default=100, help="Samples per clip operation")
+    parser.add_argument("--folder-sizes", default=",".join(str(n) for n in FOLDER_SIZES),
+                        help="Comma-separated folder sizes for opening a folder (scan, index and list fill)")
+    parser.add_argument("--folder-repeat", type=int, default=3, help="Samples per folder size")
+    parser.add_argument("--timeout", type=int, default=120,
+                        help="Seconds before a single operation is recorded as timed out")
+    parser.add_argument("--budget", action="append", default=[], metavar="OP=MS",
+                        help="Fail if the p95 latency of OP exceeds MS milliseconds")
+    args = parser.parse_args(argv)
+
+    if shutil.which("ffmpeg") is None:
+        print("ffmpeg was not found on PATH.")
+        return 1
+    budgets = {}
+    for spec in args.budget:
+        op, _, ms = spec.partition("=")
+        budgets[op.strip()] = float(ms)
+
+    def on_alarm(signum, frame):
+        raise OperationTimeout()
+    signal.signal(signal.SIGALRM, on_alarm)
+
+    work_dir = os.path.abspath(args.work_dir or tempfile.mkdtemp(prefix="hunyclip_bench_"))
+    os.makedirs(os.path.join(work_dir, "sources"), exist_ok=True)
+    cwd = os.getcwd()
+    results = {}
+    app = QApplication.instance() or QApplication(sys.argv)
+    try:
+        # VideoCropper keeps its session file in the working directory; keep it out of the repo.
+        os.chdir(work_dir)
+        window = VideoCropper()
+        window.resize(1280, 800)
+        window.show()
+        app.processEvents()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            for source in SOURCES:
+                source_path = generate_source(os.path.join(work_dir, "sources"), *source)
+                folder = make_folder(os.path.join(work_dir, source[0]), source_path, 10)
+                try:
+                    samples = bench_clip_operations(app, window, folder, args.iterations, args.timeout)
+                except OperationTimeout:
+                    samples = {}
+                    results[f"clip_operations[{source[0]}]"] = {"timeout_s": args.timeout}
+                for op, values in samples.items():
+                    if values:
+                        results[f"{op}[{source[0]}]"] = percentiles(values)
+
+            base_source = generate_source(os.path.join(work_dir, "sources"), *SOURCES[0])
+            for size in (int(n) for n in args.folder_sizes.split(",") if n.strip()):
+                folder = make_folder(os.path.join(work_dir, "folders"), base_source, size)
+                values = []
+                try:
+                    for _ in range(args.folder_repeat):
+                        values.append(timed(app, lambda: open_folder(window, folder), args.timeout))
+                    results[f"load_folder_contents[{size}]"] = percentiles(values)
+                except OperationTimeout:
+                    results[f"load_folder_contents[{size}]"] = {"timeout_s": args.timeout}
+
+        window.close()
+    finally:
+        os.chdir(cwd)
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'operation':42} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    failed = []
+    for name, stats in results.items():
+        if "timeout_s" in stats:
+            print(f"{name:42} timed out after {stats['timeout_s']}s")
+        else:
+            print(f"{name:42} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} {stats['p99_ms']:9.2f}")
+        op = name.split("[")[0]
+        if op in budgets:
+            p95 = stats.get("p95_ms", float("inf"))
+            stats["budget_ms"] = budgets[op]
+            if p95 > budgets[op]:
+                failed.append(f"{name}: p95 {p95:.2f} ms > budget {budgets[op]:.2f} ms")
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": args.iterations,
+        "results": results,
+    }
+    with open(args.out, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nWrote {len(results)} result(s) to {args.out}")
+
+    for message in failed:
+        print(f"Over budget: {message}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
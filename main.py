@@ -1,9 +1,13 @@
-import sys
+import sys, argparse
 from PyQt6.QtWidgets import QApplication
 from scripts.video_cropper import VideoCropper
+from scripts.encoder_profiles import ENCODER_PROFILES
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="HunyClip video cropping tool")
+    parser.add_argument("--encoder-profile", choices=list(ENCODER_PROFILES), help="Encoder profile for exports")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # Load the dark mode stylesheet from a file
     with open("styles/dark_mode.css", "r") as file:
@@ -12,6 +16,8 @@ if __name__ == "__main__":
     
     try:
         window = VideoCropper()
+        if args.encoder_profile:
+            window.set_encoder_profile(args.encoder_profile)
         window.show()
         sys.exit(app.exec())
     except Exception as e:
@@ -0,0 +1,76 @@
+# background_pool.py
+from concurrent.futures import ProcessPoolExecutor
+from PyQt6.QtCore import QTimer
+
+class BackgroundPool:
+    """
+    Runs a batch of jobs in a worker pool and delivers the results on the GUI thread.
+
+    Results are collected by a QTimer, so callbacks can touch widgets safely.
+    on_result(key, result) is called per finished job, on_progress(done, total)
+    after each poll that finished something, and on_finished() once the batch is done.
+    """
+
+    def __init__(self, on_result, on_finished=None, on_progress=None,
+                 executor_class=ProcessPoolExecutor, max_workers=None, interval=200):
+        self.on_result = on_result
+        self.on_finished = on_finished
+        self.on_progress = on_progress
+        self.executor_class = executor_class
+        self.max_workers = max_workers
+        self.executor = None
+        self.pending = {}  # future -> key
+        self.total = 0
+        self.poll_timer = QTimer()
+        self.poll_timer.setInterval(interval)
+        self.poll_timer.timeout.connect(self.poll)
+
+    @property
+    def running(self):
+        return self.executor is not None
+
+    def submit_all(self, fn, jobs):
+        """jobs is a list of (key, args) tuples; fn(*args) runs in the pool."""
+        if not jobs:
+            return
+        if not self.executor:
+            self.executor = self.executor_class(max_workers=self.max_workers)
+            self.total = 0
+        for key, args in jobs:
+            self.pending[self.executor.submit(fn, *args)] = key
+        self.total += len(jobs)
+        if self.on_progress:
+            self.on_progress(self.total - len(self.pending), self.total)
+        self.poll_timer.start()
+
+    def poll(self):
+        finished = [future for future in self.pending if future.done()]
+        for future in finished:
+            key = self.pending.pop(future)
+            if future.cancelled():
+                continue
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Background job failed for {key}: {e}")
+                continue
+            self.on_result(key, result)
+        if finished and self.on_progress:
+            self.on_progress(self.total - len(self.pending), self.total)
+        if not self.pending:
+            self.shutdown()
+            if self.on_finished:
+                self.on_finished()
+
+    def cancel(self, key):
+        """Cancel a queued job that has not started yet."""
+        for future, pending_key in list(self.pending.items()):
+            if pending_key == key and future.cancel():
+                del self.pending[future]
+
+    def shutdown(self):
+        self.poll_timer.stop()
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.pending = {}
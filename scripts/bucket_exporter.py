@@ -0,0 +1,216 @@
+# bucket_exporter.py
+import os, cv2, numpy as np
+from scripts.filter_chain import clip_filter_chain, take_fps
+from scripts.export_planner import note_problem
+from scripts.staging_cache import resolve_source
+from scripts.subject_tracker import fresh_track, tracked_crop
+from scripts.encoder_profiles import DEFAULT_ENCODER_PROFILE, encoder_settings
+
+# HunyuanVideo-style buckets: roughly equal pixel area at several aspect ratios,
+# and frame counts of the form 4k+1.
+DEFAULT_BUCKET_RESOLUTIONS = "960x544, 544x960, 832x624, 624x832, 720x720"
+DEFAULT_BUCKET_FRAMES = "33, 65, 97, 129"
+
+
+def parse_bucket_resolutions(text):
+    """Parse '960x544, 544x960' into a list of (width, height) tuples with even sides."""
+    resolutions = []
+    for token in text.replace(";", ",").split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        try:
+            w, h = (int(v) for v in token.split("x"))
+        except ValueError:
+            print(f"[Warning] Ignoring invalid bucket resolution '{token}'")
+            continue
+        if w <= 0 or h <= 0:
+            continue
+        resolutions.append((w - w % 2, h - h % 2))
+    return resolutions
+
+
+def parse_bucket_frames(text):
+    """Parse '33, 65, 129' into a sorted list of positive frame counts."""
+    frames = []
+    for token in text.replace(";", ",").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        try:
+            value = int(token)
+        except ValueError:
+            print(f"[Warning] Ignoring invalid bucket frame count '{token}'")
+            continue
+        if value > 0:
+            frames.append(value)
+    return sorted(set(frames))
+
+
+def assign_buckets(widths, heights, available_frames, resolutions, frame_counts):
+    """
+    Assign every clip to its nearest bucket in one vectorized pass.
+
+    widths/heights are the crop (or full frame) sizes, available_frames the number
+    of frames each clip can supply from its trim point. Returns (resolution_idx,
+    frames) arrays; frames is -1 where no bucket frame count fits the clip.
+    """
+    widths = np.asarray(widths, dtype=np.float64)
+    heights = np.asarray(heights, dtype=np.float64)
+    available_frames = np.asarray(available_frames, dtype=np.int64)
+    bucket_wh = np.asarray(resolutions, dtype=np.float64).reshape(-1, 2)
+    bucket_frames = np.asarray(frame_counts, dtype=np.int64)
+
+    # Nearest aspect ratio in log space, so 2:1 and 1:2 are equally far from 1:1.
+    clip_log_ar = np.log(widths / heights)[:, None]
+    bucket_log_ar = np.log(bucket_wh[:, 0] / bucket_wh[:, 1])[None, :]
+    aspect_dist = np.round(np.abs(clip_log_ar - bucket_log_ar), 3)
+
+    # Among equally close buckets prefer the largest one that does not upscale,
+    # otherwise the smallest one that does.
+    bucket_area = (bucket_wh[:, 0] * bucket_wh[:, 1])[None, :]
+    upscale = bucket_area > (widths * heights)[:, None]
+    tie_break = np.where(upscale, bucket_area, -bucket_area)
+    resolution_idx = np.argmin(aspect_dist * 1e12 + tie_break, axis=1)
+
+    # Longest bucket frame count the clip can fill.
+    fits = bucket_frames[None, :] <= available_frames[:, None]
+    frames = np.where(fits, bucket_frames[None, :], -1).max(axis=1, initial=-1)
+    return resolution_idx, frames
+
+
+class BucketExporter:
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.problems = []
+
+    def plan_buckets(self):
+        """Build one export job per checked entry, sized to its bucket. Skipped entries go to self.problems."""
+        self.problems = []
+        resolutions = parse_bucket_resolutions(self.main_app.bucket_resolutions)
+        frame_counts = parse_bucket_frames(self.main_app.bucket_frames)
+        if not resolutions or not frame_counts:
+            note_problem(self.problems, "Buckets", "need at least one resolution and one frame count")
+            return []
+
+        # First pass: collect the geometry of every checked entry.
+        clips = []
+        workspace = getattr(self.main_app, "workspace", None)
+        for entry in workspace.entries() if workspace else self.main_app.video_files:
+            if not entry.get("export_enabled", False):
+                continue
+            display_name = entry["display_name"]
+            video_path = entry["original_path"]
+            cap = cv2.VideoCapture(resolve_source(self.main_app, video_path))
+            orig_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            orig_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
+            if orig_w <= 0 or orig_h <= 0 or fps <= 0:
+                reason = "source file is missing" if not os.path.exists(video_path) else "could not read video properties"
+                note_problem(self.problems, display_name, reason)
+                continue
+
+            trim_start = self.main_app.trim_points.get(display_name, 0)
+            if trim_start >= frame_count:
+                note_problem(self.problems, display_name, f"trim_start {trim_start} >= total frames {frame_count}")
+                continue
+
+            crop = self.main_app.crop_regions.get(display_name)
+            track = None
+            if crop:
+                x, y, w, h = crop
+                if x < 0 or y < 0 or w <= 0 or h <= 0 or x+w > orig_w or y+h > orig_h:
+                    note_problem(self.problems, display_name, "invalid crop region")
+                    continue
+                track = fresh_track(getattr(self.main_app, 'crop_tracks', {}), display_name, crop, trim_start)
+            else:
+                x, y, w, h = 0, 0, orig_w, orig_h
+
+            custom_filters, chain_fps = take_fps(clip_filter_chain(self.main_app, display_name))
+            available = min(self.main_app.trim_length, frame_count - trim_start)
+            clips.append({
+                "entry": entry,
+                "fps": fps,
+                "chain_fps": chain_fps,
+                "filters": custom_filters,
+                "trim_start": trim_start,
+                "crop": (x, y, w - w % 2, h - h % 2),
+                "track": track,
+                # Frames at the output rate, which the filter chain may change.
+                "available": int(available * chain_fps / fps) if chain_fps else available,
+                "source_size": [orig_w, orig_h],
+            })
+
+        if not clips:
+            return []
+
+        # Second pass: assign all entries to buckets at once.
+        resolution_idx, frames = assign_buckets(
+            [clip["crop"][2] for clip in clips],
+            [clip["crop"][3] for clip in clips],
+            [clip["available"] for clip in clips],
+            resolutions,
+            frame_counts,
+        )
+
+        bucket_root = os.path.join(self.main_app.folder_path, "buckets")
+        prefix = getattr(self.main_app, 'export_prefix', '').strip()
+        file_counter = 0
+
+        caption = getattr(self.main_app, 'simple_caption', '').strip()
+        profile_args, container, encoder_hints = encoder_settings(
+            getattr(self.main_app, 'encoder_profile', DEFAULT_ENCODER_PROFILE))
+        export_jobs = []
+        for clip, res_i, bucket_frames in zip(clips, resolution_idx, frames):
+            entry = clip["entry"]
+            display_name = entry["display_name"]
+            if bucket_frames < 0:
+                note_problem(self.problems, display_name, f"only {clip['available']} frames available, "
+                                                          f"shortest bucket is {frame_counts[0]}")
+                continue
+            bucket_w, bucket_h = resolutions[res_i]
+            bucket_frames = int(bucket_frames)
+            output_folder = os.path.join(bucket_root, f"{bucket_w}x{bucket_h}x{bucket_frames}")
+
+            base_name, ext = os.path.splitext(display_name)
+            ext = container or ext
+            if prefix:
+                file_counter += 1
+                base_name = f"{prefix}_{file_counter:05d}"
+
+            fps = clip["fps"]
+            output_fps = clip["chain_fps"] or max(1, round(fps))
+            x, y, w, h = clip["crop"]
+            crop_x, crop_y = tracked_crop(clip["track"], clip["crop"], 0)[:2] if clip["track"] else (x, y)
+            export_jobs.append({
+                "kind": "video",
+                "label": f"bucket {bucket_w}x{bucket_h}x{bucket_frames}",
+                "display_name": display_name,
+                "source": entry["original_path"],
+                "caption": caption,
+                "trim_start": clip["trim_start"],
+                "source_size": clip["source_size"],
+                "crop": [x, y, w, h],
+                "ss": clip["trim_start"] / fps,
+                "t": (bucket_frames + 1) / (clip["chain_fps"] or fps),
+                "output_fps": output_fps,
+                # Scale to cover the bucket, then centre-crop to its exact size so the
+                # trainer can use the clip without resizing it again.
+                "filters": [["crop", [w, h, crop_x, crop_y], {}]]
+                           + clip["filters"]
+                           + [["scale", [bucket_w, bucket_h], {"force_original_aspect_ratio": "increase"}],
+                              ["crop", [bucket_w, bucket_h], {}],
+                              ["setsar", [1], {}]],
+                "output_args": {"vframes": bucket_frames, "r": output_fps, "vsync": "cfr", "map_metadata": "-1",
+                                **profile_args},
+                "encoder_hints": encoder_hints,
+                "expected_frames": bucket_frames,
+                "source_fps": fps if clip["chain_fps"] else None,
+                "expected_size": [bucket_w, bucket_h],
+                "output": os.path.join(output_folder, f"{base_name}{ext}"),
+            })
+            if clip["track"]:
+                export_jobs[-1]["track"] = {"fps": clip["track"]["fps"], "points": clip["track"]["points"]}
+        return export_jobs
@@ -0,0 +1,306 @@
+# bulk_annotations.py
+import os, csv, json, numpy as np
+from PyQt6.QtWidgets import QFileDialog
+from scripts.instrumentation import instrumentation
+
+ANNOTATION_FIELDS = ["display_name", "original_path", "trim_start", "x", "y", "w", "h"]
+
+
+def parse_crop_spec(text):
+    """
+    Parse a bulk crop: "x,y,w,h" in pixels, "x%,y%,w%,h%" relative to each clip's size,
+    or "center W:H [N%]" for the largest centred region of that aspect ratio (optionally
+    scaled down). Returns ("absolute" | "relative", [x, y, w, h]) or ("center", [ratio, scale]).
+    Raises ValueError on anything else.
+    """
+    text = text.strip().lower()
+    if text.startswith("center"):
+        parts = text[len("center"):].split()
+        if not parts:
+            raise ValueError("center needs an aspect ratio such as 16:9")
+        ratio_w, _, ratio_h = parts[0].partition(":")
+        ratio = float(ratio_w) / float(ratio_h) if ratio_h else float(ratio_w)
+        scale = float(parts[1].rstrip("%")) / 100 if len(parts) > 1 else 1.0
+        if ratio <= 0 or not 0 < scale <= 1:
+            raise ValueError(f"invalid center crop '{text}'")
+        return "center", [ratio, scale]
+    values = [value.strip() for value in text.split(",")]
+    if len(values) != 4:
+        raise ValueError("a crop needs four values: x,y,w,h")
+    if all(value.endswith("%") for value in values):
+        return "relative", [float(value[:-1]) / 100 for value in values]
+    return "absolute", [float(value) for value in values]
+
+
+def parse_trim_rule(text):
+    """
+    Parse a bulk trim rule: "start[+N]", "middle[+N|-N]" (trim window centred in the clip),
+    "end[-N]" (window ending N frames before the last) or a plain frame number.
+    Returns (anchor, offset); a frame number is ("start", N). Raises ValueError on anything else.
+    """
+    text = text.replace(" ", "").lower()
+    for anchor in ("start", "middle", "end"):
+        if text.startswith(anchor):
+            rest = text[len(anchor):]
+            return anchor, int(rest) if rest else 0
+    return "start", int(text)
+
+
+def resolve_crops(spec, sizes):
+    """
+    Crops for clips of the given (N, 2) width/height array, as float (N, 4) x, y, w, h.
+    Unknown sizes (NaN) give NaN crops.
+    """
+    kind, values = spec
+    sizes = np.asarray(sizes, dtype=float)
+    if kind == "absolute":
+        return np.broadcast_to(np.array(values, dtype=float), (len(sizes), 4)).copy()
+    if kind == "relative":
+        return np.array(values, dtype=float) * np.tile(sizes, 2)
+    ratio, scale = values
+    width = np.minimum(sizes[:, 0], sizes[:, 1] * ratio) * scale
+    height = width / ratio
+    return np.stack([(sizes[:, 0] - width) / 2, (sizes[:, 1] - height) / 2, width, height], axis=1)
+
+
+def clamp_crops(crops, sizes, min_size=2):
+    """
+    Round crops to whole pixels with even sizes and clamp them inside each clip.
+    Returns (int (N, 4) crops, valid mask, changed mask). Crops of clips with unknown
+    size, or that end up smaller than min_size, are invalid.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    valid = ~np.isnan(crops).any(axis=1) & ~np.isnan(sizes).any(axis=1)
+    safe = np.where(valid[:, None], crops, 0)
+    safe_sizes = np.where(valid[:, None], sizes, 0)
+    w = np.minimum(np.rint(safe[:, 2]), safe_sizes[:, 0])
+    h = np.minimum(np.rint(safe[:, 3]), safe_sizes[:, 1])
+    w -= w % 2
+    h -= h % 2
+    x = np.clip(np.rint(safe[:, 0]), 0, safe_sizes[:, 0] - w)
+    y = np.clip(np.rint(safe[:, 1]), 0, safe_sizes[:, 1] - h)
+    clamped = np.stack([x, y, w, h], axis=1)
+    valid &= (w >= min_size) & (h >= min_size)
+    # Rounding to even whole pixels moves an edge by at most 1.5 px; more than that is a clamp.
+    changed = valid & (np.abs(clamped - safe) > 1.5).any(axis=1)
+    return clamped.astype(np.int64), valid, changed
+
+
+def resolve_trims(rule, frame_counts, trim_length):
+    """
+    Trim starts for clips with the given frame counts, clamped so the window starts
+    inside the clip. Returns (int64 trim starts, valid mask); unknown frame counts are
+    invalid except for "start" rules, which then only clamp at zero.
+    """
+    anchor, offset = rule
+    frames = np.asarray(frame_counts, dtype=float)
+    known = ~np.isnan(frames)
+    frames = np.where(known, frames, 0)  # Unknown lengths are masked out below, not computed with.
+    if anchor == "start":
+        starts = np.full(len(frames), float(offset))
+    elif anchor == "middle":
+        starts = frames // 2 - trim_length // 2 + offset
+    else:
+        starts = frames - trim_length + offset
+    valid = known | (anchor == "start")
+    latest = np.where(known, np.maximum(frames - trim_length, 0), np.inf)
+    starts = np.clip(np.where(valid, starts, 0), 0, latest)
+    return starts.astype(np.int64), valid
+
+
+class BulkAnnotations:
+    """
+    Apply one crop or trim rule to many entries, and import/export crops and trims.
+
+    Clip sizes and lengths come from the workspace index (cached metadata), so a
+    selection of any size is resolved, validated and clamped as numpy arrays and
+    saved with a single session write.
+    """
+
+    def __init__(self, main_app):
+        self.main_app = main_app
+
+    def selection(self):
+        """Selected entries and their rows in the workspace index."""
+        index = self.main_app.workspace.index
+        entries = [e for e in self.main_app.loader.selected_entries() if e["display_name"] in index.rows]
+        rows = np.array([index.rows[e["display_name"]] for e in entries], dtype=np.int64)
+        return entries, rows
+
+    def sizes(self, rows):
+        return self.main_app.workspace.index.info[rows, :2]
+
+    def current_crop_spec(self):
+        """The loaded clip's crop, relative to its size, for copying it to other clips."""
+        crop = self.main_app.crop_regions.get(self.main_app.current_video)
+        if not crop or not self.main_app.original_width:
+            return None
+        size = [self.main_app.original_width, self.main_app.original_height] * 2
+        return "relative", [value / dim for value, dim in zip(crop, size)]
+
+    def apply_crop(self, text):
+        """Set the crop of every selected entry from a crop spec (empty: copy the loaded clip's crop)."""
+        try:
+            spec = parse_crop_spec(text) if text.strip() else self.current_crop_spec()
+        except ValueError as e:
+            print(f"[Warning] Invalid crop '{text}': {e}")
+            return
+        if spec is None:
+            print("Enter a crop (x,y,w,h, x%,y%,w%,h% or center 16:9) or draw one on the loaded clip first.")
+            return
+        entries, rows = self.selection()
+        with instrumentation.span("bulk_crop"):
+            sizes = self.sizes(rows)
+            crops, valid, changed = clamp_crops(resolve_crops(spec, sizes), sizes)
+            names = self.store_crops(entries, rows, crops, valid)
+        self.report("crop", len(names), len(entries), changed)
+        # Marks the cropped entries for export like a manual crop does; this is the one session write.
+        self.main_app.loader.set_export_enabled(names, True)
+        self.refresh(names)
+
+    def store_crops(self, entries, rows, crops, valid):
+        names = []
+        crop_regions = self.main_app.crop_regions
+        for entry, crop in zip((e for e, ok in zip(entries, valid) if ok), crops[valid].tolist()):
+            crop_regions[entry["display_name"]] = tuple(crop)
+            names.append(entry["display_name"])
+        self.main_app.workspace.index.cropped[rows[valid]] = True
+        return names
+
+    def apply_trim(self, text):
+        """Set the trim point of every selected entry from a trim rule."""
+        try:
+            rule = parse_trim_rule(text)
+        except ValueError:
+            print(f"[Warning] Invalid trim rule '{text}' (use start+N, middle, end-N or a frame number)")
+            return
+        entries, rows = self.selection()
+        index = self.main_app.workspace.index
+        with instrumentation.span("bulk_trim"):
+            starts, valid = resolve_trims(rule, index.info[rows, 3], self.main_app.trim_length)
+            names = self.store_trims(entries, rows, starts, valid)
+        self.report("trim point", len(names), len(entries), None)
+        self.main_app.loader.save_session()
+        self.refresh(names)
+
+    def store_trims(self, entries, rows, starts, valid):
+        names = []
+        trim_points = self.main_app.trim_points
+        for entry, start in zip((e for e, ok in zip(entries, valid) if ok), starts[valid].tolist()):
+            trim_points[entry["display_name"]] = start
+            names.append(entry["display_name"])
+        self.main_app.workspace.index.trim[rows[valid]] = starts[valid]
+        return names
+
+    def report(self, what, applied, total, changed):
+        message = f"Set the {what} of {applied} of {total} clip(s)"
+        if changed is not None and changed.any():
+            message += f"; {int(changed.sum())} clamped to the frame"
+        if applied < total:
+            message += f"; {total - applied} skipped (no cached size/length or too small; try Index Metadata)"
+        print(message + ".")
+
+    def refresh(self, names):
+        if self.main_app.current_video in set(names):
+            self.main_app.loader.reload_current_video()
+        self.main_app.output_preview.invalidate()
+        # Thumbnails show the trim point, so visible rows may need new ones.
+        self.main_app.list_thumbnails.schedule()
+
+    def export_annotations(self):
+        path, _ = QFileDialog.getSaveFileName(self.main_app, "Export Crops and Trims", "annotations.csv",
+                                              "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        records = []
+        for entry in self.main_app.loader.selected_entries():
+            crop = self.main_app.crop_regions.get(entry["display_name"])
+            x, y, w, h = crop if crop else ("", "", "", "")
+            records.append(dict(zip(ANNOTATION_FIELDS, [entry["display_name"], entry["original_path"],
+                                                        self.main_app.trim_points.get(entry["display_name"], 0),
+                                                        x, y, w, h])))
+        if path.lower().endswith(".json"):
+            with open(path, "w") as file:
+                json.dump(records, file, indent=1)
+        else:
+            with open(path, "w", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=ANNOTATION_FIELDS)
+                writer.writeheader()
+                writer.writerows(records)
+        print(f"Exported crops and trims of {len(records)} clip(s) to {path}")
+
+    def read_records(self, path):
+        if path.lower().endswith(".json"):
+            with open(path, "r") as file:
+                return json.load(file)
+        with open(path, "r", newline="") as file:
+            return list(csv.DictReader(file))
+
+    def import_annotations(self):
+        """
+        Read crops and trims from a CSV/JSON file written by export (or by hand). Records
+        match entries by display name, then by source path; empty fields are left alone.
+        """
+        path, _ = QFileDialog.getOpenFileName(self.main_app, "Import Crops and Trims", "",
+                                              "Annotations (*.csv *.json)")
+        if not path:
+            return
+        try:
+            records = self.read_records(path)
+        except (OSError, ValueError, csv.Error) as e:
+            print(f"[Warning] Could not read {path}: {e}")
+            return
+        index = self.main_app.workspace.index
+        by_path = {}
+        for row, entry in enumerate(index.entries):
+            by_path.setdefault(os.path.normpath(entry["original_path"]), row)
+        matched, crop_values, trim_values = [], [], []
+        unmatched = 0
+        for record in records:
+            row = index.rows.get(record.get("display_name") or "")
+            if row is None and record.get("original_path"):
+                row = by_path.get(os.path.normpath(record["original_path"]))
+            if row is None:
+                unmatched += 1
+                continue
+            matched.append(row)
+            crop_values.append([self.number(record.get(key)) for key in ("x", "y", "w", "h")])
+            trim_values.append(self.number(record.get("trim_start")))
+        if not matched:
+            print(f"No records in {path} match a workspace clip.")
+            return
+        rows = np.array(matched, dtype=np.int64)
+        entries = [index.entries[row] for row in matched]
+        with instrumentation.span("bulk_import"):
+            crops = np.array(crop_values, dtype=float)
+            has_crop = ~np.isnan(crops).any(axis=1)
+            clamped, valid, changed = clamp_crops(crops, self.sizes(rows))
+            crop_names = self.store_crops(entries, rows, clamped, valid & has_crop)
+            trims = np.array(trim_values, dtype=float)
+            has_trim = ~np.isnan(trims)
+            frames = index.info[rows, 3]
+            latest = np.where(np.isnan(frames), np.inf, np.maximum(frames - self.main_app.trim_length, 0))
+            starts = np.clip(np.where(has_trim, trims, 0), 0, latest).astype(np.int64)
+            trim_names = self.store_trims(entries, rows, starts, has_trim)
+        message = f"Imported {len(crop_names)} crop(s) and {len(trim_names)} trim point(s) from {path}"
+        if (changed & has_crop).any():
+            message += f"; {int((changed & has_crop).sum())} crop(s) clamped to the frame"
+        if (has_crop & ~valid).any():
+            message += f"; {int((has_crop & ~valid).sum())} crop(s) skipped (no cached size or too small)"
+        if unmatched:
+            message += f"; {unmatched} record(s) matched no clip"
+        print(message + ".")
+        self.main_app.loader.set_export_enabled(crop_names, True)
+        if not crop_names:
+            self.main_app.loader.save_session()
+        self.refresh(crop_names + trim_names)
+
+    @staticmethod
+    def number(value):
+        """A CSV/JSON field as a float, or NaN when it is empty."""
+        if value is None or value == "":
+            return np.nan
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
@@ -0,0 +1,105 @@
+# clip_list.py
+from PyQt6.QtWidgets import QListView
+from PyQt6.QtGui import QColor, QIcon
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QItemSelectionModel, pyqtSignal
+
+CHECKED_COLOR = QColor(0, 100, 0)  # Darker green behind clips checked for export.
+
+
+class ClipListModel(QAbstractListModel):
+    """
+    The clip list as a model over main_app.video_files.
+
+    Rows are drawn from the entries on demand (name, export checkbox, colour, metric
+    tooltip, thumbnail), so showing a new search result is one model reset instead of
+    one widget item per clip. Toggling a checkbox writes the entry and emits
+    export_toggled(row).
+    """
+
+    export_toggled = pyqtSignal(int)
+
+    def __init__(self, main_app):
+        super().__init__()
+        self.main_app = main_app
+        self.icons = {}  # display name -> (thumbnail cache path, QIcon)
+        self.positions = None  # display name -> row, built on the first lookup after a reset
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.main_app.video_files)
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.main_app.video_files):
+            return None
+        entry = self.main_app.video_files[index.row()]
+        display_name = entry["display_name"]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return display_name
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if entry.get("export_enabled") else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return CHECKED_COLOR if entry.get("export_enabled") else None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.main_app.quality_metrics.describe(display_name) or None
+        if role == Qt.ItemDataRole.DecorationRole:
+            icon = self.icons.get(display_name)
+            return icon[1] if icon else None
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or not index.isValid():
+            return False
+        self.main_app.video_files[index.row()]["export_enabled"] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index)
+        self.export_toggled.emit(index.row())
+        return True
+
+    def show_entries(self, entries):
+        """Replace the listed entries; the view keeps nothing per row, so this is one reset."""
+        self.beginResetModel()
+        self.main_app.video_files = entries
+        self.positions = None
+        self.endResetModel()
+
+    def row_of(self, display_name):
+        if self.positions is None:
+            self.positions = {entry["display_name"]: row for row, entry in enumerate(self.main_app.video_files)}
+        return self.positions.get(display_name)
+
+    def refresh(self, display_names=None):
+        """Repaint the rows of these entries (all rows if None) after their state changed."""
+        if display_names is None:
+            if self.rowCount():
+                self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1))
+            return
+        for display_name in display_names:
+            row = self.row_of(display_name)
+            if row is not None:
+                self.dataChanged.emit(self.index(row), self.index(row))
+
+    def icon_path(self, display_name):
+        icon = self.icons.get(display_name)
+        return icon[0] if icon else None
+
+    def set_icon(self, display_name, path):
+        self.icons[display_name] = (path, QIcon(path))
+        self.refresh([display_name])
+
+
+class ClipListView(QListView):
+    """List view of the clip model with the row-based helpers the rest of the app uses."""
+
+    def count(self):
+        return self.model().rowCount() if self.model() else 0
+
+    def currentRow(self):
+        return self.currentIndex().row()
+
+    def setCurrentRow(self, row):
+        self.setCurrentIndex(self.model().index(row))
+
+    def setCurrentRowOnly(self, row):
+        """Move the current row without changing the selection."""
+        self.selectionModel().setCurrentIndex(self.model().index(row), QItemSelectionModel.SelectionFlag.NoUpdate)
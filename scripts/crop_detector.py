@@ -0,0 +1,120 @@
+# crop_detector.py
+import cv2, numpy as np
+from scripts.background_pool import BackgroundPool
+
+
+def find_active_area(row_means, col_means, limit=24):
+    """
+    Find the picture area inside black bars, in the spirit of ffmpeg's cropdetect.
+
+    row_means: (N, H) mean luma of every row for each sampled frame.
+    col_means: (N, W) mean luma of every column for each sampled frame.
+    A row/column counts as picture if it is brighter than `limit` in any sample,
+    so a dark scene in one sample does not eat into the picture.
+    Returns (x, y, w, h) with even sizes, or None if the frames are entirely black.
+    """
+    active_rows = np.flatnonzero(np.max(row_means, axis=0) > limit)
+    active_cols = np.flatnonzero(np.max(col_means, axis=0) > limit)
+    if active_rows.size == 0 or active_cols.size == 0:
+        return None
+    y, x = int(active_rows[0]), int(active_cols[0])
+    h = int(active_rows[-1]) - y + 1
+    w = int(active_cols[-1]) - x + 1
+    return (x, y, w - w % 2, h - h % 2)
+
+
+def fit_aspect_ratio(crop, aspect_ratio):
+    """Shrink a crop to the largest centred rectangle with the given width/height ratio."""
+    x, y, w, h = crop
+    if not aspect_ratio:
+        return crop
+    if w / h > aspect_ratio:
+        new_w, new_h = int(h * aspect_ratio), h
+    else:
+        new_w, new_h = w, int(w / aspect_ratio)
+    new_w -= new_w % 2
+    new_h -= new_h % 2
+    return (x + (w - new_w) // 2, y + (h - new_h) // 2, new_w, new_h)
+
+
+def detect_letterbox(video_path, samples=10, limit=24):
+    """Worker entry point: sample frames across a source and return its active area and size."""
+    cv2.setNumThreads(1)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    # Skip the first and last 5% where fades and title cards live.
+    positions = np.linspace(frame_count * 0.05, frame_count * 0.95, samples).astype(int)
+    row_means, col_means = [], []
+    for pos in positions:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(pos))
+        ret, frame = cap.read()
+        if not ret:
+            continue
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        row_means.append(gray.mean(axis=1))
+        col_means.append(gray.mean(axis=0))
+    cap.release()
+    if not row_means:
+        return None
+    crop = find_active_area(np.stack(row_means), np.stack(col_means), limit)
+    return {"crop": crop, "width": width, "height": height}
+
+
+class CropDetector:
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.pool = BackgroundPool(self.apply_result, self.finished, self.update_status)
+        self.suggested = []
+
+    def detect_selected(self):
+        """Suggest crops for the selected entries (or every entry) that have no crop yet."""
+        if self.pool.running:
+            print("Crop detection is already running.")
+            return
+        jobs = []
+        for entry in self.main_app.loader.selected_entries():
+            if self.main_app.crop_regions.get(entry["display_name"]):
+                continue
+            jobs.append((entry["display_name"], (entry["original_path"],)))
+        if not jobs:
+            print("No entries without a crop to analyze.")
+            return
+        self.suggested = []
+        self.pool.submit_all(detect_letterbox, jobs)
+
+    def apply_result(self, display_name, result):
+        if not result or not result["crop"]:
+            return
+        crop = result["crop"]
+        aspect_ratio = self.main_app.scene.aspect_ratio
+        full_frame = crop[2] >= result["width"] - 1 and crop[3] >= result["height"] - 1
+        if full_frame and aspect_ratio is None:
+            # No bars and no aspect constraint: nothing to suggest.
+            return
+        crop = fit_aspect_ratio(crop, aspect_ratio)
+        if crop[2] < 2 or crop[3] < 2:
+            return
+        self.main_app.crop_regions[display_name] = crop
+        self.main_app.workspace.touch(display_name)
+        self.suggested.append(display_name)
+        if display_name == self.main_app.current_video:
+            self.main_app.loader.reload_current_video()
+
+    def finished(self):
+        # Mark suggested entries for export the same way a manual crop does, with one session write.
+        self.main_app.loader.set_export_enabled(self.suggested, True)
+        print(f"Suggested crops for {len(self.suggested)} of {self.pool.total} clip(s).")
+
+    def update_status(self, done, total):
+        if done < total:
+            self.main_app.detect_crop_button.setText(f"Detecting Black Bars ({done}/{total})")
+        else:
+            self.main_app.detect_crop_button.setText("Auto-Crop Black Bars")
+
+    def stop(self):
+        self.pool.shutdown()
+        self.main_app.detect_crop_button.setText("Auto-Crop Black Bars")
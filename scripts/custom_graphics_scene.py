@@ -7,6 +7,8 @@ from scripts.interactive_crop_region import InteractiveCropRegion  # Import the
 class CustomGraphicsScene(QGraphicsScene):
     def __init__(self, parent=None):
         super().__init__(parent)
+        # A handful of items, one of them moving constantly: a BSP index only costs time.
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
         self.parent_widget = parent
         self.crop_item = None
         self.start_point = None
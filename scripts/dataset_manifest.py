@@ -0,0 +1,107 @@
+# dataset_manifest.py
+import os, json, numpy as np
+from scripts.export_queue import temp_path_for, atomic_write_text
+
+MANIFEST_FILE = "manifest.jsonl"
+# Numeric columns of the NPZ table; missing values become -1 (nan for fps).
+INT_COLUMNS = ("trim_start", "trim_end", "frames", "width", "height", "size_bytes")
+
+
+def manifest_rows(job, folder_path):
+    """Manifest rows for the files a finished export job wrote, with paths relative to folder_path."""
+    common = {
+        "source": job.get("source"),
+        "display_name": job.get("display_name"),
+        "caption": job.get("caption") or "",
+    }
+    if job["kind"] == "stills":
+        outputs = job["outputs"]
+    else:
+        outputs = [[job.get("trim_start"), job.get("crop"), job["output"]]]
+    rows = []
+    for frame, crop, path in outputs:
+        if job["kind"] == "stills":
+            frames = 1
+            width, height = crop[2:] if crop else (job.get("source_size") or [None, None])
+            fps = None
+        else:
+            frames = job.get("frames_written", -1)
+            if frames < 0:
+                frames = job.get("expected_frames")
+            width, height = job.get("expected_size") or (None, None)
+            fps = job.get("output_fps")
+        span = frames
+        if frames is not None and job.get("source_fps") and fps:
+            span = round(frames * job["source_fps"] / fps)  # The filter chain changed the frame rate.
+        rows.append(dict(
+            common,
+            path=os.path.relpath(path, folder_path),
+            kind=job["kind"],
+            label=job["label"],
+            crop=list(crop) if crop else None,
+            trim_start=frame,
+            trim_end=frame + span if frame is not None and span is not None else None,
+            fps=fps,
+            frames=frames,
+            width=width,
+            height=height,
+            size_bytes=os.path.getsize(path) if os.path.exists(path) else None,
+        ))
+    return rows
+
+
+class DatasetManifest:
+    """
+    Index of every exported file in a folder, one JSON row per output.
+
+    Rows are appended (and flushed) as jobs finish, so the manifest is usable even
+    after an interrupted export; the last row for a path wins. compact() rewrites
+    it without superseded rows or rows whose file (or shard) is gone.
+    """
+
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.path = os.path.join(folder_path, MANIFEST_FILE)
+        self.rows = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                for line in file:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn line from a crash.
+                    self.rows[row["path"]] = row
+
+    def add_rows(self, rows):
+        with open(self.path, "a") as file:
+            for row in rows:
+                self.rows[row["path"]] = row
+                file.write(json.dumps(row) + "\n")
+
+    def compact(self):
+        # Rows of outputs moved into a tar shard point at the shard instead.
+        self.rows = {path: row for path, row in self.rows.items()
+                     if os.path.exists(os.path.join(self.folder_path, row.get("shard") or path))}
+        atomic_write_text(self.path, "".join(json.dumps(row) + "\n" for row in self.rows.values()))
+
+    def write_tables(self):
+        """Write manifest.npz (columnar arrays) and, when pyarrow is installed, manifest.parquet."""
+        rows = list(self.rows.values())
+        base = os.path.splitext(self.path)[0]
+        columns = {key: np.array([row.get(key) or "" for row in rows], dtype=str)
+                   for key in ("path", "kind", "label", "source", "display_name", "caption", "shard", "member")}
+        for key in INT_COLUMNS:
+            columns[key] = np.array([-1 if row[key] is None else row[key] for row in rows], dtype=np.int64)
+        columns["fps"] = np.array([np.nan if row["fps"] is None else row["fps"] for row in rows], dtype=np.float64)
+        columns["crop"] = np.array([row["crop"] or [-1, -1, -1, -1] for row in rows], dtype=np.int64).reshape(-1, 4)
+        tmp = temp_path_for(base + ".npz")
+        np.savez(tmp, **columns)
+        os.replace(tmp, base + ".npz")
+        try:
+            import pyarrow as pa, pyarrow.parquet as pq
+        except ImportError:
+            print("pyarrow is not installed; skipped manifest.parquet")
+            return
+        tmp = temp_path_for(base + ".parquet")
+        pq.write_table(pa.Table.from_pylist(rows), tmp)
+        os.replace(tmp, base + ".parquet")
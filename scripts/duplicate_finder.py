@@ -0,0 +1,241 @@
+# duplicate_finder.py
+import cv2, numpy as np
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QPushButton, QLabel
+from PyQt6.QtCore import Qt
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+
+HASH_FRAMES = 4      # Frames sampled from the trim window per clip.
+HASH_WORDS = HASH_FRAMES  # One 64-bit dHash per sampled frame.
+MAX_DISTANCE = 12    # Default Hamming distance (of 256 bits) for a near duplicate.
+MAX_BUCKET = 256     # Bands shared by more distinct signatures than this carry no information (e.g. black frames).
+
+
+def dhash(frame):
+    """64-bit difference hash of a BGR frame."""
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int(np.packbits(bits.ravel()).view(">u8")[0])
+
+
+def hash_clip(video_path, trim_start, trim_length):
+    """Worker entry point: dHash HASH_FRAMES frames spread over the trim window."""
+    cv2.setNumThreads(1)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    last = max(trim_start, min(trim_start + trim_length, frame_count) - 1)
+    hashes = []
+    for pos in np.linspace(trim_start, last, HASH_FRAMES).astype(int):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(pos))
+        ret, frame = cap.read()
+        if ret:
+            hashes.append(dhash(frame))
+        elif hashes:
+            hashes.append(hashes[-1])
+    cap.release()
+    if not hashes:
+        return None
+    # Keep signatures a fixed size even if some seeks failed.
+    hashes += [hashes[-1]] * (HASH_FRAMES - len(hashes))
+    return "".join(f"{h:016x}" for h in hashes)
+
+
+def popcount64(values):
+    """Number of set bits for every element of a uint64 array."""
+    return np.unpackbits(values.view(np.uint8).reshape(*values.shape, 8), axis=-1).sum(axis=-1)
+
+
+class HashIndex:
+    """
+    Near-duplicate index over fixed-size binary signatures.
+
+    Identical signatures are collapsed to one distinct signature first, so any number of
+    exact copies costs one entry. Distinct signatures are split into 16-bit bands. Two
+    signatures within Hamming distance d < number of bands must agree exactly on at least
+    one band (pigeonhole), so candidates only come from equal band values and are then
+    verified with packed XOR/popcount. This avoids comparing every pair.
+    """
+
+    def __init__(self, signatures):
+        signatures = np.asarray(signatures, dtype=np.uint64).reshape(-1, HASH_WORDS)
+        # self.signatures[self.copies[i]] is the signature of input i.
+        self.signatures, copies = np.unique(signatures, axis=0, return_inverse=True)
+        self.copies = copies.ravel()
+        self.bands = self.signatures.view(np.uint16)
+
+    @classmethod
+    def from_hex(cls, hex_signatures):
+        words = [[int(sig[i:i + 16], 16) for i in range(0, 16 * HASH_WORDS, 16)] for sig in hex_signatures]
+        return cls(np.array(words, dtype=np.uint64))
+
+    def candidate_pairs(self):
+        n = len(self.signatures)
+        found = []
+        for band in self.bands.T:
+            order = np.argsort(band, kind="stable")
+            values = band[order]
+            starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+            sizes = np.diff(np.r_[starts, n])
+            for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+                if size > MAX_BUCKET:
+                    continue
+                members = order[start:start + size]
+                i, j = np.triu_indices(size, k=1)
+                found.append(np.stack([members[i], members[j]], axis=1))
+        if not found:
+            return np.empty((0, 2), dtype=np.int64)
+        pairs = np.sort(np.concatenate(found), axis=1)
+        return np.unique(pairs, axis=0)
+
+    def pairs(self, max_distance=MAX_DISTANCE):
+        """Return (pairs, distances) of all distinct signatures within max_distance of each other."""
+        max_distance = min(max_distance, self.bands.shape[1] - 1)  # Keep the pigeonhole guarantee.
+        pairs = self.candidate_pairs()
+        if len(pairs) == 0:
+            return pairs, np.empty(0, dtype=np.int64)
+        xor = self.signatures[pairs[:, 0]] ^ self.signatures[pairs[:, 1]]
+        distances = popcount64(xor).sum(axis=1)
+        keep = distances <= max_distance
+        return pairs[keep], distances[keep]
+
+    def groups(self, max_distance=MAX_DISTANCE):
+        """Connected groups (lists of input indices) of near-duplicate signatures, exact copies included."""
+        pairs, _ = self.pairs(max_distance)
+        parent = list(range(len(self.signatures)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in pairs:
+            root_i, root_j = find(int(i)), find(int(j))
+            if root_i != root_j:
+                parent[root_j] = root_i
+        grouped = {}
+        for i, distinct in enumerate(self.copies):
+            grouped.setdefault(find(int(distinct)), []).append(i)
+        return [members for members in grouped.values() if len(members) > 1]
+
+
+class DuplicateFinder:
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.pool = BackgroundPool(self.store_result, self.finished, self.update_status)
+
+    def cached_hash(self, display_name):
+        cached = self.main_app.clip_hashes.get(display_name)
+        hit = bool(cached) and (cached.get("trim_start") == self.main_app.trim_points.get(display_name, 0)
+                                and cached.get("trim_length") == self.main_app.trim_length)
+        instrumentation.cache("clip_hashes", hit)
+        return cached["hash"] if hit else None
+
+    def find_duplicates(self):
+        if self.pool.running:
+            print("Duplicate detection is already running.")
+            return
+        jobs = []
+        for entry in self.main_app.video_files:
+            display_name = entry["display_name"]
+            if self.cached_hash(display_name):
+                continue
+            trim_start = self.main_app.trim_points.get(display_name, 0)
+            jobs.append((display_name, (entry["original_path"], trim_start, self.main_app.trim_length)))
+        if jobs:
+            self.pool.submit_all(hash_clip, jobs)
+        else:
+            self.show_groups()
+
+    def store_result(self, display_name, result):
+        if result is None:
+            print(f"Could not hash {display_name}")
+            return
+        self.main_app.clip_hashes[display_name] = {
+            "trim_start": self.main_app.trim_points.get(display_name, 0),
+            "trim_length": self.main_app.trim_length,
+            "hash": result,
+        }
+
+    def finished(self):
+        self.main_app.loader.save_session()
+        self.show_groups()
+
+    def duplicate_groups(self):
+        """Groups of display names whose trim windows look the same."""
+        names = [e["display_name"] for e in self.main_app.video_files if self.cached_hash(e["display_name"])]
+        if len(names) < 2:
+            return []
+        index = HashIndex.from_hex([self.cached_hash(name) for name in names])
+        return [[names[i] for i in members] for members in index.groups()]
+
+    def show_groups(self):
+        groups = self.duplicate_groups()
+        if not groups:
+            print("No near-duplicate clips found.")
+            return
+        DuplicateGroupsDialog(self.main_app, groups).exec()
+
+    def update_status(self, done, total):
+        if done < total:
+            self.main_app.duplicates_button.setText(f"Hashing Clips ({done}/{total})")
+        else:
+            self.main_app.duplicates_button.setText("Find Near-Duplicates")
+
+    def stop(self):
+        self.pool.shutdown()
+        self.main_app.duplicates_button.setText("Find Near-Duplicates")
+
+
+class DuplicateGroupsDialog(QDialog):
+    """Lists near-duplicate groups; checked clips keep their export flag, the rest are unchecked."""
+
+    def __init__(self, main_app, groups):
+        super().__init__(main_app)
+        self.main_app = main_app
+        self.setWindowTitle("Near-Duplicate Clips")
+        self.resize(600, 500)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"{len(groups)} group(s) of near-identical clips. "
+                                "Checked clips are kept; unchecked clips will be excluded from export."))
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Clip"])
+        for number, members in enumerate(groups, 1):
+            group_item = QTreeWidgetItem(self.tree, [f"Group {number} ({len(members)} clips)"])
+            keeper = self.pick_keeper(members)
+            for name in members:
+                child = QTreeWidgetItem(group_item, [name])
+                child.setFlags(child.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+                child.setCheckState(0, Qt.CheckState.Checked if name == keeper else Qt.CheckState.Unchecked)
+            group_item.setExpanded(True)
+        layout.addWidget(self.tree)
+
+        buttons = QHBoxLayout()
+        apply_button = QPushButton("Uncheck Extras")
+        apply_button.clicked.connect(self.apply)
+        buttons.addWidget(apply_button)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.reject)
+        buttons.addWidget(close_button)
+        layout.addLayout(buttons)
+
+    def pick_keeper(self, members):
+        """Keep the sharpest clip when quality metrics are available, otherwise the first one."""
+        metrics = self.main_app.quality_metrics
+        return max(members, key=lambda name: metrics.metric_value(name, "sharpness") or 0)
+
+    def apply(self):
+        extras = []
+        for g in range(self.tree.topLevelItemCount()):
+            group_item = self.tree.topLevelItem(g)
+            for c in range(group_item.childCount()):
+                child = group_item.child(c)
+                if child.checkState(0) != Qt.CheckState.Checked:
+                    extras.append(child.text(0))
+        self.main_app.loader.set_export_enabled(extras, False)
+        print(f"Unchecked {len(extras)} near-duplicate clip(s).")
+        self.accept()
@@ -0,0 +1,47 @@
+# encoder_profiles.py
+import os, json
+
+DEFAULT_ENCODER_PROFILE = "Container defaults"
+CALIBRATION_FILE = "encoder_calibration.json"
+
+# ffmpeg output options per profile. "container" replaces the source extension;
+# "cost" (encode work per pixel, H.264 medium = 1) and "bytes_per_pixel" feed the export planner.
+ENCODER_PROFILES = {
+    # Legacy behaviour: keep the source extension and let ffmpeg pick its default codec.
+    DEFAULT_ENCODER_PROFILE: {},
+    "H.264 fast": {"vcodec": "libx264", "preset": "veryfast", "crf": 20, "pix_fmt": "yuv420p", "threads": 0,
+                   "container": ".mp4", "cost": 0.4, "bytes_per_pixel": 0.02},
+    "H.264 balanced": {"vcodec": "libx264", "preset": "medium", "crf": 18, "pix_fmt": "yuv420p", "threads": 0,
+                       "container": ".mp4", "cost": 1.0, "bytes_per_pixel": 0.02},
+    "H.264 archival": {"vcodec": "libx264", "preset": "slow", "crf": 14, "pix_fmt": "yuv420p", "threads": 0,
+                       "container": ".mp4", "cost": 2.0, "bytes_per_pixel": 0.04},
+    "HEVC small": {"vcodec": "libx265", "preset": "medium", "crf": 24, "pix_fmt": "yuv420p", "tag:v": "hvc1",
+                   "threads": 0, "container": ".mp4", "cost": 4.0, "bytes_per_pixel": 0.006},
+    "VP9": {"vcodec": "libvpx-vp9", "crf": 32, "b:v": 0, "row-mt": 1, "pix_fmt": "yuv420p", "threads": 0,
+            "container": ".webm", "cost": 4.0, "bytes_per_pixel": 0.008},
+    "FFV1 lossless": {"vcodec": "ffv1", "level": 3, "pix_fmt": "yuv420p", "threads": 0,
+                      "container": ".mkv", "cost": 0.5, "bytes_per_pixel": 0.6},
+}
+PROFILE_META = ("container", "cost", "bytes_per_pixel")
+
+
+def encoder_settings(name):
+    """Split a profile into (ffmpeg output kwargs, container extension or None, planner hints)."""
+    profile = ENCODER_PROFILES.get(name)
+    if profile is None:
+        print(f"[Warning] Unknown encoder profile '{name}', using {DEFAULT_ENCODER_PROFILE}")
+        profile = ENCODER_PROFILES[DEFAULT_ENCODER_PROFILE]
+    output_args = {key: value for key, value in profile.items() if key not in PROFILE_META}
+    hints = {key: profile[key] for key in ("cost", "bytes_per_pixel") if key in profile}
+    return output_args, profile.get("container"), hints
+
+
+def load_calibration(path=CALIBRATION_FILE):
+    """Profile name -> calibration result from benchmarks.encoder_calibration, if it has been run."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as file:
+            return {r["profile"]: r for r in json.load(file).get("results", [])}
+    except (OSError, ValueError, KeyError):
+        return {}
@@ -0,0 +1,110 @@
+# export_planner.py
+import os, shutil
+from collections import defaultdict, deque
+
+# Work is counted in pixels: every decoded source pixel costs 1, every encoded
+# output pixel costs the encoder profile's cost, or the factor of the container's default codec.
+DEFAULT_THROUGHPUT = 60e6  # Work units per second until an export has been timed.
+SMART_CUT_FACTOR = 0.15  # Share of a full decode + encode left when most GOPs are stream-copied.
+ENCODER_FACTORS = {".mp4": 1.0, ".mov": 1.0, ".mkv": 1.0, ".webm": 4.0, ".avi": 0.3}
+STILL_FACTORS = {"png": 0.5, "jpg": 0.2, "webp": 1.0}
+# Approximate output bytes per pixel.
+VIDEO_BYTES_PER_PIXEL = {".webm": 0.01, ".avi": 0.025}
+DEFAULT_VIDEO_BYTES_PER_PIXEL = 0.0125  # About 0.1 bits per pixel, libx264 defaults.
+STILL_BYTES_PER_PIXEL = {"png": 1.5, "jpg": 0.25, "webp": 0.2}
+FREE_SPACE_MARGIN = 1.1
+
+
+def estimate_job(job):
+    """Return (work units, output bytes) for one export job."""
+    src_w, src_h = job.get("source_size") or job.get("expected_size") or (0, 0)
+    if job["kind"] == "stills":
+        frames = [frame for frame, _, _ in job["outputs"]]
+        decoded = src_w * src_h * (max(frames) - min(frames) + 1)
+        work, size = decoded, 0
+        for _, crop, _ in job["outputs"]:
+            pixels = crop[2] * crop[3] if crop else src_w * src_h
+            work += pixels * STILL_FACTORS.get(job["format"], 1.0)
+            size += pixels * STILL_BYTES_PER_PIXEL.get(job["format"], 1.0)
+        return work, size
+    frames = job.get("expected_frames") or 0
+    out_w, out_h = job.get("expected_size") or (src_w, src_h)
+    out_pixels = out_w * out_h * frames
+    if job["kind"] == "frames":
+        # No encode; the cost is copying raw RGB into the array.
+        return src_w * src_h * frames + out_pixels * 0.05, out_pixels * 3
+    ext = os.path.splitext(job["output"])[1].lower()
+    hints = job.get("encoder_hints") or {}
+    work = src_w * src_h * frames + out_pixels * hints.get("cost", ENCODER_FACTORS.get(ext, 1.0))
+    if job.get("smart_cut"):
+        work *= SMART_CUT_FACTOR
+    return work, out_pixels * hints.get("bytes_per_pixel", VIDEO_BYTES_PER_PIXEL.get(ext, DEFAULT_VIDEO_BYTES_PER_PIXEL))
+
+
+def note_problem(problems, display_name, reason):
+    """Record an entry the planner had to skip (or export only in part) and print it."""
+    print(f"[Warning] {display_name}: {reason}")
+    problems.append([display_name, reason])
+
+
+def source_device(path):
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+def order_jobs(jobs):
+    """
+    Longest jobs first, interleaved across the disks the sources live on, so one
+    long 4K job does not end up running alone at the end of a batch and
+    consecutive jobs do not all read from the same disk.
+    """
+    by_device = defaultdict(deque)
+    for job in sorted(jobs, key=lambda job: estimate_job(job)[0], reverse=True):
+        by_device[source_device(job["source"])].append(job)
+    queues = sorted(by_device.values(), key=lambda queue: estimate_job(queue[0])[0], reverse=True)
+    ordered = []
+    while queues:
+        for queue in queues:
+            ordered.append(queue.popleft())
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+
+def plan_report(jobs, problems, folder_path, throughput=None):
+    """Summarize a planned batch: estimated time and size per job and in total, plus free disk space."""
+    throughput = throughput or DEFAULT_THROUGHPUT
+    rows = []
+    for job in jobs:
+        work, size = estimate_job(job)
+        rows.append({"output": job["output"], "kind": job["kind"], "label": job["label"],
+                     "seconds": round(work / throughput, 2), "bytes": int(size)})
+    total_bytes = sum(row["bytes"] for row in rows)
+    existing = folder_path
+    while existing and not os.path.exists(existing):
+        existing = os.path.dirname(existing)
+    free = shutil.disk_usage(existing or ".").free
+    return {
+        "jobs": rows,
+        "problems": problems,
+        "total_seconds": round(sum(row["seconds"] for row in rows), 1),
+        "total_bytes": total_bytes,
+        "free_bytes": free,
+        "fits_on_disk": total_bytes * FREE_SPACE_MARGIN <= free,
+        "throughput": throughput,
+    }
+
+
+def describe_report(report):
+    minutes, seconds = divmod(int(report["total_seconds"]), 60)
+    lines = [
+        f"{len(report['jobs'])} job(s), about {minutes}m {seconds}s "
+        f"and {report['total_bytes'] / 1e9:.2f} GB (free: {report['free_bytes'] / 1e9:.1f} GB).",
+    ]
+    if not report["fits_on_disk"]:
+        lines.append("Not enough free disk space for this export.")
+    if report["problems"]:
+        lines.append(f"{len(report['problems'])} problem(s) found; these entries are skipped or only partly exported:")
+        lines.extend(f"  {name}: {problem}" for name, problem in report["problems"])
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+# export_queue.py
+import os, json, time
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+def temp_path_for(path):
+    """Temporary sibling of an output path that keeps the extension (ffmpeg/cv2 pick the format from it)."""
+    base, ext = os.path.splitext(path)
+    return f"{base}.partial{ext}"
+
+
+def atomic_write_text(path, text):
+    tmp = temp_path_for(path)
+    with open(tmp, "w") as file:
+        file.write(text)
+    os.replace(tmp, path)
+
+
+class ExportQueue:
+    """
+    Persistent export job queue backed by an append-only JSONL journal.
+
+    The first lines of the journal hold the jobs ({"job": {...}}); every state
+    change appends one {"id", "state", "attempts", "error"} line and is flushed to
+    disk, so a crash loses at most the job that was running. Loading replays the
+    journal; jobs that were running when the app died go back to pending.
+    """
+
+    MAX_ATTEMPTS = 3
+    BACKOFF_SECONDS = 2.0  # Doubles after every failed attempt.
+
+    def __init__(self, path):
+        self.path = path
+        self.jobs = []
+        self.by_id = {}
+
+    @classmethod
+    def load(cls, path):
+        """Return the queue stored at path, or None if there is none."""
+        if not os.path.exists(path):
+            return None
+        queue = cls(path)
+        with open(path, "r") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash; everything before it is intact.
+                    break
+                if "job" in record:
+                    queue.add(record["job"])
+                elif record.get("id") in queue.by_id:
+                    job = queue.by_id[record["id"]]
+                    for key in ("state", "attempts", "error"):
+                        if key in record:
+                            job[key] = record[key]
+        for job in queue.jobs:
+            if job["state"] == RUNNING:
+                job["state"] = PENDING
+        return queue
+
+    def add(self, job):
+        job.setdefault("id", len(self.jobs))
+        job.setdefault("state", PENDING)
+        job.setdefault("attempts", 0)
+        job.setdefault("error", None)
+        self.jobs.append(job)
+        self.by_id[job["id"]] = job
+
+    def reset(self, jobs):
+        """Start a new batch: replace the journal with these jobs, all pending."""
+        self.jobs = []
+        self.by_id = {}
+        for job in jobs:
+            self.add(job)
+        tmp = temp_path_for(self.path)
+        with open(tmp, "w") as file:
+            for job in self.jobs:
+                file.write(json.dumps({"job": job}) + "\n")
+        os.replace(tmp, self.path)
+
+    def set_state(self, job, state, error=None):
+        job["state"] = state
+        job["error"] = error
+        with open(self.path, "a") as file:
+            file.write(json.dumps({"id": job["id"], "state": state,
+                                   "attempts": job["attempts"], "error": error}) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def unfinished(self):
+        return [job for job in self.jobs if job["state"] in (PENDING, RUNNING)]
+
+    def failures(self):
+        return [job for job in self.jobs if job["state"] == FAILED]
+
+    def run(self, execute, on_done=None):
+        """
+        Run every unfinished job through execute(job), retrying failures with backoff.
+        execute must raise on failure. on_done(job) is called after each success.
+        """
+        for job in self.unfinished():
+            while True:
+                job["attempts"] += 1
+                self.set_state(job, RUNNING)
+                try:
+                    execute(job)
+                except Exception as e:
+                    error = str(e).strip() or type(e).__name__
+                    if job["attempts"] >= self.MAX_ATTEMPTS:
+                        self.set_state(job, FAILED, error)
+                        print(f"❌ Giving up on {job['output']} after {job['attempts']} attempt(s): {error}")
+                        break
+                    delay = self.BACKOFF_SECONDS * 2 ** (job["attempts"] - 1)
+                    print(f"[Retry] {job['output']} failed ({error}); retrying in {delay:.0f}s")
+                    self.set_state(job, PENDING, error)
+                    time.sleep(delay)
+                    continue
+                self.set_state(job, DONE)
+                if on_done:
+                    on_done(job)
+                break
+
+    def write_failure_report(self, path):
+        """Write failed jobs to a JSON report; returns the number of failures."""
+        failures = self.failures()
+        report = [{
+            "display_name": job.get("display_name"),
+            "source": job.get("source"),
+            "output": job["output"],
+            "attempts": job["attempts"],
+            "error": job["error"],
+        } for job in failures]
+        atomic_write_text(path, json.dumps(report, indent=2))
+        return len(failures)
@@ -0,0 +1,140 @@
+# filter_chain.py
+from fractions import Fraction
+
+NO_FILTERS = "none"  # Per-clip override that disables the default chain.
+
+# Exports derive the output size from the crop and scale, and the frame count from the
+# trim window and output fps, so custom filters must keep both. These change the frame
+# size or aspect, or change the frame rate or count in ways that cannot be predicted,
+# and are rejected. An fps filter instead sets the output rate (see take_fps).
+SIZE_FILTERS = {"scale", "zscale", "crop", "pad", "transpose", "rotate", "zoompan", "tile", "untile"}
+TIMING_FILTERS = {"framerate", "minterpolate", "setpts", "select", "decimate", "mpdecimate", "framestep",
+                  "telecine", "detelecine", "tpad", "trim", "loop", "tinterlace", "interlace", "separatefields",
+                  "weave", "fieldmatch"}
+# Deinterlacers that can output one frame per field, with their default mode.
+FIELD_RATE_FILTERS = {"yadif": "send_frame", "bwdif": "send_field"}
+FIELD_RATE_MODES = {"1", "3", "send_field", "send_field_nospatial"}
+# Named rates the fps filter accepts; ffmpeg's default rate is 25.
+RATE_NAMES = {"ntsc": "30000/1001", "pal": "25", "film": "24", "ntsc_film": "24000/1001"}
+DEFAULT_FPS_RATE = "25"
+
+
+def split_unquoted(text, separator, maxsplit=-1):
+    """Split on a separator that is outside '...' quotes and not escaped with a backslash."""
+    parts, current, quoted, escaped = [], [], False, False
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == "\\" and not quoted:
+            escaped = True
+        elif char == "'":
+            quoted = not quoted
+        elif char == separator and not quoted and maxsplit != 0:
+            parts.append("".join(current))
+            current = []
+            maxsplit -= 1
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def unquote(text):
+    """The literal value of an option: quotes and backslash escapes removed (ffmpeg-python re-escapes it)."""
+    value, quoted, escaped = [], False, False
+    for char in text.strip():
+        if escaped:
+            value.append(char)
+            escaped = False
+        elif char == "\\" and not quoted:
+            escaped = True
+        elif char == "'":
+            quoted = not quoted
+        else:
+            value.append(char)
+    return "".join(value)
+
+
+def parse_rate(value):
+    """An fps filter rate such as '24', '30000/1001' or 'ntsc' as a number, or None if it is not one."""
+    value = str(value).strip()
+    try:
+        rate = Fraction(RATE_NAMES.get(value.lower(), value))
+    except (ValueError, ZeroDivisionError):
+        return None
+    if rate <= 0:
+        return None
+    return int(rate) if rate.denominator == 1 else float(rate)
+
+
+def fps_filter_rate(args, kwargs):
+    return parse_rate(kwargs.get("fps", args[0] if args else DEFAULT_FPS_RATE))
+
+
+def take_fps(filters):
+    """
+    Split the fps filters out of a parsed chain. Returns (the other filters, the rate of the
+    last fps filter or None); exports apply the rate with their own fps filter and output r=,
+    and count the expected frames at that rate.
+    """
+    rest, rate = [], None
+    for name, args, kwargs in filters:
+        if name == "fps":
+            rate = fps_filter_rate(args, kwargs)
+        else:
+            rest.append([name, args, kwargs])
+    return rest, rate
+
+
+def unsupported_reason(name, args, kwargs):
+    """Why a filter cannot run in an export chain, or None if its output size and timing are known."""
+    if name == "fps" and fps_filter_rate(args, kwargs) is None:
+        return "its rate is not a number"
+    if name in SIZE_FILTERS:
+        return "it changes the frame size"
+    if name in TIMING_FILTERS:
+        return "it changes the frame rate or count"
+    if name in FIELD_RATE_FILTERS:
+        mode = kwargs.get("mode", args[0] if args else FIELD_RATE_FILTERS[name])
+        if mode in FIELD_RATE_MODES:
+            return "it outputs one frame per field (use mode=send_frame)"
+    return None
+
+
+def parse_filter_chain(text):
+    """
+    Parse an ffmpeg-style chain such as 'yadif, hqdn3d=4:3:6:4.5, eq=contrast=1.1'
+    into [name, args, kwargs] filter specs, the same shape export jobs use. Commas and
+    colons inside '...' quotes or escaped with a backslash belong to the option value.
+    """
+    filters = []
+    for token in split_unquoted(text, ","):
+        token = token.strip()
+        if not token:
+            continue
+        name, options = (split_unquoted(token, "=", 1) + [""])[:2]
+        name = name.strip()
+        if not name.replace("_", "").isalnum():
+            print(f"[Warning] Ignoring invalid filter '{token}'")
+            continue
+        args, kwargs = [], {}
+        for option in split_unquoted(options, ":") if options else []:
+            parts = split_unquoted(option, "=", 1)
+            if len(parts) == 2:
+                kwargs[parts[0].strip()] = unquote(parts[1])
+            else:
+                args.append(unquote(option))
+        reason = unsupported_reason(name, args, kwargs)
+        if reason:
+            print(f"[Warning] Ignoring filter '{token}': {reason}")
+            continue
+        filters.append([name, args, kwargs])
+    return filters
+
+
+def clip_filter_chain(main_app, display_name):
+    """Filters for one entry: its override if set, otherwise the global default chain."""
+    text = getattr(main_app, "clip_filters", {}).get(display_name, "").strip() or getattr(main_app, "filter_chain", "")
+    if text.strip().lower() == NO_FILTERS:
+        return []
+    return parse_filter_chain(text)
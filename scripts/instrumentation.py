@@ -0,0 +1,149 @@
+# instrumentation.py
+import os, csv, json, time
+from collections import deque
+
+MAX_EVENTS = 100000   # Raw span events kept for dumps.
+RECENT_SAMPLES = 512  # Samples per span kept for percentiles and the HUD.
+
+
+class _NullSpan:
+    """Shared no-op context manager returned while instrumentation is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("owner", "name", "start")
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.owner.record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+class SpanStats:
+    __slots__ = ("count", "total", "max", "recent", "ends")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+        self.ends = deque(maxlen=RECENT_SAMPLES)  # perf_counter at span end, for rates.
+
+
+class Instrumentation:
+    """
+    Timing spans, counters and cache hit rates for the hot paths.
+
+    Usage: `with instrumentation.span("decode"): ...`, `instrumentation.count(name)`
+    and `instrumentation.cache(name, hit)`. While disabled, span() returns a shared
+    no-op object and the other calls return immediately. Enable with the
+    HUNYCLIP_METRICS=1 environment variable or the "Performance HUD" toggle.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get("HUNYCLIP_METRICS", "") not in ("", "0")
+        self.reset()
+
+    def reset(self):
+        self.spans = {}
+        self.counters = {}
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.started = time.perf_counter()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name, start, duration):
+        stats = self.spans.get(name)
+        if stats is None:
+            stats = self.spans[name] = SpanStats()
+        stats.count += 1
+        stats.total += duration
+        if duration > stats.max:
+            stats.max = duration
+        stats.recent.append(duration)
+        stats.ends.append(start + duration)
+        self.events.append((name, start - self.started, duration))
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def cache(self, name, hit):
+        if self.enabled:
+            key = f"{name}.hit" if hit else f"{name}.miss"
+            self.counters[key] = self.counters.get(key, 0) + 1
+
+    def recent_ms(self, name):
+        """Mean of the recent samples of a span in milliseconds, or None."""
+        stats = self.spans.get(name)
+        if not stats or not stats.recent:
+            return None
+        return sum(stats.recent) / len(stats.recent) * 1000
+
+    def rate(self, name, window=1.0):
+        """How many times a span finished per second over the last `window` seconds."""
+        stats = self.spans.get(name)
+        if not stats:
+            return 0.0
+        cutoff = time.perf_counter() - window
+        return sum(1 for end in stats.ends if end >= cutoff) / window
+
+    def summary(self):
+        spans = {}
+        for name, stats in self.spans.items():
+            recent = sorted(stats.recent)
+            spans[name] = {
+                "count": stats.count,
+                "total_ms": round(stats.total * 1000, 3),
+                "mean_ms": round(stats.total / stats.count * 1000, 3),
+                "p50_ms": round(recent[len(recent) // 2] * 1000, 3),
+                "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 3),
+                "max_ms": round(stats.max * 1000, 3),
+            }
+        caches = {}
+        for key in self.counters:
+            if key.endswith(".hit") or key.endswith(".miss"):
+                name = key.rsplit(".", 1)[0]
+                hits = self.counters.get(f"{name}.hit", 0)
+                misses = self.counters.get(f"{name}.miss", 0)
+                caches[name] = {"hits": hits, "misses": misses,
+                                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None}
+        return {"spans": spans, "counters": dict(self.counters), "caches": caches}
+
+    def dump(self, base_path):
+        """Write <base_path>.json (summary and events) and <base_path>.csv (events)."""
+        with open(base_path + ".json", "w") as file:
+            json.dump({
+                "summary": self.summary(),
+                "events": [{"name": n, "start_s": round(s, 6), "duration_ms": round(d * 1000, 4)}
+                           for n, s, d in self.events],
+            }, file, indent=1)
+        with open(base_path + ".csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["name", "start_s", "duration_ms"])
+            for name, start, duration in self.events:
+                writer.writerow([name, f"{start:.6f}", f"{duration * 1000:.4f}"])
+        print(f"Saved metrics to {base_path}.json and {base_path}.csv")
+
+
+instrumentation = Instrumentation()
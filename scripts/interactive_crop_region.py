@@ -24,6 +24,7 @@ class InteractiveCropRegion(QGraphicsRectItem):
         self.setFlag(QGraphicsRectItem.GraphicsItemFlag.ItemIsFocusable, True)
         self.setPen(QPen(QColor("red"), 2))
         self.setBrush(QBrush(QColor(165, 0, 0, 30)))
+        self.handle_brush = QBrush(QColor("red"))
         
         # Internal state for resizing
         self.active_handle = None  # "top_left", "top_right", "bottom_left", or "bottom_right"
@@ -54,18 +55,14 @@ class InteractiveCropRegion(QGraphicsRectItem):
             "bottom_left": QRectF(r.left() - half, r.bottom() - half, s, s),
             "bottom_right": QRectF(r.right() - half, r.bottom() - half, s, s)
         }
-        # Request a repaint for the whole bounding rect
-        self.update()
+        # No update() here: setRect() already repaints the old and new bounding rects.
 
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: QWidget = None):
         painter.setPen(self.pen())
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawRect(self.rect())
-        painter.setBrush(QBrush(QColor("red")))
-        for handle_rect in self.handle_positions.values():
-            painter.drawRect(handle_rect)
-            painter.drawRect(handle_rect)
-            painter.drawRect(handle_rect)
+        painter.setBrush(self.handle_brush)
+        painter.drawRects(list(self.handle_positions.values()))
 
     def hoverMoveEvent(self, event: QMouseEvent):
         pos = QPointF(event.pos())
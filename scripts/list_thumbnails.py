@@ -0,0 +1,139 @@
+# list_thumbnails.py
+import os, hashlib, cv2
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QSize, QTimer
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+from scripts.export_queue import temp_path_for
+from scripts.staging_cache import resolve_source
+
+THUMBNAIL_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hunyclip", "thumbnails")
+THUMBNAIL_SIZE = (96, 54)  # Bounding box of a list icon.
+THUMBNAIL_MARGIN = 10      # Rows above and below the viewport that are rendered ahead of scrolling.
+
+
+def render_thumbnail(video_path, frame_index, dest):
+    """Worker entry point: write a small JPEG of one source frame. Returns dest, or None on failure."""
+    cv2.setNumThreads(1)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    try:
+        with instrumentation.span("thumbnail_decode"):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
+            ret, frame = cap.read()
+    finally:
+        cap.release()
+    if not ret:
+        return None
+    h, w = frame.shape[:2]
+    scale = min(THUMBNAIL_SIZE[0] / w, THUMBNAIL_SIZE[1] / h)
+    small = cv2.resize(frame, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    tmp = temp_path_for(dest)
+    if not cv2.imwrite(tmp, small, [cv2.IMWRITE_JPEG_QUALITY, 80]):
+        return None
+    os.replace(tmp, dest)
+    return dest
+
+
+class ListThumbnails:
+    """
+    Icons for the clip list, rendered on worker threads only for rows in or near the viewport.
+
+    Thumbnails show the entry's trim point and are cached on disk keyed by (path, mtime,
+    trim point), so moving the trim point or replacing the file yields a new thumbnail.
+    The GUI thread only stats files and loads the small cached JPEGs.
+    """
+
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.pool = BackgroundPool(self.show_thumbnail, executor_class=ThreadPoolExecutor, max_workers=2, interval=50)
+        self.mtimes = {}  # Sources are stat'ed once per session; lookups stay off the network.
+        self.waiting = {}  # cache path -> display name
+        self.update_timer = QTimer()
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(100)
+        self.update_timer.timeout.connect(self.update_visible)
+
+    def attach(self, list_widget):
+        list_widget.setIconSize(QSize(*THUMBNAIL_SIZE))
+        list_widget.setUniformItemSizes(True)
+        list_widget.verticalScrollBar().valueChanged.connect(self.schedule)
+        list_widget.model().modelReset.connect(self.schedule)
+
+    def schedule(self, *args):
+        """Coalesce scrolls, list rebuilds and trim edits into one update."""
+        self.update_timer.start()
+
+    def cache_path(self, entry):
+        source = entry["original_path"]
+        mtime = self.mtimes.get(source)
+        if mtime is None:
+            try:
+                mtime = self.mtimes[source] = os.path.getmtime(source)
+            except OSError:
+                return None
+        trim_start = self.main_app.trim_points.get(entry["display_name"], 0)
+        key = hashlib.sha1(f"{os.path.abspath(source)}|{mtime}|{trim_start}".encode("utf8")).hexdigest()
+        return os.path.join(THUMBNAIL_DIR, key + ".jpg")
+
+    def visible_rows(self):
+        list_widget = self.main_app.video_list
+        count = list_widget.count()
+        if not count:
+            return range(0)
+        viewport = list_widget.viewport().rect()
+        first = list_widget.indexAt(viewport.topLeft()).row()
+        last = list_widget.indexAt(viewport.bottomLeft()).row()
+        first = 0 if first < 0 else first
+        last = count - 1 if last < 0 else last
+        return range(max(0, first - THUMBNAIL_MARGIN), min(count, last + 1 + THUMBNAIL_MARGIN))
+
+    def update_visible(self):
+        list_widget = self.main_app.video_list
+        model = self.main_app.clip_model
+        files = self.main_app.video_files
+        wanted = {}
+        for row in self.visible_rows():
+            if row >= len(files) or list_widget.isRowHidden(row):
+                continue
+            entry = files[row]
+            path = self.cache_path(entry)
+            if path is None or model.icon_path(entry["display_name"]) == path:
+                continue
+            hit = os.path.exists(path)
+            instrumentation.cache("thumbnail", hit)
+            if hit:
+                model.set_icon(entry["display_name"], path)
+            else:
+                wanted[path] = entry
+        # Drop queued renders for rows that scrolled away or whose trim point moved.
+        for path in list(self.waiting):
+            if path not in wanted:
+                self.pool.cancel(path)
+                if path not in self.pool.pending.values():
+                    del self.waiting[path]
+        jobs = []
+        for path, entry in wanted.items():
+            if path in self.waiting:
+                continue
+            self.waiting[path] = entry["display_name"]
+            trim_start = self.main_app.trim_points.get(entry["display_name"], 0)
+            jobs.append((path, (resolve_source(self.main_app, entry["original_path"]), trim_start, path)))
+        if jobs:
+            os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+            self.pool.submit_all(render_thumbnail, jobs)
+
+    def show_thumbnail(self, path, result):
+        display_name = self.waiting.pop(path, None)
+        if result is None:
+            return
+        model = self.main_app.clip_model
+        row = model.row_of(display_name)
+        if row is not None and self.cache_path(self.main_app.video_files[row]) == path:
+            model.set_icon(display_name, path)
+
+    def stop(self):
+        self.update_timer.stop()
+        self.pool.shutdown()
+        self.waiting = {}
@@ -0,0 +1,127 @@
+# output_preview.py
+import threading, numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtCore import QTimer
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+from scripts.video_exporter import VideoExporter, scaled_height
+from scripts.subject_tracker import track_commands
+
+PREVIEW_EDGE = 384  # Width the export output is shrunk to for the preview.
+
+
+def render_preview(job, max_width, cancel_event):
+    """
+    Run a job's export filter graph, plus a final downscale, into memory through a
+    rawvideo pipe. Returns ((frames, h, w, 3) uint8 RGB, fps), or None if cancelled.
+    """
+    out_w, out_h = job["expected_size"]
+    width = min(max_width, out_w)
+    width -= width % 2
+    height = scaled_height(out_w, out_h, width)
+    frame_bytes = width * height * 3
+    with track_commands(job), instrumentation.span("preview_render"):
+        stream = (
+            VideoExporter.filter_graph(job)
+            .filter('scale', width, height)
+            .output('pipe:', format='rawvideo', pix_fmt='rgb24', vframes=job["expected_frames"])
+            .global_args('-loglevel', 'error')
+        )
+        process = stream.run_async(pipe_stdout=True)
+        frames = np.empty((job["expected_frames"], height, width, 3), dtype=np.uint8)
+        count = 0
+        try:
+            while count < len(frames):
+                if cancel_event.is_set():
+                    process.kill()
+                    return None
+                buffer = process.stdout.read(frame_bytes)
+                if len(buffer) < frame_bytes:
+                    break
+                frames[count] = np.frombuffer(buffer, np.uint8).reshape(height, width, 3)
+                count += 1
+        finally:
+            process.stdout.close()
+            process.wait()
+    return frames[:count], job["output_fps"]
+
+
+class OutputPreview(QLabel):
+    """
+    Overlay in the corner of the video view that loops the current entry's trim window
+    as the export would produce it (crop, custom filters, scale), at reduced size.
+    Crop and trim changes re-render after a short pause; a newer render cancels the older one.
+    """
+
+    def __init__(self, main_app, parent):
+        super().__init__(parent)
+        self.main_app = main_app
+        self.setStyleSheet("background-color: black; border: 1px solid #88C0D0;")
+        self.hide()
+        self.pool = BackgroundPool(self.show_render, executor_class=ThreadPoolExecutor, max_workers=1, interval=30)
+        self.generation = 0
+        self.cancel_event = None
+        self.frames = None
+        self.frame_index = 0
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(150)
+        self.debounce_timer.timeout.connect(self.render)
+        self.play_timer = QTimer(self)
+        self.play_timer.timeout.connect(self.next_frame)
+
+    def toggle(self):
+        if self.isVisible():
+            self.stop()
+        else:
+            self.show()
+            self.render()
+
+    def invalidate(self):
+        """Crop or trim changed: re-render once edits pause."""
+        if self.isVisible():
+            self.debounce_timer.start()
+
+    def render(self):
+        entry = self.main_app.editor.current_entry()
+        job = self.main_app.exporter.preview_job(entry) if entry else None
+        if job is None:
+            return
+        if self.cancel_event:
+            self.cancel_event.set()
+        self.pool.cancel(self.generation)
+        self.cancel_event = threading.Event()
+        self.generation += 1
+        self.pool.submit_all(render_preview, [(self.generation, (job, PREVIEW_EDGE, self.cancel_event))])
+
+    def show_render(self, generation, result):
+        if generation != self.generation or result is None or not self.isVisible():
+            return  # Superseded by a newer render.
+        frames, fps = result
+        if not len(frames):
+            return
+        self.frames = frames
+        self.frame_index = 0
+        self.setFixedSize(frames.shape[2], frames.shape[1])
+        self.play_timer.start(max(1, round(1000 / fps)))
+        self.next_frame()
+
+    def next_frame(self):
+        frame = self.frames[self.frame_index]
+        h, w, _ = frame.shape
+        self.setPixmap(QPixmap.fromImage(QImage(frame.data, w, h, 3 * w, QImage.Format.Format_RGB888)))
+        self.frame_index = (self.frame_index + 1) % len(self.frames)
+        parent = self.parentWidget()
+        self.move(parent.width() - w - 8, parent.height() - h - 8)
+        self.raise_()
+
+    def stop(self):
+        self.debounce_timer.stop()
+        self.play_timer.stop()
+        if self.cancel_event:
+            self.cancel_event.set()
+        self.pool.shutdown()
+        self.frames = None
+        self.hide()
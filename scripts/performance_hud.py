@@ -0,0 +1,44 @@
+# performance_hud.py
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import QTimer
+from scripts.instrumentation import instrumentation
+
+class PerformanceHud(QLabel):
+    """Small overlay in the corner of the video view showing display fps and hot-path timings."""
+
+    SPANS = (("decode", "decode"), ("seek", "seek"), ("color_convert", "cvt"), ("pixmap_scale", "scale"),
+             ("canvas_paint", "paint"))
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: #A3BE8C; "
+                           "font-family: monospace; font-size: 11px; padding: 3px;")
+        self.move(6, 6)
+        self.hide()
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+
+    def set_enabled(self, enabled):
+        instrumentation.enabled = enabled
+        if enabled:
+            self.refresh()
+            self.show()
+            self.timer.start()
+        else:
+            self.timer.stop()
+            self.hide()
+
+    def refresh(self):
+        parts = [f"{instrumentation.rate('display_frame'):5.1f} fps"]
+        for name, label in self.SPANS:
+            ms = instrumentation.recent_ms(name)
+            if ms is not None:
+                parts.append(f"{label} {ms:.1f} ms")
+        refresh_rate = self.screen().refreshRate() if self.screen() else 0
+        if refresh_rate > 0:
+            # Canvas paints must fit in one display frame to keep up with the screen.
+            parts.append(f"budget {1000 / refresh_rate:.1f} ms @ {refresh_rate:.0f} Hz")
+        self.setText("  |  ".join(parts))
+        self.adjustSize()
+        self.raise_()
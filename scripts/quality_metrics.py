@@ -0,0 +1,163 @@
+# quality_metrics.py
+import cv2, numpy as np
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+
+ANALYSIS_WIDTH = 256  # Frames are downscaled to this width before measuring.
+METRIC_NAMES = {
+    "sharpness": "Sharpness",
+    "motion": "Motion",
+    "brightness": "Brightness",
+    "contrast": "Contrast",
+}
+
+
+def measure_frames(frames):
+    """
+    Compute quality metrics for a (N, H, W) uint8 stack of grayscale frames.
+
+    sharpness: mean Laplacian variance per frame (higher is sharper).
+    motion: mean absolute difference between consecutive samples, 0-255.
+    brightness/contrast: mean and standard deviation of luma.
+    dark_fraction/clipped_fraction: share of pixels below 16 or above 235.
+    """
+    n, h, w = frames.shape
+    # Run the Laplacian once over all frames stacked vertically; the seams only
+    # touch one row per frame, which is negligible for the variance.
+    laplacian = cv2.Laplacian(frames.reshape(n * h, w), cv2.CV_32F).reshape(n, h, w)
+    sharpness = laplacian.reshape(n, -1).var(axis=1)
+    flat = frames.reshape(n, -1)
+    if n > 1:
+        motion = float(np.abs(np.diff(flat.astype(np.int16), axis=0)).mean())
+    else:
+        motion = 0.0
+    return {
+        "sharpness": float(sharpness.mean()),
+        "motion": motion,
+        "brightness": float(flat.mean()),
+        "contrast": float(flat.std()),
+        "dark_fraction": float((flat < 16).mean()),
+        "clipped_fraction": float((flat > 235).mean()),
+    }
+
+
+def compute_clip_metrics(video_path, trim_start, trim_length, sample_step=2):
+    """Worker entry point: measure the trim window of one source."""
+    cv2.setNumThreads(1)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    cap.set(cv2.CAP_PROP_POS_FRAMES, trim_start)
+    frames = []
+    for i in range(trim_length):
+        if not cap.grab():
+            break
+        if i % sample_step:
+            continue
+        ret, frame = cap.retrieve()
+        if not ret:
+            continue
+        h, w = frame.shape[:2]
+        size = (ANALYSIS_WIDTH, max(2, round(h * ANALYSIS_WIDTH / w)))
+        small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        frames.append(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY))
+    cap.release()
+    if not frames:
+        return None
+    metrics = measure_frames(np.stack(frames))
+    metrics["trim_start"] = trim_start
+    metrics["trim_length"] = trim_length
+    return metrics
+
+
+class QualityMetrics:
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.pool = BackgroundPool(self.store_result, self.finished, self.update_status)
+
+    def is_fresh(self, display_name):
+        """Metrics are reused until the entry's trim point or the trim length changes."""
+        metrics = self.main_app.clip_metrics.get(display_name)
+        fresh = bool(metrics) and (
+            metrics.get("trim_start") == self.main_app.trim_points.get(display_name, 0)
+            and metrics.get("trim_length") == self.main_app.trim_length
+        )
+        instrumentation.cache("clip_metrics", fresh)
+        return fresh
+
+    def compute_selected(self):
+        if self.pool.running:
+            print("Quality metrics are already being computed.")
+            return
+        jobs = []
+        for entry in self.main_app.loader.selected_entries():
+            display_name = entry["display_name"]
+            if self.is_fresh(display_name):
+                continue
+            trim_start = self.main_app.trim_points.get(display_name, 0)
+            jobs.append((display_name, (entry["original_path"], trim_start, self.main_app.trim_length)))
+        if not jobs:
+            print("Quality metrics are up to date for the selected clips.")
+            self.apply_filter()
+            return
+        self.pool.submit_all(compute_clip_metrics, jobs)
+
+    def store_result(self, display_name, result):
+        if result is None:
+            print(f"Could not measure {display_name}")
+            return
+        self.main_app.clip_metrics[display_name] = result
+        self.main_app.clip_model.refresh([display_name])  # The tooltip is drawn from clip_metrics.
+
+    def finished(self):
+        self.main_app.loader.save_session()
+        self.apply_filter()
+        print(f"Quality metrics computed for {self.pool.total} clip(s).")
+
+    def describe(self, display_name):
+        metrics = self.main_app.clip_metrics.get(display_name)
+        if not metrics:
+            return ""
+        text = "\n".join(f"{label}: {metrics[key]:.1f}" for key, label in METRIC_NAMES.items())
+        if not self.is_fresh(display_name):
+            text += "\n(stale: trim point changed)"
+        return text
+
+    def metric_value(self, display_name, metric):
+        metrics = self.main_app.clip_metrics.get(display_name)
+        return metrics.get(metric) if metrics else None
+
+    def sort_by(self, metric):
+        """Reorder the clip list by a metric, highest first; unmeasured clips go last. Searches keep the order."""
+        self.main_app.workspace.sort_by(
+            lambda e: (self.metric_value(e["display_name"], metric) is None,
+                       -(self.metric_value(e["display_name"], metric) or 0))
+        )
+        self.main_app.loader.save_session()
+
+    def minimum(self):
+        """The "Hide below" threshold, or None when it is empty or not a number."""
+        field = getattr(self.main_app, "metric_min_input", None)  # Created after the session loads.
+        try:
+            return float(field.text()) if field else None
+        except ValueError:
+            return None
+
+    def apply_filter(self):
+        """Hide clips whose selected metric is below the minimum; unmeasured clips stay visible."""
+        metric = self.main_app.metric_combo.currentData()
+        minimum = self.minimum()
+        for i, entry in enumerate(self.main_app.video_files):
+            value = self.metric_value(entry["display_name"], metric)
+            self.main_app.video_list.setRowHidden(i, minimum is not None and value is not None and value < minimum)
+        self.main_app.list_thumbnails.schedule()
+
+    def update_status(self, done, total):
+        if done < total:
+            self.main_app.metrics_button.setText(f"Measuring Quality ({done}/{total})")
+        else:
+            self.main_app.metrics_button.setText("Measure Quality")
+
+    def stop(self):
+        self.pool.shutdown()
+        self.main_app.metrics_button.setText("Measure Quality")
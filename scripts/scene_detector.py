@@ -0,0 +1,130 @@
+# scene_detector.py
+import os, cv2, numpy as np
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+
+ANALYSIS_SIZE = (64, 36)  # Frames are compared at this size (width, height).
+HIST_BINS = 16
+
+
+def find_cuts(frames, positions, hist_threshold=0.35, pixel_threshold=0.08, min_gap=4):
+    """
+    Locate shot boundaries in a stack of downscaled grayscale frames.
+
+    frames: (N, H, W) uint8 array of sampled frames.
+    positions: source frame number of each sample.
+    A cut is reported at the first frame of the new shot when both the luma
+    histogram distance and the mean absolute pixel difference jump.
+    """
+    n = len(frames)
+    if n < 2:
+        return []
+    flat = frames.reshape(n, -1)
+
+    pixel_diff = np.abs(np.diff(flat.astype(np.int16), axis=0)).mean(axis=1) / 255.0
+
+    # One bincount for all histograms: offset each frame's bins by frame_index * HIST_BINS.
+    shift = 8 - int(np.log2(HIST_BINS))
+    binned = (flat >> shift).astype(np.int64) + (np.arange(n, dtype=np.int64) * HIST_BINS)[:, None]
+    hist = np.bincount(binned.ravel(), minlength=n * HIST_BINS).reshape(n, HIST_BINS) / flat.shape[1]
+    hist_diff = 0.5 * np.abs(np.diff(hist, axis=0)).sum(axis=1)
+
+    candidates = np.flatnonzero((hist_diff > hist_threshold) & (pixel_diff > pixel_threshold))
+
+    # Collapse bursts (flashes, dissolves) into a single cut.
+    cuts = []
+    last = -min_gap
+    for i in candidates:
+        if i - last >= min_gap:
+            cuts.append(int(positions[i + 1]))
+        last = i
+    return cuts
+
+
+def detect_scene_cuts(video_path, sample_step=2):
+    """Worker entry point: decode a source once and return its frame count and cut list."""
+    cv2.setNumThreads(1)  # The process pool already provides the parallelism.
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return {"frame_count": 0, "cuts": []}
+    samples = []
+    positions = []
+    index = 0
+    while cap.grab():
+        if index % sample_step == 0:
+            ret, frame = cap.retrieve()
+            if ret:
+                small = cv2.resize(frame, ANALYSIS_SIZE, interpolation=cv2.INTER_AREA)
+                samples.append(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY))
+                positions.append(index)
+        index += 1
+    cap.release()
+    cuts = find_cuts(np.stack(samples), positions) if samples else []
+    return {"frame_count": index, "cuts": cuts}
+
+
+def longest_cut_free_window(cuts, frame_count, trim_length):
+    """Return a trim start that centres the trim window in the longest shot."""
+    bounds = [0] + sorted(c for c in cuts if 0 < c < frame_count) + [frame_count]
+    starts = np.asarray(bounds[:-1])
+    lengths = np.diff(bounds)
+    best = int(np.argmax(lengths))
+    slack = max(0, int(lengths[best]) - trim_length)
+    return int(starts[best]) + slack // 2
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+class SceneDetector:
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.pool = BackgroundPool(self.store_result, self.finished, self.update_status)
+
+    def cached_cuts(self, video_path):
+        """Cut list for a source, or None if it has not been analyzed since it last changed."""
+        cached = self.main_app.scene_cuts.get(video_path)
+        hit = bool(cached) and cached.get("signature") == file_signature(video_path)
+        instrumentation.cache("scene_cuts", hit)
+        return cached["cuts"] if hit else None
+
+    def analyze_folder(self):
+        if self.pool.running:
+            print("Scene detection is already running.")
+            return
+        paths = list(dict.fromkeys(entry["original_path"] for entry in self.main_app.video_files))
+        paths = [path for path in paths if self.cached_cuts(path) is None and os.path.exists(path)]
+        if not paths:
+            print("Scene cuts are already cached for every clip.")
+            return
+        self.pool.submit_all(detect_scene_cuts, [((path, file_signature(path)), (path,)) for path in paths])
+
+    def store_result(self, key, result):
+        path, signature = key
+        self.main_app.scene_cuts[path] = {
+            "signature": signature,
+            "frame_count": result["frame_count"],
+            "cuts": result["cuts"],
+        }
+        entry = self.main_app.editor.current_entry()
+        if entry and entry["original_path"] == path:
+            self.main_app.slider.set_markers(result["cuts"])
+
+    def finished(self):
+        self.main_app.loader.save_session()
+        print(f"Scene detection finished for {self.pool.total} file(s).")
+
+    def update_status(self, done, total):
+        if done < total:
+            self.main_app.detect_cuts_button.setText(f"Detecting Scene Cuts ({done}/{total})")
+        else:
+            self.main_app.detect_cuts_button.setText("Detect Scene Cuts")
+
+    def stop(self):
+        self.pool.shutdown()
+        self.main_app.detect_cuts_button.setText("Detect Scene Cuts")
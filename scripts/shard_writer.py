@@ -0,0 +1,124 @@
+# shard_writer.py
+import os, io, json, glob, time, tarfile
+from scripts.export_queue import temp_path_for, atomic_write_text
+
+SHARD_FOLDER = "shards"
+SHARD_INDEX_FILE = "index.json"
+DEFAULT_SHARD_SIZE_MB = 1024
+
+
+def sample_key(path, folder_path):
+    """WebDataset key for an output: its path relative to the folder, without extension or inner dots."""
+    rel = os.path.splitext(os.path.relpath(path, folder_path))[0]
+    head, tail = os.path.split(rel)
+    return os.path.join(head, tail.replace(".", "_")).replace(os.sep, "/")
+
+
+class ShardWriter:
+    """
+    Streams finished outputs into size-bounded tar shards (WebDataset layout).
+
+    Every output becomes one sample: its file plus the caption (.txt) and the
+    manifest row (.json) as adjacent members sharing a key. A shard is written to a
+    .partial name and renamed once it reaches the size limit or the batch ends; only
+    then are the loose output files removed. index.json maps every key to its shard
+    and the (offset, size) of each member for random access.
+    """
+
+    def __init__(self, folder_path, max_bytes=DEFAULT_SHARD_SIZE_MB * 1024 * 1024):
+        self.folder_path = folder_path
+        self.shard_folder = os.path.join(folder_path, SHARD_FOLDER)
+        self.index_path = os.path.join(self.shard_folder, SHARD_INDEX_FILE)
+        self.max_bytes = max_bytes
+        os.makedirs(self.shard_folder, exist_ok=True)
+        # A shard that was still open when the app died; its outputs are still loose on
+        # disk and go back in through repack().
+        for stale in glob.glob(os.path.join(self.shard_folder, "*.partial.tar")):
+            os.remove(stale)
+        self.index = {"shards": [], "samples": {}}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as file:
+                self.index = json.load(file)
+        self.tar = None
+        self.shard_name = None
+        self.shard_samples = {}
+        self.loose_files = []
+
+    def open_shard(self):
+        self.shard_name = f"shard-{len(self.index['shards']):06d}.tar"
+        self.tar = tarfile.open(temp_path_for(os.path.join(self.shard_folder, self.shard_name)), "w")
+        self.shard_samples = {}
+        self.loose_files = []
+
+    def close_shard(self):
+        if self.tar is None:
+            return
+        self.tar.close()
+        final_path = os.path.join(self.shard_folder, self.shard_name)
+        os.replace(temp_path_for(final_path), final_path)
+        size = os.path.getsize(final_path)
+        self.index["shards"].append({"name": self.shard_name, "samples": len(self.shard_samples), "bytes": size})
+        self.index["samples"].update(self.shard_samples)
+        atomic_write_text(self.index_path, json.dumps(self.index))
+        for path in self.loose_files:
+            if os.path.exists(path):
+                os.remove(path)
+        print(f"Wrote {final_path} ({len(self.shard_samples)} samples, {size / 1e6:.1f} MB)")
+        self.tar = None
+
+    def add_member(self, name, data=None, path=None):
+        if path is not None:
+            info = self.tar.gettarinfo(path, arcname=name)
+            with open(path, "rb") as file:
+                self.tar.addfile(info, file)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = time.time()
+            self.tar.addfile(info, io.BytesIO(data))
+        # addfile stores a copy of info; only the stored member knows where its data landed.
+        member = self.tar.members[-1]
+        return [member.offset_data, member.size]
+
+    def repack(self, rows, caption=""):
+        """
+        Re-add outputs of finished jobs that are still loose on disk, e.g. the samples of
+        a shard that was open when the app died. Samples already in a closed shard only
+        have their leftover loose files removed.
+        """
+        loose = []
+        for row in rows:
+            path = os.path.join(self.folder_path, row["path"])
+            sample = self.index["samples"].get(sample_key(path, self.folder_path))
+            if sample and os.path.exists(os.path.join(self.shard_folder, sample["shard"])):
+                leftovers = [path, os.path.splitext(path)[0] + ".txt"] if caption else [path]
+                for leftover in leftovers:
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+            elif os.path.exists(path):
+                loose.append(row)
+        self.add_rows(loose, caption)
+        return loose
+
+    def add_rows(self, rows, caption=""):
+        """Add one sample per manifest row and point the rows at their shard member."""
+        for row in rows:
+            path = os.path.join(self.folder_path, row["path"])
+            if not os.path.exists(path):
+                continue
+            if self.tar is None or (self.shard_samples and self.tar.fileobj.tell() >= self.max_bytes):
+                self.close_shard()
+                self.open_shard()
+            key = sample_key(path, self.folder_path)
+            ext = os.path.splitext(path)[1].lstrip(".").lower()
+            row["shard"] = os.path.join(SHARD_FOLDER, self.shard_name)
+            row["member"] = f"{key}.{ext}"
+            members = {row["member"]: self.add_member(row["member"], path=path)}
+            self.loose_files.append(path)
+            caption_path = os.path.splitext(path)[0] + ".txt"
+            if caption:
+                members[f"{key}.txt"] = self.add_member(f"{key}.txt", data=caption.encode("utf8"))
+                if os.path.exists(caption_path):
+                    self.loose_files.append(caption_path)
+            members[f"{key}.json"] = self.add_member(f"{key}.json", data=json.dumps(row).encode("utf8"))
+            self.shard_samples[key] = {"shard": self.shard_name, "members": members}
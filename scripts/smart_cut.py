@@ -0,0 +1,138 @@
+# smart_cut.py
+import os, re, tempfile, ffmpeg
+from fractions import Fraction
+from scripts.instrumentation import instrumentation
+
+# Codecs whose partial GOPs can be re-encoded and spliced onto copied packets.
+SMART_CUT_ENCODERS = {"h264": "libx264", "hevc": "libx265"}
+# Below this, a full encode is about as fast and simpler. The copied middle spans whole
+# GOPs, so with typical 250-frame GOPs only windows of a few hundred frames qualify.
+MIN_COPY_FRACTION = 0.5
+# ffprobe profile names -> libx264/libx265 -profile:v values.
+ENCODER_PROFILE_NAMES = {"constrained baseline": "baseline", "high 10": "high10", "high 4:2:2": "high422",
+                         "high 4:4:4 predictive": "high444", "main 10": "main10", "main 12": "main12"}
+# Options of the export's encoder profile that also apply to the re-encoded edges.
+EDGE_ENCODE_OPTIONS = ("preset", "crf", "threads")
+
+
+def probe_keyframes(video_path):
+    """
+    Demux (without decoding) the first video stream and return its codec, profile, pixel
+    format, frame rate, the presentation time of every frame in display order and the indices
+    of the keyframes in that order.
+    """
+    with instrumentation.span("probe"):
+        probe = ffmpeg.probe(video_path, select_streams='v:0',
+                             show_entries='packet=pts_time,flags:stream=codec_name,profile,pix_fmt,r_frame_rate,avg_frame_rate'
+                                          ':format=start_time')
+    stream = probe['streams'][0]
+    packets = [p for p in probe.get('packets', []) if p.get('pts_time') not in (None, 'N/A')]
+    pts = sorted(float(p['pts_time']) for p in packets)
+    key_pts = {float(p['pts_time']) for p in packets if 'K' in p.get('flags', '')}
+    start_time = probe.get('format', {}).get('start_time')
+    rate = stream.get("r_frame_rate", "0/1")
+    return {
+        "codec": stream.get("codec_name"),
+        "profile": stream.get("profile"),
+        "pix_fmt": stream.get("pix_fmt"),
+        "constant_rate": stream.get("r_frame_rate") == stream.get("avg_frame_rate"),
+        "fps": 0.0 if rate.endswith("/0") else float(Fraction(rate)),
+        # -ss is relative to the container start, which audio may move before the first video frame.
+        "start_time": float(start_time) if start_time not in (None, 'N/A') else (pts[0] if pts else 0.0),
+        "pts": pts,
+        "keyframes": [i for i, t in enumerate(pts) if t in key_pts],
+    }
+
+
+def plan_segments(keyframes, total_frames, start, length):
+    """
+    Split the window [start, start + length) into ("encode" | "copy", first, end) frame
+    ranges: the copied middle runs from the first keyframe in the window to the last
+    keyframe (or the end of the file) before its end, and only the partial GOPs at
+    either edge are re-encoded. Returns None when too little of the window can be copied.
+    """
+    end = min(start + length, total_frames)
+    boundaries = sorted(set(keyframes) | {total_frames})
+    copy_start = next((k for k in boundaries if start <= k < end), None)
+    if copy_start is None:
+        return None
+    copy_end = max((k for k in boundaries if copy_start < k <= end), default=None)
+    if copy_end is None or copy_end - copy_start < MIN_COPY_FRACTION * (end - start):
+        return None
+    segments = []
+    if start < copy_start:
+        segments.append(("encode", start, copy_start))
+    segments.append(("copy", copy_start, copy_end))
+    if copy_end < end:
+        segments.append(("encode", copy_end, end))
+    return segments
+
+
+def decoded_frames(video_path):
+    """Decode the first video stream of a file and return its frame count; raises on any decode error."""
+    stream = ffmpeg.input(video_path).output('-', f='null', map='0:v:0')
+    with instrumentation.span("probe"):
+        out, err = stream.global_args('-v', 'error', '-progress', 'pipe:1', '-nostats').run(
+            capture_stdout=True, capture_stderr=True)
+    if err.strip():
+        raise RuntimeError(err.decode('utf8', errors='replace').strip().splitlines()[-1])
+    reported = re.findall(rb"^frame=(\d+)", out, re.MULTILINE)
+    return int(reported[-1]) if reported else 0
+
+
+def edge_encode_args(job, info, encoder):
+    """Encoder options for the re-encoded edges: the source's profile and pixel format, the export's quality."""
+    args = {key: value for key, value in job["output_args"].items() if key in EDGE_ENCODE_OPTIONS}
+    args.update(vcodec=encoder, pix_fmt=info["pix_fmt"])
+    profile = (info.get("profile") or "").lower()
+    if profile and profile != "unknown":
+        args["profile:v"] = ENCODER_PROFILE_NAMES.get(profile, profile.replace(" ", ""))
+    return args
+
+
+def smart_cut(job, info, output_path):
+    """
+    Write the job's window by stream-copying whole GOPs and re-encoding only the edges
+    with the source's profile and pixel format, then splicing the pieces with the concat
+    demuxer. Like a normal export the output holds video only. Raises when the window
+    cannot be cut this way.
+    """
+    fps = job["output_fps"]
+    encoder = SMART_CUT_ENCODERS.get(info["codec"])
+    if encoder is None:
+        raise RuntimeError(f"{info['codec']} sources cannot be smart-cut")
+    if job["output_args"].get("vcodec", encoder) != encoder:
+        raise RuntimeError(f"the encoder profile does not produce {info['codec']}")
+    if not info["constant_rate"] or abs(info["fps"] - fps) > 1e-3:
+        raise RuntimeError("only constant, integer frame rate sources can be smart-cut")
+    pts = info["pts"]
+    start = job["trim_start"]
+    source = job.get("input_path", job["source"])
+    segments = plan_segments(info["keyframes"], len(pts), start, job["expected_frames"])
+    if segments is None:
+        raise RuntimeError("not enough keyframe-aligned frames in the window")
+    edge_args = edge_encode_args(job, info, encoder)
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(output_path)) as work_dir:
+        list_lines = []
+        for i, (mode, first, end) in enumerate(segments):
+            segment_path = os.path.join(work_dir, f"segment_{i}.ts")
+            offset = pts[first] - info["start_time"]
+            if mode == "copy":
+                # Input seeking with stream copy starts at the keyframe at or before the
+                # target; aim half a frame past it so rounding cannot pick the previous GOP.
+                stream = ffmpeg.input(source, ss=offset + 0.5 / fps).output(
+                    segment_path, vcodec='copy', an=None, vframes=end - first)
+            else:
+                # Accurate seek decodes from the previous keyframe and drops frames before ss.
+                stream = ffmpeg.input(source, ss=max(0.0, offset - 0.5 / fps)).output(
+                    segment_path, r=fps, an=None, vframes=end - first, **edge_args)
+            with instrumentation.span("smart_cut_segment"):
+                stream.run(overwrite_output=True, quiet=True)
+            list_lines.append(f"file '{segment_path}'\n")
+        list_path = os.path.join(work_dir, "segments.txt")
+        with open(list_path, "w") as file:
+            file.writelines(list_lines)
+
+        ffmpeg.input(list_path, f='concat', safe=0).video.output(
+            output_path, vcodec='copy', map_metadata='-1').run(overwrite_output=True, quiet=True)
@@ -0,0 +1,208 @@
+# staging_cache.py
+import os, json, time, hashlib, threading
+from concurrent.futures import ThreadPoolExecutor
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+from scripts.export_queue import temp_path_for, atomic_write_text
+
+DEFAULT_STAGING_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hunyclip", "staging")
+DEFAULT_STAGING_SIZE_GB = 50
+STAGING_LOOKAHEAD = 3  # Clips after the current one that are staged ahead of use.
+COPY_CHUNK = 8 * 1024 * 1024
+
+
+def source_signature(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime
+
+
+def copy_to_cache(source, dest, stop_event):
+    """
+    Worker entry point: copy a source into the cache in chunks. Returns the source's
+    (size, mtime) as of before the copy, or None if stopped or the source changed meanwhile.
+    """
+    signature = source_signature(source)
+    tmp = temp_path_for(dest)
+    try:
+        with instrumentation.span("stage_copy"):
+            with open(source, "rb") as src, open(tmp, "wb") as dst:
+                while True:
+                    if stop_event.is_set():
+                        return None
+                    chunk = src.read(COPY_CHUNK)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+        if source_signature(source) != signature or os.path.getsize(tmp) != signature[0]:
+            return None
+        os.replace(tmp, dest)
+        return signature
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def resolve_source(main_app, path):
+    """Path to read a source from: its staged local copy if there is a valid one."""
+    staging = getattr(main_app, "staging", None)
+    return staging.resolve(path) if staging else path
+
+
+class StagingCache:
+    """
+    Size-bounded LRU copy of source videos on a local disk, for footage on slow or
+    network storage. Sources are copied in the background (the loaded clip and its
+    neighbours in the list, and the sources of an export batch when it starts) and reads
+    are redirected to a copy only while its source's size and mtime still match.
+    """
+
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.pool = BackgroundPool(self.store_copy, executor_class=ThreadPoolExecutor, max_workers=1)
+        self.stop_event = threading.Event()
+        self.index = {}
+        self.index_dir = None
+
+    @property
+    def cache_dir(self):
+        return self.main_app.staging_dir or DEFAULT_STAGING_DIR
+
+    @property
+    def max_bytes(self):
+        return self.main_app.staging_size_gb * 1024 ** 3
+
+    def load_index(self):
+        """(Re)load the index when the cache directory changes."""
+        if self.index_dir == self.cache_dir:
+            return
+        self.index_dir = self.cache_dir
+        self.index = {}
+        path = os.path.join(self.cache_dir, "index.json")
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as file:
+                    self.index = json.load(file)
+            except (OSError, ValueError):
+                print(f"[Warning] Ignoring unreadable staging index {path}")
+
+    def save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write_text(os.path.join(self.cache_dir, "index.json"), json.dumps(self.index))
+
+    def local_path(self, source):
+        key = hashlib.sha1(os.path.abspath(source).encode("utf8")).hexdigest()
+        return key, os.path.join(self.cache_dir, key + os.path.splitext(source)[1])
+
+    def resolve(self, source):
+        if not self.main_app.staging_enabled:
+            return source
+        self.load_index()
+        key, local = self.local_path(source)
+        record = self.index.get(key)
+        hit = False
+        if record:
+            try:
+                hit = ([record["size"], record["mtime"]] == list(source_signature(source))
+                       and os.path.getsize(local) == record["size"])
+            except OSError:
+                hit = False
+            if hit:
+                record["last_used"] = time.time()
+            else:
+                self.drop(key)
+        instrumentation.cache("staging", hit)
+        return local if hit else source
+
+    def prefetch(self, sources):
+        """Queue sources for staging in this order, replacing whatever was still queued."""
+        if not self.main_app.staging_enabled:
+            return
+        self.load_index()
+        for key in set(self.pool.pending.values()):
+            self.pool.cancel(key)
+        in_flight = set(self.pool.pending.values())
+        jobs = []
+        for source in dict.fromkeys(sources):
+            if source in in_flight or not os.path.exists(source) or self.resolve(source) != source:
+                continue
+            os.makedirs(self.cache_dir, exist_ok=True)
+            jobs.append((source, (source, self.local_path(source)[1], self.stop_event)))
+        self.pool.submit_all(copy_to_cache, jobs)
+
+    def prefetch_around(self, current_entry):
+        """Stage the loaded clip, the next STAGING_LOOKAHEAD listed clips, then the previous one."""
+        files = self.main_app.video_files
+        index = next((i for i, e in enumerate(files) if e is current_entry), 0)
+        neighbours = files[index:index + 1 + STAGING_LOOKAHEAD] + files[max(0, index - 1):index]
+        self.prefetch([e["original_path"] for e in neighbours])
+
+    def stage_for_export(self, sources):
+        """
+        Stage the sources of an export batch once, in run order, up to the cache size limit.
+        The export calls wait_for before each job, so copying the next source overlaps
+        encoding the current one.
+        """
+        if not self.main_app.staging_enabled:
+            return
+        batch, total = [], 0
+        for source in dict.fromkeys(sources):
+            try:
+                size = os.path.getsize(source)
+            except OSError:
+                continue
+            # Copies beyond the limit would only evict the ones the batch is about to read.
+            if total + size > self.max_bytes:
+                break
+            batch.append(source)
+            total += size
+        self.prefetch(batch)
+
+    def wait_for(self, source):
+        """
+        Block until a queued or running copy of source has finished and record it. Exports
+        run on the GUI thread without returning to the event loop, so the pool's timer
+        would not record finished copies before the batch reads them.
+        """
+        for future, key in list(self.pool.pending.items()):
+            if key == source:
+                try:
+                    future.result()
+                except Exception:
+                    pass  # Cancelled or failed; poll() reports failures and the source is read directly.
+        if self.pool.running:
+            self.pool.poll()
+
+    def store_copy(self, source, signature):
+        if signature is None:
+            return
+        key, local = self.local_path(source)
+        self.index[key] = {"source": source, "size": signature[0], "mtime": signature[1],
+                           "last_used": time.time()}
+        self.evict(keep=key)
+        self.save_index()
+
+    def drop(self, key):
+        record = self.index.pop(key, None)
+        if record:
+            try:
+                os.remove(self.local_path(record["source"])[1])
+            except OSError:
+                pass  # Already gone, or still open on Windows; the size check catches it later.
+
+    def evict(self, keep=None):
+        """Remove least recently used copies until the cache fits its size limit."""
+        total = sum(record["size"] for record in self.index.values())
+        for key, record in sorted(self.index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.drop(key)
+            total -= record["size"]
+
+    def stop(self):
+        self.stop_event.set()
+        self.pool.shutdown()
+        self.stop_event = threading.Event()
+        if self.index_dir:
+            self.save_index()
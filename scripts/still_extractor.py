@@ -0,0 +1,119 @@
+# still_extractor.py
+import os, cv2
+from concurrent.futures import ThreadPoolExecutor
+from scripts.instrumentation import instrumentation
+from scripts.export_queue import temp_path_for
+
+DEFAULT_STILL_FRAMES = "first"
+# Format -> (quality range, default). PNG takes a zlib compression level, JPEG/WebP a quality.
+STILL_FORMATS = {
+    "png": ((0, 9), 3),
+    "jpg": ((1, 100), 95),
+    "webp": ((1, 100), 90),
+}
+
+
+def parse_still_frames(text, window_length):
+    """
+    Parse a still spec into sorted frame offsets inside a trim window of window_length frames.
+
+    Tokens are comma separated: 'first', 'middle', 'last', 'every N' (every N-th frame
+    from the first) or a plain frame offset. Offsets past the window are dropped.
+    """
+    offsets = set()
+    last = window_length - 1
+    for token in text.replace(";", ",").split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        if token == "first":
+            offsets.add(0)
+        elif token == "middle":
+            offsets.add(last // 2)
+        elif token == "last":
+            offsets.add(last)
+        elif token.startswith("every"):
+            try:
+                step = int(token[len("every"):].strip(" :"))
+            except ValueError:
+                print(f"[Warning] Ignoring invalid still spec '{token}'")
+                continue
+            if step > 0:
+                offsets.update(range(0, window_length, step))
+        else:
+            try:
+                offsets.add(int(token))
+            except ValueError:
+                print(f"[Warning] Ignoring invalid still spec '{token}'")
+    return sorted(offset for offset in offsets if 0 <= offset <= last)
+
+
+def imwrite_params(still_format, quality):
+    (low, high), _ = STILL_FORMATS[still_format]
+    quality = min(high, max(low, int(quality)))
+    if still_format == "png":
+        return [cv2.IMWRITE_PNG_COMPRESSION, quality]
+    if still_format == "jpg":
+        return [cv2.IMWRITE_JPEG_QUALITY, quality]
+    return [cv2.IMWRITE_WEBP_QUALITY, quality]
+
+
+def write_still(path, image, params):
+    """Write one still atomically; runs on a writer thread (cv2.imwrite releases the GIL)."""
+    tmp_path = temp_path_for(path)
+    try:
+        with instrumentation.span("still_write"):
+            if not cv2.imwrite(tmp_path, image, params):
+                raise RuntimeError(f"cv2.imwrite could not write {path}")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def extract_stills(job):
+    """
+    Write every still of a "stills" export job from one decode pass over the source.
+
+    job["outputs"] holds [frame, crop or None, path] triples. The capture seeks once
+    to the first requested frame and then decodes forward, only converting the
+    requested frames; the cropped and uncropped variants of a frame share that decode.
+    Encoding and writing happen on a thread pool while decoding continues. Raises on failure.
+    """
+    by_frame = {}
+    for frame_index, crop, path in job["outputs"]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        by_frame.setdefault(frame_index, []).append((crop, path))
+    frames = sorted(by_frame)
+    params = imwrite_params(job["format"], job["quality"])
+
+    cap = cv2.VideoCapture(job.get("input_path", job["source"]))
+    if not cap.isOpened():
+        raise RuntimeError(f"could not open {job['source']}")
+    futures = []
+    try:
+        with ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 2)) as writers:
+            with instrumentation.span("seek"):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frames[0])
+            for frame_index in range(frames[0], frames[-1] + 1):
+                with instrumentation.span("decode"):
+                    if not cap.grab():
+                        raise RuntimeError(f"could not read frame {frame_index}")
+                if frame_index not in by_frame:
+                    continue
+                ret, image = cap.retrieve()
+                if not ret:
+                    raise RuntimeError(f"could not decode frame {frame_index}")
+                for crop, path in by_frame[frame_index]:
+                    if crop:
+                        x, y, w, h = crop
+                        still = image[y:y+h, x:x+w]
+                        if still.size == 0:
+                            raise RuntimeError("empty crop region")
+                    else:
+                        still = image
+                    futures.append(writers.submit(write_still, path, still, params))
+    finally:
+        cap.release()
+    for future in futures:
+        future.result()  # Re-raises the first failed write.
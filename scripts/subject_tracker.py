@@ -0,0 +1,185 @@
+# subject_tracker.py
+import os, tempfile, contextlib, cv2, numpy as np
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+
+TRACK_WIDTH = 480     # Frames are downscaled to this width before tracking.
+TRACK_SMOOTHING = 9   # Frames in the centred moving average applied to the crop path.
+TRACK_FILTER = "crop@track"  # Instance name of the crop filter that sendcmd moves.
+
+
+def create_tracker():
+    """The best OpenCV tracker available: CSRT, then KCF (contrib builds), then MIL."""
+    for name in ("TrackerCSRT_create", "TrackerKCF_create", "TrackerMIL_create"):
+        for module in (cv2, getattr(cv2, "legacy", None)):
+            factory = getattr(module, name, None) if module else None
+            if factory:
+                return factory()
+    return None
+
+
+def smooth_path(points, window=TRACK_SMOOTHING):
+    """Centred moving average of an (N, 2) path, holding the end values at the edges."""
+    if len(points) < 3 or window < 2:
+        return points
+    pad = window // 2
+    padded = np.pad(points, ((pad, pad), (0, 0)), mode="edge")
+    kernel = np.ones(window) / window
+    return np.stack([np.convolve(padded[:, axis], kernel, mode="valid")[:len(points)] for axis in (0, 1)], axis=1)
+
+
+def track_crop(video_path, trim_start, frame_count, crop):
+    """
+    Worker entry point: follow the subject inside a crop seeded on the trim frame.
+
+    Tracks on downscaled frames and returns the smoothed top-left corner of the crop,
+    in source pixels, for each of frame_count frames from trim_start. The crop keeps
+    its size and stays inside the frame. Frames where the tracker loses the subject
+    hold the last position. Returns None if the source or the tracker is unavailable.
+    """
+    cv2.setNumThreads(1)
+    tracker = create_tracker()
+    cap = cv2.VideoCapture(video_path)
+    if tracker is None or not cap.isOpened():
+        return None
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    scale = min(1.0, TRACK_WIDTH / width)
+    x, y, w, h = crop
+    centers, lost = [], 0
+    with instrumentation.span("track"):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, trim_start)
+        for i in range(frame_count):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            if i == 0:
+                tracker.init(small, tuple(int(round(v * scale)) for v in crop))
+                centers.append((x + w / 2, y + h / 2))
+                continue
+            ok, box = tracker.update(small)
+            if ok:
+                bx, by, bw, bh = box
+                centers.append(((bx + bw / 2) / scale, (by + bh / 2) / scale))
+            else:
+                lost += 1
+                centers.append(centers[-1])
+    cap.release()
+    if not centers:
+        return None
+    path = smooth_path(np.array(centers)) - (w / 2, h / 2)
+    path[:, 0] = np.clip(path[:, 0], 0, width - w)
+    path[:, 1] = np.clip(path[:, 1], 0, height - h)
+    return {
+        "trim_start": trim_start,
+        "seed": list(crop),
+        "fps": fps,
+        "points": np.rint(path).astype(int).tolist(),
+        "lost": lost,
+    }
+
+
+def fresh_track(crop_tracks, display_name, crop, trim_start):
+    """An entry's track if it was seeded from its current crop and trim point, else None."""
+    track = crop_tracks.get(display_name)
+    if track and track["trim_start"] == trim_start and track["seed"] == list(crop):
+        return track
+    return None
+
+
+def tracked_crop(track, crop, offset):
+    """The crop rectangle 'offset' frames into the trim window of a tracked entry."""
+    x, y = track["points"][min(offset, len(track["points"]) - 1)]
+    return [x, y, crop[2], crop[3]]
+
+
+def write_track_commands(track, path):
+    """Write a sendcmd script that moves the tracked crop filter once per source frame."""
+    lines = []
+    previous = None
+    for i, (x, y) in enumerate(track["points"]):
+        if (x, y) != previous:
+            lines.append(f"{i / track['fps']:.6f} {TRACK_FILTER} x {x}, {TRACK_FILTER} y {y};")
+            previous = (x, y)
+    with open(path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+@contextlib.contextmanager
+def track_commands(job):
+    """
+    For a job with a "track", write its sendcmd script to a temporary file and expose it
+    as job["track_commands"] for filter_graph while the encode runs.
+    """
+    if not job.get("track"):
+        yield
+        return
+    handle, path = tempfile.mkstemp(prefix="hunyclip_track_", suffix=".cmd")
+    os.close(handle)
+    try:
+        write_track_commands(job["track"], path)
+        job["track_commands"] = path
+        yield
+    finally:
+        job.pop("track_commands", None)
+        os.remove(path)
+
+
+class SubjectTracker:
+    """Tracks the subject of each selected entry's crop across its trim window."""
+
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.pool = BackgroundPool(self.store_result, self.finished, self.update_status)
+
+    def track_selected(self):
+        if self.pool.running:
+            print("Subject tracking is already running.")
+            return
+        jobs = []
+        for entry in self.main_app.loader.selected_entries():
+            display_name = entry["display_name"]
+            crop = self.main_app.crop_regions.get(display_name)
+            if not crop:
+                continue
+            trim_start = self.main_app.trim_points.get(display_name, 0)
+            if fresh_track(self.main_app.crop_tracks, display_name, crop, trim_start):
+                continue
+            jobs.append((display_name, (entry["original_path"], trim_start, self.main_app.trim_length, list(crop))))
+        if not jobs:
+            print("No cropped entries need tracking (tracks are reused until the crop or trim point changes).")
+            return
+        self.pool.submit_all(track_crop, jobs)
+
+    def store_result(self, display_name, result):
+        if result is None:
+            print(f"Could not track {display_name}")
+            return
+        if result["lost"]:
+            print(f"[Warning] Tracker lost the subject in {result['lost']} frame(s) of {display_name}")
+        self.main_app.crop_tracks[display_name] = result
+        if display_name == self.main_app.current_video:
+            self.main_app.output_preview.invalidate()
+
+    def clear_selected(self):
+        """Go back to a static crop for the selected entries."""
+        for entry in self.main_app.loader.selected_entries():
+            self.main_app.crop_tracks.pop(entry["display_name"], None)
+        self.main_app.output_preview.invalidate()
+        self.main_app.loader.save_session()
+
+    def finished(self):
+        self.main_app.loader.save_session()
+        print(f"Tracked {self.pool.total} clip(s).")
+
+    def update_status(self, done, total):
+        if done < total:
+            self.main_app.track_button.setText(f"Tracking Subject ({done}/{total})")
+        else:
+            self.main_app.track_button.setText("Track Subject")
+
+    def stop(self):
+        self.pool.shutdown()
+        self.main_app.track_button.setText("Track Subject")
@@ -0,0 +1,32 @@
+# timeline_slider.py
+from PyQt6.QtWidgets import QSlider, QStyle, QStyleOptionSlider
+from PyQt6.QtGui import QPainter, QPen, QColor
+
+class TimelineSlider(QSlider):
+    """Horizontal slider that also draws frame markers (e.g. detected scene cuts) on its groove."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.markers = []
+        self.marker_color = QColor(235, 203, 139)
+
+    def set_markers(self, frames):
+        self.markers = list(frames or [])
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.markers or self.maximum() <= self.minimum():
+            return
+        option = QStyleOptionSlider()
+        self.initStyleOption(option)
+        groove = self.style().subControlRect(
+            QStyle.ComplexControl.CC_Slider, option, QStyle.SubControl.SC_SliderGroove, self
+        )
+        span = self.maximum() - self.minimum()
+        painter = QPainter(self)
+        painter.setPen(QPen(self.marker_color, 2))
+        for frame in self.markers:
+            x = groove.left() + (frame - self.minimum()) / span * groove.width()
+            painter.drawLine(int(x), groove.top() - 3, int(x), groove.bottom() + 3)
+        painter.end()
@@ -2,10 +2,10 @@ import sys, os, cv2, ffmpeg, json, numpy as np
 from scripts.custom_graphics_view import CustomGraphicsView
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QFileDialog, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QListWidget, QSlider, QGraphicsPixmapItem, QLineEdit, QSpinBox,
-    QSizePolicy, QCheckBox, QListWidgetItem, QComboBox, QMessageBox
+    QGraphicsPixmapItem, QGraphicsItem, QLineEdit, QSpinBox,
+    QSizePolicy, QCheckBox, QComboBox, QMessageBox, QAbstractItemView
 )
-from PyQt6.QtGui import QPixmap, QImage, QPainter, QColor, QPen, QIcon, QMouseEvent, QIntValidator
+from PyQt6.QtGui import QPixmap, QImage, QColor, QPen, QIcon, QMouseEvent, QIntValidator
 from PyQt6.QtCore import Qt, QTimer
 
 # Custom scene (modified to use the new crop region)
@@ -13,8 +13,26 @@ from scripts.custom_graphics_scene import CustomGraphicsScene
 
 # Import helper modules
 from scripts.video_loader import VideoLoader
+from scripts.workspace import Workspace
+from scripts.clip_list import ClipListModel, ClipListView
 from scripts.video_editor import VideoEditor
 from scripts.video_exporter import VideoExporter
+from scripts.scene_detector import SceneDetector
+from scripts.timeline_slider import TimelineSlider
+from scripts.crop_detector import CropDetector
+from scripts.subject_tracker import SubjectTracker
+from scripts.bulk_annotations import BulkAnnotations
+from scripts.quality_metrics import QualityMetrics, METRIC_NAMES
+from scripts.duplicate_finder import DuplicateFinder
+from scripts.instrumentation import instrumentation
+from scripts.performance_hud import PerformanceHud
+from scripts.output_preview import OutputPreview
+from scripts.list_thumbnails import ListThumbnails
+from scripts.staging_cache import StagingCache, DEFAULT_STAGING_DIR, DEFAULT_STAGING_SIZE_GB
+from scripts.bucket_exporter import BucketExporter, DEFAULT_BUCKET_RESOLUTIONS, DEFAULT_BUCKET_FRAMES
+from scripts.shard_writer import DEFAULT_SHARD_SIZE_MB
+from scripts.encoder_profiles import ENCODER_PROFILES, DEFAULT_ENCODER_PROFILE, load_calibration
+from scripts.still_extractor import DEFAULT_STILL_FRAMES, STILL_FORMATS
 
 class VideoCropper(QWidget):
     def __init__(self):
@@ -26,6 +44,9 @@ class VideoCropper(QWidget):
         # Core state
         self.folder_path = ""
         self.video_files = []  # List of video dicts
+        self.workspace_folders = []  # Folders open at once; exports go under folder_path (the first)
+        self.workspace_query = ""
+        self.clip_info = {}  # Source path -> [width, height, fps, frame count]
         self.current_video = None
         self.crop_regions = {}  # Dict to store crop region data per video
         self.current_rect = None  # Reference to the active crop region item
@@ -51,6 +72,46 @@ class VideoCropper(QWidget):
         self.export_image = False
         self.trim_modified = False
         
+        # Resolution/frame-count buckets for trainer-ready exports
+        self.bucket_resolutions = DEFAULT_BUCKET_RESOLUTIONS
+        self.bucket_frames = DEFAULT_BUCKET_FRAMES
+        
+        # Which frames of the trim window "Export Stills" writes, and how
+        self.still_frames = DEFAULT_STILL_FRAMES
+        self.still_format = "png"
+        self.still_quality = STILL_FORMATS["png"][1]
+        self.export_frames = False
+        self.fast_uncropped = False
+        self.encoder_profile = DEFAULT_ENCODER_PROFILE
+        
+        # Local copies of sources on slow/network storage
+        self.staging_enabled = False
+        self.staging_dir = ""
+        self.staging_size_gb = DEFAULT_STAGING_SIZE_GB
+        self.manifest_tables = False
+        
+        # Extra ffmpeg filters compiled into the export graph: a default chain
+        # and per-entry overrides keyed by display name
+        self.filter_chain = ""
+        self.clip_filters = {}
+        
+        # Measured export speed (planner work units per second), None until timed
+        self.export_throughput = None
+        self.export_shards = False
+        self.shard_size_mb = DEFAULT_SHARD_SIZE_MB
+        
+        # Scene-cut analysis results, keyed by source path
+        self.scene_cuts = {}
+        
+        # Per-clip quality metrics over the trim window, keyed by display name
+        self.clip_metrics = {}
+        
+        # Tracked crop paths (per-frame top-left corners) keyed by display name
+        self.crop_tracks = {}
+        
+        # Perceptual hashes of each clip's trim window, keyed by display name
+        self.clip_hashes = {}
+        
         # Session file
         self.folder_sessions = {}
         self.session_file = "session_data.json"
@@ -59,7 +120,10 @@ class VideoCropper(QWidget):
         self.simple_caption = ""
         
         # UI widgets
-        self.video_list = QListWidget()
+        self.clip_model = ClipListModel(self)
+        self.video_list = ClipListView()
+        self.video_list.setModel(self.clip_model)
+        self.workspace_label = QLabel("")
         
         # Aspect ratio options (for crop constraint)
         self.aspect_ratios = {
@@ -75,8 +139,18 @@ class VideoCropper(QWidget):
         
         # Create helper modules and pass self.
         self.loader = VideoLoader(self)
+        self.workspace = Workspace(self)
         self.editor = VideoEditor(self)
         self.exporter = VideoExporter(self)
+        self.bucket_exporter = BucketExporter(self)
+        self.scene_detector = SceneDetector(self)
+        self.crop_detector = CropDetector(self)
+        self.subject_tracker = SubjectTracker(self)
+        self.bulk_annotations = BulkAnnotations(self)
+        self.quality_metrics = QualityMetrics(self)
+        self.duplicate_finder = DuplicateFinder(self)
+        self.staging = StagingCache(self)
+        self.list_thumbnails = ListThumbnails(self)
         
         # Load previous session.
         self.loader.load_session()
@@ -98,8 +172,30 @@ class VideoCropper(QWidget):
         self.folder_button.clicked.connect(self.loader.load_folder)
         left_panel.addWidget(self.folder_button)
         
-        self.video_list.itemClicked.connect(self.loader.load_video)
-        self.video_list.itemChanged.connect(self.loader.update_list_item_color)
+        self.add_folder_button = QPushButton("Add Folder to Workspace")
+        self.add_folder_button.clicked.connect(self.loader.add_folder)
+        left_panel.addWidget(self.add_folder_button)
+        
+        self.search_input = QLineEdit(self.workspace_query)
+        self.search_input.setPlaceholderText("Search: unchecked 4k nocrop fps>=50 folder:day2 name")
+        self.search_input.setToolTip("Words: checked/unchecked, crop/nocrop, 4k/1440p/1080p/720p,\n"
+                                     "width/height/fps/frames/duration/trim comparisons (fps>=50, duration<10),\n"
+                                     "folder:<text>; anything else matches the clip name")
+        self.search_input.textChanged.connect(self.workspace.set_query)
+        left_panel.addWidget(self.search_input)
+        
+        workspace_layout = QHBoxLayout()
+        workspace_layout.addWidget(self.workspace_label, 1)
+        self.index_metadata_button = QPushButton("Index Metadata")
+        self.index_metadata_button.setToolTip("Probe resolution, fps and length of every workspace clip for searching")
+        self.index_metadata_button.clicked.connect(self.workspace.index_metadata)
+        workspace_layout.addWidget(self.index_metadata_button)
+        left_panel.addLayout(workspace_layout)
+        
+        self.video_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.video_list.clicked.connect(self.loader.load_video)
+        self.clip_model.export_toggled.connect(self.loader.export_toggled)
+        self.list_thumbnails.attach(self.video_list)
         left_panel.addWidget(self.video_list, 1)
 
         self.duplicate_button = QPushButton("Duplicate Clip")
@@ -110,6 +206,78 @@ class VideoCropper(QWidget):
         self.clear_crop_button.clicked.connect(self.loader.clear_crop_region)
         left_panel.addWidget(self.clear_crop_button)
         
+        self.detect_cuts_button = QPushButton("Detect Scene Cuts")
+        self.detect_cuts_button.clicked.connect(self.scene_detector.analyze_folder)
+        left_panel.addWidget(self.detect_cuts_button)
+        
+        self.detect_crop_button = QPushButton("Auto-Crop Black Bars")
+        self.detect_crop_button.setToolTip("Suggest crops for the selected clips (all clips if none are selected)")
+        self.detect_crop_button.clicked.connect(self.crop_detector.detect_selected)
+        left_panel.addWidget(self.detect_crop_button)
+        
+        track_layout = QHBoxLayout()
+        self.track_button = QPushButton("Track Subject")
+        self.track_button.setToolTip("Follow the subject inside each selected clip's crop across its trim window\n"
+                                     "(seeded on the trim frame); exports then move the crop per frame")
+        self.track_button.clicked.connect(self.subject_tracker.track_selected)
+        track_layout.addWidget(self.track_button, 1)
+        self.clear_track_button = QPushButton("Static Crop")
+        self.clear_track_button.setToolTip("Drop the tracked path of the selected clips")
+        self.clear_track_button.clicked.connect(self.subject_tracker.clear_selected)
+        track_layout.addWidget(self.clear_track_button)
+        left_panel.addLayout(track_layout)
+        
+        # Bulk crop/trim for the selected clips (all listed clips if none are selected)
+        bulk_crop_layout = QHBoxLayout()
+        self.bulk_crop_input = QLineEdit()
+        self.bulk_crop_input.setPlaceholderText("x,y,w,h | x%,y%,w%,h% | center 16:9 [90%]")
+        self.bulk_crop_input.setToolTip("Empty: copy the loaded clip's crop, relative to each clip's size")
+        bulk_crop_layout.addWidget(self.bulk_crop_input, 1)
+        self.bulk_crop_button = QPushButton("Apply Crop")
+        self.bulk_crop_button.clicked.connect(lambda: self.bulk_annotations.apply_crop(self.bulk_crop_input.text()))
+        bulk_crop_layout.addWidget(self.bulk_crop_button)
+        left_panel.addLayout(bulk_crop_layout)
+        bulk_trim_layout = QHBoxLayout()
+        self.bulk_trim_input = QLineEdit()
+        self.bulk_trim_input.setPlaceholderText("start+N | middle | end-N | frame")
+        bulk_trim_layout.addWidget(self.bulk_trim_input, 1)
+        self.bulk_trim_button = QPushButton("Apply Trim")
+        self.bulk_trim_button.clicked.connect(lambda: self.bulk_annotations.apply_trim(self.bulk_trim_input.text()))
+        bulk_trim_layout.addWidget(self.bulk_trim_button)
+        left_panel.addLayout(bulk_trim_layout)
+        annotations_layout = QHBoxLayout()
+        self.import_annotations_button = QPushButton("Import Crops/Trims")
+        self.import_annotations_button.clicked.connect(self.bulk_annotations.import_annotations)
+        annotations_layout.addWidget(self.import_annotations_button)
+        self.export_annotations_button = QPushButton("Export Crops/Trims")
+        self.export_annotations_button.clicked.connect(self.bulk_annotations.export_annotations)
+        annotations_layout.addWidget(self.export_annotations_button)
+        left_panel.addLayout(annotations_layout)
+        
+        self.metrics_button = QPushButton("Measure Quality")
+        self.metrics_button.setToolTip("Measure sharpness, motion and exposure of the selected clips' trim windows")
+        self.metrics_button.clicked.connect(self.quality_metrics.compute_selected)
+        left_panel.addWidget(self.metrics_button)
+        
+        metrics_layout = QHBoxLayout()
+        self.metric_combo = QComboBox()
+        for key, label in METRIC_NAMES.items():
+            self.metric_combo.addItem(label, key)
+        self.metric_combo.currentIndexChanged.connect(lambda _: self.quality_metrics.apply_filter())
+        metrics_layout.addWidget(self.metric_combo)
+        self.metric_min_input = QLineEdit()
+        self.metric_min_input.setPlaceholderText("Hide below")
+        self.metric_min_input.textChanged.connect(lambda _: self.quality_metrics.apply_filter())
+        metrics_layout.addWidget(self.metric_min_input)
+        self.sort_metric_button = QPushButton("Sort")
+        self.sort_metric_button.clicked.connect(lambda: self.quality_metrics.sort_by(self.metric_combo.currentData()))
+        metrics_layout.addWidget(self.sort_metric_button)
+        left_panel.addLayout(metrics_layout)
+        
+        self.duplicates_button = QPushButton("Find Near-Duplicates")
+        self.duplicates_button.clicked.connect(self.duplicate_finder.find_duplicates)
+        left_panel.addWidget(self.duplicates_button)
+        
         self.clip_length_label = QLabel("Clip Length: 0")
         left_panel.addWidget(self.clip_length_label)
         self.trim_point_label = QLineEdit("0")
@@ -134,13 +302,55 @@ class VideoCropper(QWidget):
         self.export_uncropped_checkbox.setChecked(False)
         left_panel.addWidget(self.export_uncropped_checkbox)
         
-        self.export_image_checkbox = QCheckBox("Export Image at Trim Point")
+        self.export_image_checkbox = QCheckBox("Export Stills from Trim Window")
         self.export_image_checkbox.setChecked(False)
         left_panel.addWidget(self.export_image_checkbox)
         
+        self.fast_uncropped_checkbox = QCheckBox("Fast Uncropped Export (Stream Copy)")
+        self.fast_uncropped_checkbox.setToolTip("Copy whole GOPs of uncropped clips and re-encode only the edges; "
+                                                "falls back to a full encode when the frame count cannot be kept exact")
+        self.fast_uncropped_checkbox.setChecked(self.fast_uncropped)
+        self.fast_uncropped_checkbox.toggled.connect(lambda checked: setattr(self, "fast_uncropped", checked))
+        left_panel.addWidget(self.fast_uncropped_checkbox)
+        
+        self.export_bucketed_checkbox = QCheckBox("Export to Resolution Buckets")
+        self.export_bucketed_checkbox.setChecked(False)
+        left_panel.addWidget(self.export_bucketed_checkbox)
+        
+        self.verify_outputs_checkbox = QCheckBox("Verify Outputs After Export")
+        self.verify_outputs_checkbox.setToolTip("Probe every exported clip in parallel and report frame count or size mismatches")
+        self.verify_outputs_checkbox.setChecked(False)
+        left_panel.addWidget(self.verify_outputs_checkbox)
+        
+        self.export_frames_checkbox = QCheckBox("Export Raw Frames (.npy) Instead of Video")
+        self.export_frames_checkbox.setToolTip("Write each clip's cropped, scaled frames to a memory-mapped RGB array instead of encoding a video")
+        self.export_frames_checkbox.setChecked(self.export_frames)
+        self.export_frames_checkbox.toggled.connect(lambda checked: setattr(self, "export_frames", checked))
+        left_panel.addWidget(self.export_frames_checkbox)
+        
+        shard_layout = QHBoxLayout()
+        self.export_shards_checkbox = QCheckBox("Stream Outputs into Tar Shards")
+        self.export_shards_checkbox.setToolTip("Pack each output with its caption and metadata into size-bounded WebDataset tar shards under 'shards'")
+        self.export_shards_checkbox.setChecked(self.export_shards)
+        self.export_shards_checkbox.toggled.connect(lambda checked: setattr(self, "export_shards", checked))
+        shard_layout.addWidget(self.export_shards_checkbox)
+        self.shard_size_spin = QSpinBox()
+        self.shard_size_spin.setRange(16, 65536)
+        self.shard_size_spin.setSuffix(" MB")
+        self.shard_size_spin.setValue(self.shard_size_mb)
+        self.shard_size_spin.valueChanged.connect(lambda v: setattr(self, "shard_size_mb", v))
+        shard_layout.addWidget(self.shard_size_spin)
+        left_panel.addLayout(shard_layout)
+        
+        self.manifest_tables_checkbox = QCheckBox("Also Write Manifest as NPZ/Parquet")
+        self.manifest_tables_checkbox.setToolTip("manifest.jsonl is always written; this adds columnar copies for dataset loaders")
+        self.manifest_tables_checkbox.setChecked(self.manifest_tables)
+        self.manifest_tables_checkbox.toggled.connect(lambda checked: setattr(self, "manifest_tables", checked))
+        left_panel.addWidget(self.manifest_tables_checkbox)
+        
         main_layout.addLayout(left_panel, 1)
 
-        self.video_list.setStyleSheet("QListWidget::item:selected { background-color: #3A4F7A; }")
+        self.video_list.setStyleSheet("QListView::item:selected { background-color: #3A4F7A; }")
         
         # RIGHT PANEL
         right_panel = QVBoxLayout()
@@ -156,20 +366,35 @@ class VideoCropper(QWidget):
             self.aspect_ratio_combo.addItem(ratio_name)
         self.aspect_ratio_combo.currentTextChanged.connect(self.set_aspect_ratio)
         aspect_ratio_layout.addWidget(self.aspect_ratio_combo)
+        self.hud_checkbox = QCheckBox("Performance HUD")
+        self.hud_checkbox.setChecked(instrumentation.enabled)
+        aspect_ratio_layout.addWidget(self.hud_checkbox)
+        self.preview_output_button = QPushButton("Preview Output")
+        self.preview_output_button.setToolTip("Loop the trim window as the export will produce it (crop, filters, scale)")
+        self.preview_output_button.clicked.connect(lambda: self.output_preview.toggle())
+        aspect_ratio_layout.addWidget(self.preview_output_button)
+        self.save_metrics_button = QPushButton("Save Metrics")
+        self.save_metrics_button.clicked.connect(lambda: instrumentation.dump("hunyclip_metrics"))
+        aspect_ratio_layout.addWidget(self.save_metrics_button)
         right_panel.addLayout(aspect_ratio_layout)
         
         self.graphics_view = CustomGraphicsView()
-        self.graphics_view.setRenderHint(QPainter.RenderHint.Antialiasing)
-        self.graphics_view.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
         self.graphics_view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.scene = CustomGraphicsScene(self)
         self.graphics_view.setScene(self.scene)
         self.pixmap_item = QGraphicsPixmapItem()
+        # Keep the scaled frame as a device pixmap so crop drags blit it instead of re-rendering it.
+        self.pixmap_item.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
         self.scene.addItem(self.pixmap_item)
         self.graphics_view.setMouseTracking(True)
         right_panel.addWidget(self.graphics_view, 1)
         
-        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.performance_hud = PerformanceHud(self.graphics_view)
+        self.hud_checkbox.toggled.connect(self.performance_hud.set_enabled)
+        self.performance_hud.set_enabled(instrumentation.enabled)
+        self.output_preview = OutputPreview(self, self.graphics_view)
+        
+        self.slider = TimelineSlider(Qt.Orientation.Horizontal)
         self.slider.setEnabled(False)
         self.slider.sliderMoved.connect(self.editor.scrub_video)
         right_panel.addWidget(self.slider)
@@ -198,7 +423,83 @@ class VideoCropper(QWidget):
         self.prefix_input.textChanged.connect(lambda text: setattr(self, "export_prefix", text))
         export_settings_layout.addWidget(self.prefix_input)
 
+        # Encoder profile; tooltips show this machine's calibration results if available
+        self.encoder_combo = QComboBox()
+        calibration = load_calibration()
+        for i, name in enumerate(ENCODER_PROFILES):
+            self.encoder_combo.addItem(name)
+            result = calibration.get(name)
+            if result and "error" not in result:
+                self.encoder_combo.setItemData(
+                    i, f"{result['fps']} fps, {result['bits_per_pixel']} bits/pixel on this machine",
+                    Qt.ItemDataRole.ToolTipRole)
+        self.encoder_combo.setCurrentText(self.encoder_profile)
+        self.encoder_combo.currentTextChanged.connect(self.set_encoder_profile)
+        export_settings_layout.addWidget(self.encoder_combo)
+
         right_panel.addLayout(export_settings_layout)
+
+        # Bucket table used by "Export to Resolution Buckets"
+        bucket_layout = QHBoxLayout()
+        bucket_layout.addWidget(QLabel("Buckets:"))
+        self.bucket_resolutions_input = QLineEdit(self.bucket_resolutions)
+        self.bucket_resolutions_input.setPlaceholderText("Resolutions, e.g. 960x544, 544x960, 720x720")
+        self.bucket_resolutions_input.textChanged.connect(lambda text: setattr(self, "bucket_resolutions", text))
+        bucket_layout.addWidget(self.bucket_resolutions_input, 3)
+        self.bucket_frames_input = QLineEdit(self.bucket_frames)
+        self.bucket_frames_input.setPlaceholderText("Frame counts, e.g. 33, 65, 129")
+        self.bucket_frames_input.textChanged.connect(lambda text: setattr(self, "bucket_frames", text))
+        bucket_layout.addWidget(self.bucket_frames_input, 1)
+        right_panel.addLayout(bucket_layout)
+        
+        # Still extraction settings used by "Export Stills from Trim Window"
+        still_layout = QHBoxLayout()
+        still_layout.addWidget(QLabel("Stills:"))
+        self.still_frames_input = QLineEdit(self.still_frames)
+        self.still_frames_input.setPlaceholderText("Frames, e.g. first, middle, last or every 8")
+        self.still_frames_input.textChanged.connect(lambda text: setattr(self, "still_frames", text))
+        still_layout.addWidget(self.still_frames_input, 3)
+        self.still_format_combo = QComboBox()
+        self.still_format_combo.addItems(list(STILL_FORMATS))
+        still_layout.addWidget(self.still_format_combo)
+        self.still_quality_spin = QSpinBox()
+        still_layout.addWidget(self.still_quality_spin)
+        self.set_still_format(self.still_format, self.still_quality)
+        self.still_format_combo.currentTextChanged.connect(self.set_still_format)
+        self.still_quality_spin.valueChanged.connect(lambda v: setattr(self, "still_quality", v))
+        right_panel.addLayout(still_layout)
+        
+        # Custom filters applied in the same encode as crop/scale
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel("Filters:"))
+        self.filter_chain_input = QLineEdit(self.filter_chain)
+        self.filter_chain_input.setPlaceholderText("Default chain, e.g. yadif, hqdn3d=4:3:6:4.5, eq=contrast=1.05")
+        self.filter_chain_input.textChanged.connect(lambda text: setattr(self, "filter_chain", text))
+        filter_layout.addWidget(self.filter_chain_input, 2)
+        self.clip_filter_input = QLineEdit()
+        self.clip_filter_input.setPlaceholderText("This clip only (blank = default, 'none' = no filters)")
+        self.clip_filter_input.textChanged.connect(self.set_clip_filters)
+        filter_layout.addWidget(self.clip_filter_input, 2)
+        right_panel.addLayout(filter_layout)
+        
+        # Local staging cache for sources on slow or network storage
+        staging_layout = QHBoxLayout()
+        self.staging_checkbox = QCheckBox("Stage Sources Locally")
+        self.staging_checkbox.setToolTip("Copy the current and neighbouring sources, and an export's sources, to a local cache and read from there")
+        self.staging_checkbox.setChecked(self.staging_enabled)
+        self.staging_checkbox.toggled.connect(self.set_staging_enabled)
+        staging_layout.addWidget(self.staging_checkbox)
+        self.staging_dir_input = QLineEdit(self.staging_dir)
+        self.staging_dir_input.setPlaceholderText(f"Cache folder (default {DEFAULT_STAGING_DIR})")
+        self.staging_dir_input.textChanged.connect(lambda text: setattr(self, "staging_dir", text.strip()))
+        staging_layout.addWidget(self.staging_dir_input, 3)
+        self.staging_size_spin = QSpinBox()
+        self.staging_size_spin.setRange(1, 100000)
+        self.staging_size_spin.setSuffix(" GB")
+        self.staging_size_spin.setValue(self.staging_size_gb)
+        self.staging_size_spin.valueChanged.connect(lambda v: setattr(self, "staging_size_gb", v))
+        staging_layout.addWidget(self.staging_size_spin)
+        right_panel.addLayout(staging_layout)
         
         # New Simple Caption Input placed above the Export button
         self.caption_input = QLineEdit()
@@ -206,9 +507,15 @@ class VideoCropper(QWidget):
         self.caption_input.textChanged.connect(lambda text: setattr(self, "simple_caption", text))
         right_panel.addWidget(self.caption_input)
         
+        export_button_layout = QHBoxLayout()
+        self.dry_run_button = QPushButton("Dry Run")
+        self.dry_run_button.setToolTip("Validate every checked entry and estimate export time and disk space without encoding")
+        self.dry_run_button.clicked.connect(self.exporter.dry_run)
+        export_button_layout.addWidget(self.dry_run_button, 1)
         self.submit_button = QPushButton("Export Cropped Videos")
         self.submit_button.clicked.connect(self.exporter.export_videos)
-        right_panel.addWidget(self.submit_button)
+        export_button_layout.addWidget(self.submit_button, 4)
+        right_panel.addLayout(export_button_layout)
         
         main_layout.addLayout(right_panel, 3)
     
@@ -216,11 +523,50 @@ class VideoCropper(QWidget):
         ratio_value = self.aspect_ratios.get(ratio_name)
         self.scene.set_aspect_ratio(ratio_value)
     
+    def set_staging_enabled(self, enabled):
+        self.staging_enabled = enabled
+        if not enabled:
+            self.staging.stop()
+            return
+        entry = self.editor.current_entry()
+        if entry:
+            self.staging.prefetch_around(entry)
+    
+    def set_encoder_profile(self, name):
+        if name not in ENCODER_PROFILES:
+            print(f"[Warning] Unknown encoder profile '{name}'. Available: {', '.join(ENCODER_PROFILES)}")
+            return
+        self.encoder_profile = name
+        if self.encoder_combo.currentText() != name:
+            self.encoder_combo.setCurrentText(name)
+    
+    def set_still_format(self, still_format, quality=None):
+        """Switch the still format; the quality box becomes PNG compression level or JPEG/WebP quality."""
+        (low, high), default = STILL_FORMATS[still_format]
+        self.still_format = still_format
+        self.still_quality = default if quality is None else quality
+        self.still_format_combo.blockSignals(True)
+        self.still_format_combo.setCurrentText(still_format)
+        self.still_format_combo.blockSignals(False)
+        self.still_quality_spin.setRange(low, high)
+        self.still_quality_spin.setToolTip("PNG compression level (0-9)" if still_format == "png" else "Quality (1-100)")
+        self.still_quality_spin.setValue(self.still_quality)
+    
+    def set_clip_filters(self, text):
+        if not self.current_video:
+            return
+        if text.strip():
+            self.clip_filters[self.current_video] = text
+        else:
+            self.clip_filters.pop(self.current_video, None)
+        self.output_preview.invalidate()
+    
     def set_longest_edge(self):
         try:
             self.longest_edge = int(self.resolution_input.text())
         except ValueError:
             self.longest_edge = 1080
+        self.output_preview.invalidate()
 
     def clear_crop_region_controller(self):
         """
@@ -238,10 +584,10 @@ class VideoCropper(QWidget):
 
     def crop_rect_updating(self, rect):
         """
-        Callback invoked during crop region adjustment.
-        You can use this to update a preview or status label.
+        Callback invoked during crop region adjustment (every mouse move of a drag).
+        Keep this cheap; printing here used to stall drags on slow consoles.
         """
-        print(f"Crop region updating: {rect}")
+        instrumentation.count("crop_drag_updates")
 
     def crop_rect_finalized(self, rect):
         """
@@ -261,15 +607,13 @@ class VideoCropper(QWidget):
         h = int(rect.height() * scale_h)
         self.crop_regions[self.current_video] = (x, y, w, h)
         self.check_current_video_item()
+        self.output_preview.invalidate()
 
     def check_current_video_item(self):
-        # Find the list item corresponding to the current video and mark it checked.
-        for i in range(self.video_list.count()):
-            item = self.video_list.item(i)
-            if item.text() == self.current_video:
-                if item.checkState() != Qt.CheckState.Checked:
-                    item.setCheckState(Qt.CheckState.Checked)
-                break
+        # Find the list row of the current video and mark it checked.
+        row = self.clip_model.row_of(self.current_video)
+        if row is not None and not self.video_files[row].get("export_enabled"):
+            self.clip_model.setData(self.clip_model.index(row), Qt.CheckState.Checked, Qt.ItemDataRole.CheckStateRole)
 
     def keyPressEvent(self, event):
         key = event.key()
@@ -307,7 +651,16 @@ class VideoCropper(QWidget):
         return False
 
     def closeEvent(self, event):
-        self.loader.save_session()
+        self.scene_detector.stop()
+        self.crop_detector.stop()
+        self.subject_tracker.stop()
+        self.quality_metrics.stop()
+        self.duplicate_finder.stop()
+        self.output_preview.stop()
+        self.staging.stop()
+        self.list_thumbnails.stop()
+        self.workspace.stop()
+        self.loader.write_session()
         event.accept()
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
 # video_editor.py
 import cv2
+from scripts.scene_detector import longest_cut_free_window
+from scripts.instrumentation import instrumentation
+from scripts.staging_cache import resolve_source
 from PyQt6.QtGui import QImage, QPixmap, QPainter, QColor, QPen
 from PyQt6.QtCore import Qt, QTimer, QRectF
 from scripts.interactive_crop_region import InteractiveCropRegion  # New interactive crop region
@@ -10,7 +13,8 @@ class VideoEditor:
 
     def load_video(self, video_entry):
         video_path = video_entry["original_path"]
-        self.main_app.cap = cv2.VideoCapture(video_path)
+        self.main_app.cap = cv2.VideoCapture(resolve_source(self.main_app, video_path))
+        self.main_app.staging.prefetch_around(video_entry)
         if not self.main_app.cap.isOpened():
             print("Error: Could not open video file.")
             return
@@ -18,19 +22,33 @@ class VideoEditor:
         self.main_app.original_width = int(self.main_app.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.main_app.original_height = int(self.main_app.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         self.main_app.clip_aspect_ratio = self.main_app.original_width / self.main_app.original_height
+        self.main_app.workspace.record_info(video_path, [self.main_app.original_width, self.main_app.original_height,
+                                                         self.main_app.cap.get(cv2.CAP_PROP_FPS), self.main_app.frame_count])
+        cuts = self.main_app.scene_detector.cached_cuts(video_path)
         if (self.main_app.current_video not in self.main_app.trim_points or 
             self.main_app.trim_points[self.main_app.current_video] <= 0):
-            self.main_app.trim_points[self.main_app.current_video] = self.main_app.frame_count // 2
+            if cuts:
+                # Snap the default trim point into the longest shot.
+                self.main_app.trim_points[self.main_app.current_video] = longest_cut_free_window(
+                    cuts, self.main_app.frame_count, self.main_app.trim_length)
+            else:
+                self.main_app.trim_points[self.main_app.current_video] = self.main_app.frame_count // 2
         trim_frame = self.main_app.trim_points[self.main_app.current_video]
         self.main_app.slider.setMaximum(self.main_app.frame_count - 1)
+        self.main_app.slider.set_markers(cuts)
         self.main_app.slider.setEnabled(True)
         self.main_app.slider.setValue(trim_frame)
         self.main_app.clip_length_label.setText(f"Clip Length: {self.main_app.frame_count}")
         self.update_trim_label()
-        self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, trim_frame)
-        for _ in range(5):
-            self.main_app.cap.grab()
-        ret, frame = self.main_app.cap.read()
+        self.main_app.clip_filter_input.blockSignals(True)
+        self.main_app.clip_filter_input.setText(self.main_app.clip_filters.get(self.main_app.current_video, ""))
+        self.main_app.clip_filter_input.blockSignals(False)
+        with instrumentation.span("seek"):
+            self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, trim_frame)
+            for _ in range(5):
+                self.main_app.cap.grab()
+        with instrumentation.span("decode"):
+            ret, frame = self.main_app.cap.read()
         if ret:
             self.display_frame(frame)
         else:
@@ -55,30 +73,48 @@ class VideoEditor:
                 self.main_app.scene.removeItem(item)
             self.main_app.current_rect = None
 
+    def current_entry(self):
+        """Return the video_files entry for the clip currently loaded, if any."""
+        return next((e for e in self.main_app.video_files
+                     if e["display_name"] == self.main_app.current_video), None)
+
+    def read_frame_at(self, position):
+        """Seek the current capture to a frame and decode it."""
+        with instrumentation.span("seek"):
+            self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+        with instrumentation.span("decode"):
+            return self.main_app.cap.read()
+
+    def read_next_frame(self):
+        with instrumentation.span("decode"):
+            return self.main_app.cap.read()
+
     def display_frame(self, frame):
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = frame.shape
-        bytes_per_line = ch * w
-        q_img = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-        pixmap = QPixmap.fromImage(q_img)
-        scaled_pixmap = pixmap.scaled(
-            self.main_app.graphics_view.width() - 20,
-            self.main_app.graphics_view.height() - 20,
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.main_app.pixmap_item.setPixmap(scaled_pixmap)
-        self.main_app.graphics_view.fitInView(self.main_app.pixmap_item, Qt.AspectRatioMode.KeepAspectRatio)
-        # Set the scene boundaries to match the pixmap's bounding rectangle.
-        self.main_app.scene.setSceneRect(self.main_app.pixmap_item.boundingRect())
+        with instrumentation.span("display_frame"):
+            with instrumentation.span("color_convert"):
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                h, w, ch = frame.shape
+                bytes_per_line = ch * w
+                q_img = QImage(frame.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
+                pixmap = QPixmap.fromImage(q_img)
+            with instrumentation.span("pixmap_scale"):
+                scaled_pixmap = pixmap.scaled(
+                    self.main_app.graphics_view.width() - 20,
+                    self.main_app.graphics_view.height() - 20,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+            self.main_app.pixmap_item.setPixmap(scaled_pixmap)
+            self.main_app.graphics_view.fitInView(self.main_app.pixmap_item, Qt.AspectRatioMode.KeepAspectRatio)
+            # Set the scene boundaries to match the pixmap's bounding rectangle.
+            self.main_app.scene.setSceneRect(self.main_app.pixmap_item.boundingRect())
 
     def scrub_video(self, position):
         if self.main_app.cap:
             self.main_app.trim_points[self.main_app.current_video] = int(position)
             self.main_app.trim_modified = True
             self.update_trim_label()
-            self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, int(position))
-            ret, frame = self.main_app.cap.read()
+            ret, frame = self.read_frame_at(int(position))
             if ret:
                 self.display_frame(frame)
 
@@ -88,6 +124,8 @@ class VideoEditor:
         if str(val) != self.main_app.trim_point_label.text():
             self.main_app.trim_point_label.setText(str(val))
         self.main_app.trim_points[self.main_app.current_video] = val
+        self.main_app.output_preview.invalidate()
+        self.main_app.list_thumbnails.schedule()
         if self.main_app.trim_modified:
             self.main_app.check_current_video_item()
             self.main_app.trim_modified = False
@@ -145,10 +183,9 @@ class VideoEditor:
         # Update the slider and video position
         self.main_app.slider.setValue(new_value)
         self.main_app.trim_points[self.main_app.current_video] = new_value
-        self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, new_value)
         
         # Update the display
-        ret, frame = self.main_app.cap.read()
+        ret, frame = self.read_frame_at(new_value)
         if ret:
             self.display_frame(frame)
         
@@ -167,8 +204,7 @@ class VideoEditor:
         self.main_app.slider.setValue(frame_pos)
         self.main_app.trim_modified = True
         self.update_trim_label()
-        self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-        ret, frame = self.main_app.cap.read()
+        ret, frame = self.read_frame_at(frame_pos)
         if ret:
             self.display_frame(frame)
 
@@ -179,8 +215,7 @@ class VideoEditor:
         slider_width = self.main_app.slider.width()
         frame_pos = int((pos.x() / slider_width) * self.main_app.frame_count)
         frame_pos = max(0, min(frame_pos, self.main_app.frame_count - 1))
-        self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-        ret, frame = self.main_app.cap.read()
+        ret, frame = self.read_frame_at(frame_pos)
         if ret:
             frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             h, w, ch = frame.shape
@@ -211,8 +246,9 @@ class VideoEditor:
             end = start + self.main_app.trim_length
             current_frame = self.main_app.cap.get(cv2.CAP_PROP_POS_FRAMES)
             if current_frame >= end:
-                self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, start)
-            ret, frame = self.main_app.cap.read()
+                with instrumentation.span("seek"):
+                    self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            ret, frame = self.read_next_frame()
             if ret:
                 self.display_frame(frame)
                 QTimer.singleShot(30, self.start_loop_playback)
@@ -226,7 +262,7 @@ class VideoEditor:
 
     def play_forward(self):
         if self.main_app.is_playing and self.main_app.cap:
-            ret, frame = self.main_app.cap.read()
+            ret, frame = self.read_next_frame()
             if ret:
                 current_frame = int(self.main_app.cap.get(cv2.CAP_PROP_POS_FRAMES))
                 self.main_app.trim_points[self.main_app.current_video] = current_frame
@@ -246,7 +282,7 @@ class VideoEditor:
         current_idx = self.main_app.video_list.currentRow()
         new_idx = min(len(self.main_app.video_files) - 1, current_idx + 1)
         self.main_app.video_list.setCurrentRow(new_idx)
-        self.main_app.loader.load_video(self.main_app.video_list.currentItem())
+        self.main_app.loader.load_video(self.main_app.video_list.currentIndex())
 
     def move_trim(self, step):
         new_val = self.main_app.slider.value() + step
@@ -254,8 +290,7 @@ class VideoEditor:
         self.main_app.slider.setValue(new_val)
         self.update_trim_label()
         if self.main_app.cap:
-            self.main_app.cap.set(cv2.CAP_PROP_POS_FRAMES, new_val)
-            ret, frame = self.main_app.cap.read()
+            ret, frame = self.read_frame_at(new_val)
             if ret:
                 self.display_frame(frame)
 
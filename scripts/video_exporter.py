@@ -1,17 +1,88 @@
-import os, ffmpeg, cv2
+import os, re, json, time, ffmpeg, cv2, numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import QMessageBox
+from scripts.instrumentation import instrumentation
+from scripts.export_queue import ExportQueue, DONE, temp_path_for, atomic_write_text
+from scripts.dataset_manifest import DatasetManifest, manifest_rows
+from scripts.shard_writer import ShardWriter, DEFAULT_SHARD_SIZE_MB
+from scripts.filter_chain import clip_filter_chain, take_fps
+from scripts.encoder_profiles import DEFAULT_ENCODER_PROFILE, encoder_settings
+from scripts.export_planner import note_problem, estimate_job, order_jobs, plan_report, describe_report
+from scripts.smart_cut import probe_keyframes, smart_cut, decoded_frames
+from scripts.staging_cache import resolve_source
+from scripts.subject_tracker import TRACK_FILTER, fresh_track, tracked_crop, track_commands
+from scripts.still_extractor import DEFAULT_STILL_FRAMES, STILL_FORMATS, parse_still_frames, extract_stills
+
+QUEUE_FILE = "export_queue.jsonl"
+FAILURE_REPORT_FILE = "export_failures.json"
+VERIFICATION_REPORT_FILE = "export_verification.json"
+PLAN_FILE = "export_plan.json"
+PROGRESS_FRAME = re.compile(rb"^frame=(\d+)", re.MULTILINE)
+
+
+def scaled_height(width, height, target_width):
+    """Height ffmpeg's scale=target_width:-2 produces (av_rescale rounding, even)."""
+    return int(target_width * height / (width * 2) + 0.5) * 2
+
+def output_frame_count(source_frames, source_fps, chain_fps=None):
+    """Frames a window of source_frames yields at the filter chain's fps (unchanged without one)."""
+    if not chain_fps:
+        return source_frames
+    # Rounded down, so the one frame of input headroom always covers the count.
+    return max(1, int(source_frames * chain_fps / source_fps))
+
+def cropped_filters(crop, custom_filters, longest_edge):
+    """
+    Filters of a cropped export after the fps filter, and the output size they produce.
+    The custom chain runs on the cropped frame, before scaling.
+    """
+    x, y, w, h = crop
+    w, h = w - w % 2, h - h % 2
+    filters = [["crop", [w, h, x, y], {}]] + custom_filters + [["scale", [longest_edge, -2], {}]]
+    return filters, [longest_edge, scaled_height(w, h, longest_edge)]
+
+
+def frames_job(job):
+    """
+    Turn a video job into a raw-frames job: same trim and filters, but decoded RGB
+    frames go into a .npy array instead of an encoded file. Aspect-preserving
+    scales get their exact height so every frame has the expected size.
+    """
+    width, height = job["expected_size"]
+    filters = [[name, [width, height], kwargs] if name == "scale" and -2 in args else [name, args, kwargs]
+               for name, args, kwargs in job["filters"]]
+    return dict(
+        job,
+        kind="frames",
+        filters=filters,
+        output_args={"format": "rawvideo", "pix_fmt": "rgb24", "vframes": job["expected_frames"]},
+        output=os.path.splitext(job["output"])[0] + ".npy",
+    )
 
 class VideoExporter:
     def __init__(self, main_app):
         self.main_app = main_app
         self.file_counter = 0  # Counter for incremental padding suffix
+        self.problems = []  # [display_name, reason] for entries the last plan skipped
+        self.keyframe_cache = {}  # (source, mtime) -> probe_keyframes() result for the smart-cut path
+        self.fast_path = {"tried": 0, "copied": 0, "seconds": 0.0}  # Smart-cut attempts of the last batch
+
+    @staticmethod
+    def probe_output(video_path):
+        """
+        Return (frame_count, width, height) of a file's first video stream.
+        Counts packets instead of trusting nb_frames, which some containers leave out.
+        """
+        with instrumentation.span("probe"):
+            probe = ffmpeg.probe(video_path, select_streams='v:0', count_packets=None,
+                                 show_entries='stream=width,height,nb_read_packets')
+        video_stream = probe['streams'][0]
+        return int(video_stream['nb_read_packets']), int(video_stream['width']), int(video_stream['height'])
 
     @staticmethod
     def get_frame_count(video_path):
         try:
-            probe = ffmpeg.probe(video_path)
-            video_stream = next(stream for stream in probe['streams'] if stream['codec_type'] == 'video')
-            return int(video_stream['nb_frames'])
+            return VideoExporter.probe_output(video_path)[0]
         except Exception as e:
             print(f"❌ Error reading frame count from {video_path}: {e}")
             return -1
@@ -21,16 +92,54 @@ class VideoExporter:
         If a simple caption was provided, write it into a .txt file with the same base name as output_file.
         """
         caption = getattr(self.main_app, 'simple_caption', '').strip()
+        self.write_caption_text(output_file, caption)
+
+    @staticmethod
+    def write_caption_text(output_file, caption):
         if caption:
             base, _ = os.path.splitext(output_file)
             txt_file = base + ".txt"
-            with open(txt_file, "w") as f:
-                f.write(caption)
+            atomic_write_text(txt_file, caption)
             print(f"Exported caption for {output_file} to {txt_file}")
 
     def export_videos(self):
+        # Offer to finish a batch that was interrupted (crash, power loss, closed app).
+        queue = ExportQueue.load(self.queue_path())
+        if queue and queue.unfinished():
+            answer = QMessageBox.question(
+                self.main_app, "Resume Export",
+                f"A previous export stopped with {len(queue.unfinished())} job(s) left. Resume it?")
+            if answer == QMessageBox.StandardButton.Yes:
+                self.run_queue(queue, verify=self.main_app.verify_outputs_checkbox.isChecked())
+                self.report_failures(queue)
+                return
+
+        # Bucket mode encodes straight to the trainer's sizes and replaces the
+        # cropped/uncropped outputs, so the cropped/uncropped warnings do not apply.
+        if not self.main_app.export_bucketed_checkbox.isChecked() and not self.confirm_export_toggles():
+            return
+
+        # Validate every entry and check the disk before anything is encoded.
+        jobs, problems = self.plan_current()
+        report = self.write_plan(jobs, problems)
+        if not jobs:
+            QMessageBox.information(self.main_app, "Nothing to Export", describe_report(report))
+            return
+        if problems or not report["fits_on_disk"]:
+            answer = QMessageBox.question(self.main_app, "Export Plan",
+                                          describe_report(report) + "\n\nExport anyway?")
+            if answer != QMessageBox.StandardButton.Yes:
+                return
+        queue = self.run_jobs(jobs, verify=self.main_app.verify_outputs_checkbox.isChecked())
+        self.report_failures(queue)
+
+    def confirm_export_toggles(self):
+        """Warn when cropped or uncropped clips are switched off; returns False if the user backs out."""
+        export_cropped = self.main_app.export_cropped_checkbox.isChecked()
+        export_uncropped = self.main_app.export_uncropped_checkbox.isChecked()
+
         # Check toggles and warn if needed.
-        if not self.main_app.export_uncropped_checkbox.isChecked():
+        if not export_uncropped:
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Icon.Warning)
             msg.setText("Uncropped clips will not be exported.")
@@ -40,9 +149,9 @@ class VideoExporter:
             return_button = msg.addButton("Return", QMessageBox.ButtonRole.RejectRole)
             msg.exec()
             if msg.clickedButton() == return_button:
-                return
+                return False
 
-        if not self.main_app.export_cropped_checkbox.isChecked():
+        if not export_cropped:
             msg = QMessageBox()
             msg.setIcon(QMessageBox.Icon.Warning)
             msg.setText("Cropped clips will not be exported.")
@@ -52,183 +161,461 @@ class VideoExporter:
             return_button = msg.addButton("Return", QMessageBox.ButtonRole.RejectRole)
             msg.exec()
             if msg.clickedButton() == return_button:
-                return
+                return False
+        return True
+
+    def plan_current(self):
+        """Plan jobs for the current export settings; returns (jobs, problems)."""
+        if self.main_app.export_bucketed_checkbox.isChecked():
+            jobs = self.main_app.bucket_exporter.plan_buckets()
+            return jobs, self.main_app.bucket_exporter.problems
+        jobs = self.plan_jobs(self.main_app.export_cropped_checkbox.isChecked(),
+                              self.main_app.export_uncropped_checkbox.isChecked(),
+                              self.main_app.export_image_checkbox.isChecked())
+        return jobs, self.problems
+
+    def dry_run(self):
+        """Plan and validate the export without encoding anything."""
+        jobs, problems = self.plan_current()
+        report = self.write_plan(jobs, problems)
+        QMessageBox.information(self.main_app, "Export Dry Run", describe_report(report) +
+                                f"\n\nPer-job estimates: {os.path.join(self.main_app.folder_path, PLAN_FILE)}")
+
+    def write_plan(self, jobs, problems):
+        """Estimate the batch in the order it would run and save the report as export_plan.json."""
+        report = plan_report(self.finalize_jobs(jobs), problems, self.main_app.folder_path,
+                             getattr(self.main_app, 'export_throughput', None))
+        os.makedirs(self.main_app.folder_path, exist_ok=True)
+        atomic_write_text(os.path.join(self.main_app.folder_path, PLAN_FILE), json.dumps(report, indent=2))
+        print(describe_report(report))
+        return report
+
+    def queue_path(self):
+        return os.path.join(self.main_app.folder_path, QUEUE_FILE)
+
+    def report_failures(self, queue):
+        failed = len(queue.failures())
+        mismatched = len(getattr(queue, "mismatches", []))
+        if failed or mismatched:
+            lines = []
+            if failed:
+                lines.append(f"{failed} job(s) failed after retries. See "
+                             f"{os.path.join(self.main_app.folder_path, FAILURE_REPORT_FILE)}")
+            if mismatched:
+                lines.append(f"{mismatched} output(s) did not match the expected frames or size. See "
+                             f"{os.path.join(self.main_app.folder_path, VERIFICATION_REPORT_FILE)}")
+            QMessageBox.warning(self.main_app, "Export Finished With Errors", "\n".join(lines))
+
+    def run_export(self, export_cropped, export_uncropped, export_image, verify=False):
+        """
+        Export every checked entry without any dialogs.
+        Called by export_videos with the checkbox states, and by headless tools.
+        Returns the finished ExportQueue.
+        """
+        jobs = self.plan_jobs(export_cropped, export_uncropped, export_image)
+        return self.run_jobs(jobs, verify)
 
+    def run_jobs(self, jobs, verify=False):
+        """Start a new persistent batch from a list of job dicts and run it."""
+        queue = ExportQueue(self.queue_path())
+        queue.reset(self.finalize_jobs(jobs))
+        self.run_queue(queue, verify)
+        return queue
+
+    def finalize_jobs(self, jobs):
+        """Apply the output target to planned jobs and put them in run order, longest first."""
+        if getattr(self.main_app, 'export_frames', False):
+            jobs = [frames_job(job) if job["kind"] == "video" else job for job in jobs]
+        return order_jobs(jobs)
+
+    def run_queue(self, queue, verify=False):
+        os.makedirs(self.main_app.folder_path, exist_ok=True)
+        self.manifest = DatasetManifest(self.main_app.folder_path)
+        self.shards = None
+        if getattr(self.main_app, 'export_shards', False):
+            self.shards = ShardWriter(self.main_app.folder_path,
+                                      getattr(self.main_app, 'shard_size_mb', DEFAULT_SHARD_SIZE_MB) * 1024 * 1024)
+            # On resume, outputs of jobs that finished before the crash may still be loose.
+            for job in queue.jobs:
+                if job["state"] == DONE:
+                    self.manifest.add_rows(self.shards.repack(manifest_rows(job, self.main_app.folder_path),
+                                                              job["caption"]))
+        pending = queue.unfinished()
+        self.fast_path = {"tried": 0, "copied": 0, "seconds": 0.0}
+        staging = getattr(self.main_app, "staging", None)
+        if staging:
+            staging.stage_for_export([job["source"] for job in pending])
+        start = time.perf_counter()
+        queue.run(self.execute_job, self.job_done)
+        elapsed = time.perf_counter() - start
+        # Calibrate the planner's time estimates from what this machine just did.
+        work = sum(estimate_job(job)[0] for job in pending if job["state"] == DONE)
+        if work and elapsed > 1:
+            self.main_app.export_throughput = work / elapsed
+        if self.shards:
+            self.shards.close_shard()
+        self.manifest.compact()
+        if getattr(self.main_app, 'manifest_tables', False):
+            self.manifest.write_tables()
+        failed = queue.write_failure_report(os.path.join(self.main_app.folder_path, FAILURE_REPORT_FILE))
+        done = len(queue.jobs) - failed
+        print(f"Export finished: {done} job(s) done, {failed} failed.")
+        if self.fast_path["tried"]:
+            # Windows shorter than about two source GOPs rarely qualify; this shows how often it paid off.
+            print(f"Fast path: {self.fast_path['copied']} of {self.fast_path['tried']} job(s) stream-copied "
+                  f"in {self.fast_path['seconds']:.1f}s.")
+        if verify:
+            queue.mismatches = self.verify_outputs(queue)
+
+    def verify_outputs(self, queue):
+        """
+        Probe every finished video output in parallel and check its frame count and size.
+        Writes the mismatches to export_verification.json and returns them.
+        """
+        # Outputs already moved into tar shards are skipped.
+        jobs = [job for job in queue.jobs
+                if job["state"] == DONE and job["kind"] == "video" and os.path.exists(job["output"])]
+
+        def check(job):
+            try:
+                frames, width, height = self.probe_output(job["output"])
+            except Exception as e:
+                return {"output": job["output"], "error": str(e)}
+            problems = {}
+            if job.get("expected_frames") is not None and frames != job["expected_frames"]:
+                problems["frames"] = frames
+                problems["expected_frames"] = job["expected_frames"]
+            if job.get("expected_size") and [width, height] != list(job["expected_size"]):
+                problems["size"] = [width, height]
+                problems["expected_size"] = list(job["expected_size"])
+            return dict(problems, output=job["output"]) if problems else None
+
+        # Each probe is a separate ffprobe process, so threads are enough to run them in parallel.
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as pool:
+            mismatches = [result for result in pool.map(check, jobs) if result]
+        atomic_write_text(os.path.join(self.main_app.folder_path, VERIFICATION_REPORT_FILE),
+                          json.dumps(mismatches, indent=2))
+        print(f"Verified {len(jobs)} output(s): {len(mismatches)} mismatch(es).")
+        return mismatches
+
+    def plan_jobs(self, export_cropped, export_uncropped, export_image):
+        """Validate the checked entries and turn them into export jobs (one per output file)."""
         output_folder = os.path.join(self.main_app.folder_path, "cropped")
-        os.makedirs(output_folder, exist_ok=True)
-        if self.main_app.export_uncropped_checkbox.isChecked():
-            uncropped_folder = os.path.join(self.main_app.folder_path, "uncropped")
-            os.makedirs(uncropped_folder, exist_ok=True)
-        
+        uncropped_folder = os.path.join(self.main_app.folder_path, "uncropped")
+        caption = getattr(self.main_app, 'simple_caption', '').strip()
+        # Safely handle export_prefix
+        prefix = getattr(self.main_app, 'export_prefix', '').strip()
+        # Ensure even dimensions
+        longest_edge = self.main_app.longest_edge - self.main_app.longest_edge % 2
+        profile_args, container, encoder_hints = encoder_settings(
+            getattr(self.main_app, 'encoder_profile', DEFAULT_ENCODER_PROFILE))
+        still_frames = getattr(self.main_app, 'still_frames', DEFAULT_STILL_FRAMES)
+        still_format = getattr(self.main_app, 'still_format', "png")
+        still_quality = getattr(self.main_app, 'still_quality', STILL_FORMATS[still_format][1])
+
         # Reset file counter for each export session
         self.file_counter = 0
+        self.problems = []
+        jobs = []
 
         # Loop through the video entries.
-        for entry in self.main_app.video_files:
+        workspace = getattr(self.main_app, "workspace", None)
+        for entry in workspace.entries() if workspace else self.main_app.video_files:
+            if not entry.get("export_enabled", False):
+                continue
             video_path = entry["original_path"]
             display_name = entry["display_name"]
             crop = self.main_app.crop_regions.get(display_name)
 
-            # Safely handle export_prefix
-            prefix = getattr(self.main_app, 'export_prefix', '').strip()
-
-            if not entry.get("export_enabled", False):
-                continue
-
-            cap = cv2.VideoCapture(video_path)
+            cap = cv2.VideoCapture(resolve_source(self.main_app, video_path))
             orig_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             orig_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             fps = cap.get(cv2.CAP_PROP_FPS)
             frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            cap.release()
             trim_start = self.main_app.trim_points.get(display_name, 0)
-            duration = self.main_app.trim_length / fps
 
-            # Force integer frame rate (round to nearest integer)
-            output_fps = round(fps)
-            if output_fps < 1:
-                output_fps = 1  # Ensure at least 1 fps
+            if fps <= 0:
+                reason = "source file is missing" if not os.path.exists(video_path) else "could not read video properties"
+                note_problem(self.problems, display_name, reason)
+                continue
 
-            # Calculate end frame (using original frame count)
-            end_frame = min(trim_start + self.main_app.trim_length, frame_count)
+            # Force integer frame rate (round to nearest integer), unless the filter chain sets one.
+            custom_filters, chain_fps = take_fps(clip_filter_chain(self.main_app, display_name))
+            output_fps = chain_fps or max(1, round(fps))
 
             # Sanity check: trim_start must be within total frames
             if trim_start >= frame_count:
-                print(f"[Warning] Skipping {display_name}: trim_start {trim_start} >= total frames {frame_count}")
-                cap.release()
+                note_problem(self.problems, display_name, f"trim_start {trim_start} >= total frames {frame_count}")
                 continue
+            expected_frames = min(self.main_app.trim_length, frame_count - trim_start)
+            output_frames = output_frame_count(expected_frames, fps, chain_fps)
+
+            valid_crop = None
+            if crop:
+                x, y, w, h = crop
+                if x < 0 or y < 0 or w <= 0 or h <= 0 or x+w > orig_w or y+h > orig_h:
+                    note_problem(self.problems, display_name, "invalid crop region, cropped outputs skipped")
+                else:
+                    valid_crop = (x, y, w, h)
+            track = valid_crop and fresh_track(getattr(self.main_app, 'crop_tracks', {}), display_name,
+                                               valid_crop, trim_start)
 
             # Generate the base name for this entry
             if prefix:
                 self.file_counter += 1
                 base_output_name = f"{prefix}_{self.file_counter:05d}"
             else:
-                base_name = os.path.splitext(display_name)[0]
-                base_output_name = base_name
-
-            if self.main_app.export_image_checkbox.isChecked():
-                cap.set(cv2.CAP_PROP_POS_FRAMES, trim_start)
-                ret, frame = cap.read()
-                if ret:
-                    # Fallback: if neither export cropped nor export uncropped flags are ticked,
-                    # export both a cropped image (if valid crop exists) and an uncropped image.
-                    if (not self.main_app.export_cropped_checkbox.isChecked() and 
-                        not self.main_app.export_uncropped_checkbox.isChecked()):
-                        
-                        # Export cropped image to the "cropped" folder if a crop exists
-                        if crop:
-                            x, y, w, h = crop
-                            if x < 0 or y < 0 or w <= 0 or h <= 0 or x+w > orig_w or y+h > orig_h:
-                                print(f"Invalid crop region for {display_name}")
-                            else:
-                                cropped_frame = frame[y:y+h, x:x+w]
-                                if cropped_frame.size == 0:
-                                    print(f"Empty crop region for {display_name}")
-                                else:
-                                    cropped_image_name = f"{base_output_name}_cropped.png"
-                                    cropped_image_path = os.path.join(output_folder, cropped_image_name)
-                                    cv2.imwrite(cropped_image_path, cropped_frame)
-                                    print(f"Exported cropped image for {display_name} to {cropped_image_path}")
-                                    self.write_caption(cropped_image_path)
-                        
-                        # Export uncropped image to the "uncropped" folder
-                        uncropped_folder = os.path.join(self.main_app.folder_path, "uncropped")
-                        os.makedirs(uncropped_folder, exist_ok=True)
-                        uncropped_image_name = f"{base_output_name}.png"
-                        uncropped_image_path = os.path.join(uncropped_folder, uncropped_image_name)
-                        cv2.imwrite(uncropped_image_path, frame)
-                        print(f"Exported uncropped image for {display_name} to {uncropped_image_path}")
-                        self.write_caption(uncropped_image_path)
-                    else:
-                        # Existing behavior when either export cropped or export uncropped flags are ticked.
-                        if crop and self.main_app.export_cropped_checkbox.isChecked():
-                            x, y, w, h = crop
-                            if x < 0 or y < 0 or w <= 0 or h <= 0 or x+w > orig_w or y+h > orig_h:
-                                print(f"Invalid crop region for {display_name}")
-                            else:
-                                cropped_frame = frame[y:y+h, x:x+w]
-                                if cropped_frame.size == 0:
-                                    print(f"Empty crop region for {display_name}")
-                                else:
-                                    cropped_image_name = f"{base_output_name}_cropped.png"
-                                    cropped_image_path = os.path.join(output_folder, cropped_image_name)
-                                    cv2.imwrite(cropped_image_path, cropped_frame)
-                                    print(f"Exported cropped image for {display_name} to {cropped_image_path}")
-                                    self.write_caption(cropped_image_path)
-                        if self.main_app.export_uncropped_checkbox.isChecked():
-                            uncropped_folder = os.path.join(self.main_app.folder_path, "uncropped")
-                            os.makedirs(uncropped_folder, exist_ok=True)
-                            uncropped_image_name = f"{base_output_name}.png"
-                            uncropped_image_path = os.path.join(uncropped_folder, uncropped_image_name)
-                            cv2.imwrite(uncropped_image_path, frame)
-                            print(f"Exported uncropped image for {display_name} to {uncropped_image_path}")
-                            self.write_caption(uncropped_image_path)
+                base_output_name = os.path.splitext(display_name)[0]
+            ext = container or os.path.splitext(display_name)[1]
+
+            common = {
+                "display_name": display_name,
+                "source": video_path,
+                "caption": caption,
+                "trim_start": trim_start,
+                "source_size": [orig_w, orig_h],
+            }
+
+            if export_image:
+                # Fallback: if neither export cropped nor export uncropped flags are ticked,
+                # export both cropped stills (if valid crop exists) and uncropped stills.
+                both = not export_cropped and not export_uncropped
+                variants = []
+                if valid_crop and (export_cropped or both):
+                    variants.append((valid_crop, output_folder, f"{base_output_name}_cropped"))
+                if export_uncropped or both:
+                    variants.append((None, uncropped_folder, base_output_name))
+                offsets = parse_still_frames(still_frames, expected_frames)
+                outputs = []
+                for crop, folder, stem in variants:
+                    for offset in offsets:
+                        # A single still keeps the original file name; several get the offset appended.
+                        name = stem if len(offsets) == 1 else f"{stem}_{offset:04d}"
+                        still_crop = tracked_crop(track, crop, offset) if crop and track else crop
+                        outputs.append([trim_start + offset, still_crop, os.path.join(folder, f"{name}.{still_format}")])
+                if outputs:
+                    jobs.append(dict(common, kind="stills", label="stills", outputs=outputs,
+                                     format=still_format, quality=still_quality, output=outputs[0][2]))
+
+            video_job = dict(
+                common,
+                kind="video",
+                ss=trim_start / fps,
+                # One frame of headroom, cut back by vframes: for non-integer rates such as
+                # 29.97 the fps filter could otherwise land one frame short of or past the window.
+                t=(self.main_app.trim_length + 1) / fps,
+                output_fps=output_fps,
+                output_args={"vframes": output_frames, "r": output_fps, "vsync": "cfr", "map_metadata": "-1",
+                             **profile_args},
+                encoder_hints=encoder_hints,
+                expected_frames=output_frames,
+                # Set when the chain changes the rate, so the manifest can map output frames back to source frames.
+                source_fps=fps if chain_fps else None,
+            )
 
             # Cropped video export
-            if self.main_app.export_cropped_checkbox.isChecked() and crop:
-                x, y, w, h = crop
-                if x < 0 or y < 0 or w <= 0 or h <= 0 or x+w > orig_w or y+h > orig_h:
-                    print(f"Invalid crop region for {display_name}")
-                else:
-                    # Ensure even dimensions
-                    if self.main_app.longest_edge % 2 != 0:
-                        self.main_app.longest_edge -= 1
-                    if h % 2 != 0:
-                        h -= 1
-                    if w % 2 != 0:
-                        w -= 1
-
-                    base_name, ext = os.path.splitext(display_name)
-                    output_name = f"{base_output_name}_cropped{ext}"
-                    output_path = os.path.join(output_folder, output_name)
-
-                    try:
-                        ss = trim_start / fps
-                        t = self.main_app.trim_length / fps
-
-                        (
-                            ffmpeg.input(video_path, ss=ss, t=t)
-                            .filter('fps', fps=output_fps, round='up')  # Force constant frame rate
-                            .filter('crop', w, h, x, y)
-                            .filter('scale', self.main_app.longest_edge, -2)
-                            .output(output_path,
-                                    r=output_fps,
-                                    vsync='cfr',
-                                    map_metadata='-1')
-                            .run(overwrite_output=True, quiet=True)
-                        )
-
-                        frame_count = self.get_frame_count(output_path)
-                        print(f"✅ Exported '{output_name}' with {frame_count} frames")
-                        print(f"Exported cropped {display_name} to {output_path}")
-                        self.write_caption(output_path)
-                    except ffmpeg.Error as e:
-                        print(f"Error exporting cropped {display_name}: {e.stderr.decode('utf8')}")
+            if export_cropped and valid_crop:
+                # A tracked crop starts at its first keyframe and is moved per frame by sendcmd.
+                start_crop = tracked_crop(track, valid_crop, 0) if track else valid_crop
+                filters, expected_size = cropped_filters(start_crop, custom_filters, longest_edge)
+                x, y, w, h = valid_crop
+                cropped_job = dict(
+                    video_job,
+                    label="cropped",
+                    crop=[x, y, w - w % 2, h - h % 2],
+                    filters=filters,
+                    expected_size=expected_size,
+                    output=os.path.join(output_folder, f"{base_output_name}_cropped{ext}"),
+                )
+                if track:
+                    cropped_job["track"] = {"fps": track["fps"], "points": track["points"]}
+                jobs.append(cropped_job)
 
             # Uncropped video export
-            if self.main_app.export_uncropped_checkbox.isChecked():
-                base_name, ext = os.path.splitext(display_name)
-                uncropped_name = f"{base_output_name}{ext}"
-                uncropped_path = os.path.join(uncropped_folder, uncropped_name)
-
-                try:
-                    ss = trim_start / fps
-                    t = self.main_app.trim_length / fps
-
-                    (
-                        ffmpeg.input(video_path, ss=ss, t=t)
-                        .filter('fps', fps=output_fps, round='up')
-                        .output(uncropped_path,
-                                r=output_fps,
-                                vsync='cfr',
-                                map_metadata='-1')
-                        .run(overwrite_output=True, quiet=True)
-                    )
-
-                    frame_count = self.get_frame_count(uncropped_path)
-                    print(f"✅ Exported uncropped '{uncropped_name}' with {frame_count} frames")
-                    print(f"Exported uncropped {display_name} to {uncropped_path}")
-                    self.write_caption(uncropped_path)
-                except ffmpeg.Error as e:
-                    print(f"Error exporting uncropped {display_name}: {e.stderr.decode('utf8')}")
+            if export_uncropped:
+                jobs.append(dict(
+                    video_job,
+                    label="uncropped",
+                    crop=None,
+                    filters=custom_filters,
+                    # Without filters or a rate change the window may be stream-copied instead of re-encoded.
+                    smart_cut=getattr(self.main_app, 'fast_uncropped', False) and not custom_filters and not chain_fps,
+                    expected_size=[orig_w, orig_h],
+                    output=os.path.join(uncropped_folder, f"{base_output_name}{ext}"),
+                ))
+        return jobs
 
-            cap.release()
+    def preview_job(self, entry):
+        """
+        The video job an export would run for the loaded entry (cropped if it has a valid
+        crop, uncropped otherwise), for rendering a preview. Returns None if it cannot be built.
+        """
+        display_name = entry["display_name"]
+        cap = self.main_app.cap
+        if cap is None:
+            return None
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        orig_w, orig_h = self.main_app.original_width, self.main_app.original_height
+        trim_start = self.main_app.trim_points.get(display_name, 0)
+        if fps <= 0 or trim_start >= self.main_app.frame_count:
+            return None
+        longest_edge = self.main_app.longest_edge - self.main_app.longest_edge % 2
+        custom_filters, chain_fps = take_fps(clip_filter_chain(self.main_app, display_name))
+        crop = self.main_app.crop_regions.get(display_name)
+        job = {
+            "source": entry["original_path"],
+            "input_path": resolve_source(self.main_app, entry["original_path"]),
+            "ss": trim_start / fps,
+            "t": (self.main_app.trim_length + 1) / fps,
+            "output_fps": chain_fps or max(1, round(fps)),
+            "expected_frames": output_frame_count(
+                min(self.main_app.trim_length, self.main_app.frame_count - trim_start), fps, chain_fps),
+            "filters": custom_filters,
+            "expected_size": [orig_w, orig_h],
+        }
+        if crop:
+            x, y, w, h = crop
+            if x >= 0 and y >= 0 and w > 1 and h > 1 and x + w <= orig_w and y + h <= orig_h:
+                track = fresh_track(self.main_app.crop_tracks, display_name, crop, trim_start)
+                if track:
+                    job["track"] = {"fps": track["fps"], "points": track["points"]}
+                    crop = tracked_crop(track, crop, 0)
+                job["filters"], job["expected_size"] = cropped_filters(crop, custom_filters, longest_edge)
+        return job
+
+    def execute_job(self, job):
+        """Produce one output atomically: write to a temporary sibling, then rename. Raises on failure."""
+        # Read from the local staged copy when there is a valid one, once its copy has finished.
+        staging = getattr(self.main_app, "staging", None)
+        if staging:
+            staging.wait_for(job["source"])
+        job["input_path"] = resolve_source(self.main_app, job["source"])
+        if job["kind"] == "stills":
+            extract_stills(job)  # Writes each still atomically on its own.
+            return
+        os.makedirs(os.path.dirname(job["output"]), exist_ok=True)
+        tmp_path = temp_path_for(job["output"])
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)  # Left over from an interrupted attempt.
+        try:
+            with track_commands(job):
+                if job["kind"] == "frames":
+                    self.encode_frames(job, tmp_path)
+                elif not (job.get("smart_cut") and self.try_smart_cut(job, tmp_path)):
+                    self.encode_video(job, tmp_path)
+            os.replace(tmp_path, job["output"])
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def try_smart_cut(self, job, output_path):
+        """
+        Stream-copy the window, re-encoding only partial GOPs at its edges. The result must
+        decode cleanly to exactly the expected frame count; otherwise returns False for a
+        full encode.
+        """
+        name = os.path.basename(job["output"])
+        self.fast_path["tried"] += 1
+        started = time.perf_counter()
+        try:
+            input_path = job.get("input_path", job["source"])
+            key = (input_path, os.path.getmtime(input_path))
+            if key not in self.keyframe_cache:
+                self.keyframe_cache[key] = probe_keyframes(input_path)
+            with instrumentation.span("ffmpeg_job"):
+                smart_cut(job, self.keyframe_cache[key], output_path)
+            frame_count = decoded_frames(output_path)
+            if frame_count != job["expected_frames"]:
+                raise RuntimeError(f"got {frame_count} frames instead of {job['expected_frames']}")
+        except Exception as e:
+            print(f"[Fast path] {name}: {str(e).strip() or type(e).__name__}; falling back to a full encode")
+            return False
+        job["frames_written"] = frame_count
+        self.fast_path["copied"] += 1
+        self.fast_path["seconds"] += time.perf_counter() - started
+        print(f"[Fast path] {name}: stream-copied")
+        return True
+
+    @staticmethod
+    def filter_graph(job):
+        stream = ffmpeg.input(job.get("input_path", job["source"]), ss=job["ss"], t=job["t"])
+        stream = stream.filter('fps', fps=job["output_fps"], round='up')  # Force constant frame rate
+        commands = job.get("track_commands")
+        for name, args, kwargs in job["filters"]:
+            if name == "crop" and commands:
+                # The first crop follows the tracked subject: sendcmd moves it per frame.
+                stream = stream.filter('sendcmd', f=commands).filter(TRACK_FILTER, *args, **kwargs)
+                commands = None
+                continue
+            stream = stream.filter(name, *args, **kwargs)
+        return stream
+
+    def encode_video(self, job, output_path):
+        stream = self.filter_graph(job)
+        # -progress reports the encoder's frame count on stdout, so no probe is needed afterwards.
+        stream = stream.output(output_path, **job["output_args"]).global_args('-progress', 'pipe:1', '-nostats')
+        try:
+            with instrumentation.span("ffmpeg_job"):
+                out, _ = stream.run(overwrite_output=True, capture_stdout=True, capture_stderr=True)
+        except ffmpeg.Error as e:
+            lines = e.stderr.decode('utf8', errors='replace').strip().splitlines() if e.stderr else []
+            raise RuntimeError(lines[-1] if lines else str(e)) from e
+        reported = PROGRESS_FRAME.findall(out)
+        job["frames_written"] = int(reported[-1]) if reported else -1
+
+    def encode_frames(self, job, output_path):
+        """
+        Pipe rawvideo from ffmpeg straight into a memory-mapped (frames, height, width, 3)
+        uint8 .npy, with no intermediate encode. Loaders can np.load(path, mmap_mode="r")
+        and slice frames without decoding.
+        """
+        width, height = job["expected_size"]
+        frame_bytes = width * height * 3
+        stream = self.filter_graph(job).output('pipe:', **job["output_args"]).global_args('-loglevel', 'error')
+        with instrumentation.span("ffmpeg_job"):
+            process = stream.run_async(pipe_stdout=True, pipe_stderr=True)
+            frames = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.uint8,
+                                               shape=(job["expected_frames"], height, width, 3))
+            count = 0
+            try:
+                while count < len(frames):
+                    buffer = process.stdout.read(frame_bytes)
+                    if len(buffer) < frame_bytes:
+                        break
+                    frames[count] = np.frombuffer(buffer, np.uint8).reshape(height, width, 3)
+                    count += 1
+                frames.flush()
+                process.stdout.read()  # Drain anything left so ffmpeg can exit.
+            finally:
+                stderr = process.stderr.read()
+                process.wait()
+        if process.returncode != 0 or count == 0:
+            lines = stderr.decode('utf8', errors='replace').strip().splitlines()
+            raise RuntimeError(lines[-1] if lines else f"ffmpeg produced {count} frames")
+        if count < len(frames):
+            # The source ended early: rewrite the array with only the frames that arrived.
+            data = np.array(frames[:count])
+            del frames
+            np.save(output_path, data)
+        job["frames_written"] = count
+
+    def job_done(self, job):
+        name = os.path.basename(job["output"])
+        if job["kind"] in ("video", "frames"):
+            frame_count = job.get("frames_written", -1)
+            print(f"✅ Exported {job['label']} '{name}' with {frame_count} frames")
+            expected = job.get("expected_frames")
+            if expected is not None and frame_count != expected:
+                print(f"[Warning] {name}: expected {expected} frames, encoder wrote {frame_count}")
+        if job["kind"] == "stills":
+            print(f"Exported {len(job['outputs'])} still(s) for {job['display_name']}")
+            for _, _, path in job["outputs"]:
+                self.write_caption_text(path, job["caption"])
+        else:
+            print(f"Exported {job['label']} {job['kind']} for {job['display_name']} to {job['output']}")
+            self.write_caption_text(job["output"], job["caption"])
+        rows = manifest_rows(job, self.main_app.folder_path)
+        if self.shards:
+            self.shards.add_rows(rows, job["caption"])
+        self.manifest.add_rows(rows)
@@ -1,92 +1,85 @@
 import os, json
-from PyQt6.QtWidgets import QFileDialog, QListWidgetItem
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor  # Added import for QColor
+from PyQt6.QtWidgets import QFileDialog
+from PyQt6.QtCore import Qt, QTimer
+from scripts.instrumentation import instrumentation
+from scripts.export_queue import atomic_write_text
 
 class VideoLoader:
     def __init__(self, main_app):
         self.main_app = main_app
         self.session_file = "session_data.json"
+        # Checkbox toggles and edits arrive in bursts; the session (which also holds the
+        # metadata, scene, metric, hash and track caches) is written once they settle.
+        self.save_timer = QTimer()
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(1000)
+        self.save_timer.timeout.connect(self.write_session)
 
     def load_folder(self):
         folder = QFileDialog.getExistingDirectory(self.main_app, "Select Folder")
         if folder:
-            self.main_app.folder_path = folder
-            # Check if we already have saved session data for this folder.
-            if folder in self.main_app.folder_sessions:
-                self.main_app.video_files = self.main_app.folder_sessions[folder]
-                self.refresh_video_list()
-            else:
-                self.load_folder_contents()
+            self.main_app.workspace.open_folder(folder)
 
-    def load_folder_contents(self):
-        files = [f for f in os.listdir(self.main_app.folder_path) 
-                if f.lower().endswith(('.mp4', '.avi', '.mov'))]
-        
-        # Use saved session data for this folder if available.
-        previous_videos = {}
-        if self.main_app.folder_path in self.main_app.folder_sessions:
-            previous_videos = {
-                entry["display_name"]: entry 
-                for entry in self.main_app.folder_sessions[self.main_app.folder_path]
-            }
-        
-        new_video_files = []
-        for f in files:
+    def add_folder(self):
+        """Open another folder next to the ones already in the workspace."""
+        folder = QFileDialog.getExistingDirectory(self.main_app, "Add Folder to Workspace")
+        if folder:
+            self.main_app.workspace.open_folder(folder, add=True)
+
+    def scan_folder(self, folder, taken):
+        """
+        New entries for the videos in a folder. Names already used by another workspace
+        folder get the folder name as a prefix, since settings are keyed by display name.
+        """
+        entries = []
+        for f in os.listdir(folder):
+            if not f.lower().endswith(('.mp4', '.avi', '.mov')):
+                continue
             display_name = f
-            # If this video was loaded previously in this folder, preserve its settings.
-            video_entry = previous_videos.get(display_name, {
-                "original_path": os.path.join(self.main_app.folder_path, f),
+            if display_name in taken:
+                display_name = f"{os.path.basename(os.path.normpath(folder))}_{f}"
+                copy = 1
+                while display_name in taken:
+                    copy += 1
+                    display_name = f"{os.path.basename(os.path.normpath(folder))}_{copy}_{f}"
+            taken.add(display_name)
+            entries.append({
+                "original_path": os.path.join(folder, f),
                 "display_name": display_name,
                 "copy_number": 0,
                 "export_enabled": False  # Default state
             })
-            new_video_files.append(video_entry)
-        
-        # Append any duplicate entries (saved previously) that aren’t in the file list.
-        for display_name, entry in previous_videos.items():
-            if display_name not in files:
-                new_video_files.append(entry)
-        
-        self.main_app.video_files = new_video_files
-        # Save this folder's state.
-        self.main_app.folder_sessions[self.main_app.folder_path] = new_video_files
-        
-        self.main_app.video_list.clear()
-        for entry in self.main_app.video_files:
-            self.add_video_item(entry["display_name"])
-        
-        self.save_session()
+        return entries
 
-    def add_video_item(self, display_name):
-        item = QListWidgetItem(display_name)
-        item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-        # Look up the saved export state.
-        entry = next((e for e in self.main_app.video_files if e["display_name"] == display_name), None)
-        if entry and entry.get("export_enabled", False):
-            item.setCheckState(Qt.CheckState.Checked)
-        else:
-            item.setCheckState(Qt.CheckState.Unchecked)
-        self.update_list_item_color(item)
-        self.main_app.video_list.addItem(item)
+    def export_toggled(self, row):
+        """A list checkbox was clicked; the model has already updated the entry."""
+        if 0 <= row < len(self.main_app.video_files):
+            self.main_app.workspace.touch(self.main_app.video_files[row]["display_name"])
+        # Save the session after updating the state.
+        self.save_session()
 
-    def update_list_item_color(self, item):
-        idx = self.main_app.video_list.row(item)
-        if idx >= 0 and idx < len(self.main_app.video_files):
-            # Update the export_enabled flag in the video_files entry.
-            self.main_app.video_files[idx]["export_enabled"] = (item.checkState() == Qt.CheckState.Checked)
-        if item.checkState() == Qt.CheckState.Checked:
-            # Use a darker green.
-            item.setBackground(QColor(0, 100, 0))
-        else:
-            item.setBackground(Qt.GlobalColor.transparent)
-        
-        # Save the session immediately after updating the state.
+    def set_export_enabled(self, display_names, enabled):
+        """Check or uncheck many entries at once with a single session write."""
+        display_names = set(display_names)
+        if not display_names:
+            return
+        for entry in self.main_app.workspace.entries():
+            if entry["display_name"] in display_names:
+                entry["export_enabled"] = enabled
+                self.main_app.workspace.touch(entry["display_name"])
+        self.main_app.clip_model.refresh()
         self.save_session()
 
+    def selected_entries(self):
+        """Entries for the selected list rows, or every entry when nothing is selected."""
+        rows = sorted(index.row() for index in self.main_app.video_list.selectionModel().selectedRows())
+        if not rows:
+            return list(self.main_app.video_files)
+        return [self.main_app.video_files[row] for row in rows if row < len(self.main_app.video_files)]
+
 
-    def load_video(self, item):
-        idx = self.main_app.video_list.row(item)
+    def load_video(self, index):
+        idx = index.row()
         if idx < 0 or idx >= len(self.main_app.video_files):
             return
         video_entry = self.main_app.video_files[idx]
@@ -101,18 +94,22 @@ class VideoLoader:
             self.main_app.crop_regions[self.main_app.current_video] = None
         self.main_app.editor.load_video(video_entry)
 
+    def reload_current_video(self):
+        index = self.main_app.video_list.currentIndex()
+        if index.isValid():
+            self.load_video(index)
+
     def duplicate_clip(self):
-        current_item = self.main_app.video_list.currentItem()
-        if not current_item:
+        current_idx = self.main_app.video_list.currentRow()
+        if current_idx < 0:
             return
-        current_idx = self.main_app.video_list.row(current_item)
         original_entry = self.main_app.video_files[current_idx]
         base_name, ext = os.path.splitext(original_entry["display_name"])
         # Start with the next copy number.
         new_copy = original_entry["copy_number"] + 1
         new_display = f"{base_name}_{new_copy}{ext}"
         # Check for name collisions.
-        existing_names = [entry["display_name"] for entry in self.main_app.video_files]
+        existing_names = [entry["display_name"] for entry in self.main_app.workspace.entries()]
         while new_display in existing_names:
             new_copy += 1
             new_display = f"{base_name}_{new_copy}{ext}"
@@ -122,10 +119,15 @@ class VideoLoader:
             "copy_number": new_copy,
             "export_enabled": original_entry.get("export_enabled", False)
         }
-        self.main_app.video_files.append(new_entry)
-        self.add_video_item(new_display)
         self.main_app.crop_regions[new_display] = self.main_app.crop_regions.get(original_entry["display_name"], None)
         self.main_app.trim_points[new_display] = self.main_app.trim_points.get(original_entry["display_name"], 0)
+        if original_entry["display_name"] in self.main_app.clip_metrics:
+            self.main_app.clip_metrics[new_display] = dict(self.main_app.clip_metrics[original_entry["display_name"]])
+        if original_entry["display_name"] in self.main_app.crop_tracks:
+            self.main_app.crop_tracks[new_display] = self.main_app.crop_tracks[original_entry["display_name"]]
+        if original_entry["display_name"] in self.main_app.clip_filters:
+            self.main_app.clip_filters[new_display] = self.main_app.clip_filters[original_entry["display_name"]]
+        self.main_app.workspace.add_entry(new_entry, after=original_entry)
         self.save_session()
 
     def clear_crop_region(self):
@@ -135,11 +137,6 @@ class VideoLoader:
                 self.main_app.scene.removeItem(self.main_app.current_rect)
                 self.main_app.current_rect = None
 
-    def refresh_video_list(self):
-        self.main_app.video_list.clear()
-        for entry in self.main_app.video_files:
-            self.add_video_item(entry["display_name"])
-
     def load_session(self):
         if os.path.exists(self.session_file):
             with open(self.session_file, "r") as file:
@@ -147,33 +144,79 @@ class VideoLoader:
                 self.main_app.folder_path = session_data.get("folder_path", "")
                 self.main_app.video_files = session_data.get("video_files", [])
                 self.main_app.folder_sessions = session_data.get("folder_sessions", {})
+                self.main_app.workspace_folders = session_data.get("workspace_folders", [])
+                self.main_app.workspace_query = session_data.get("workspace_query", "")
+                self.main_app.clip_info = session_data.get("clip_info", {})
                 self.main_app.crop_regions = session_data.get("crop_regions", {})
                 self.main_app.trim_points = session_data.get("trim_points", {})
                 self.main_app.longest_edge = session_data.get("longest_edge", 1024)
                 self.main_app.trim_length = session_data.get("trim_length", 60)
-        if self.main_app.folder_path and os.path.exists(self.main_app.folder_path):
-            if self.main_app.folder_path in self.main_app.folder_sessions:
-                self.main_app.video_files = self.main_app.folder_sessions[self.main_app.folder_path]
-                self.refresh_video_list()
-            else:
-                self.load_folder_contents()
+                self.main_app.bucket_resolutions = session_data.get("bucket_resolutions", self.main_app.bucket_resolutions)
+                self.main_app.bucket_frames = session_data.get("bucket_frames", self.main_app.bucket_frames)
+                self.main_app.still_frames = session_data.get("still_frames", self.main_app.still_frames)
+                self.main_app.still_format = session_data.get("still_format", self.main_app.still_format)
+                self.main_app.still_quality = session_data.get("still_quality", self.main_app.still_quality)
+                self.main_app.export_frames = session_data.get("export_frames", False)
+                self.main_app.fast_uncropped = session_data.get("fast_uncropped", False)
+                self.main_app.encoder_profile = session_data.get("encoder_profile", self.main_app.encoder_profile)
+                self.main_app.staging_enabled = session_data.get("staging_enabled", False)
+                self.main_app.staging_dir = session_data.get("staging_dir", "")
+                self.main_app.staging_size_gb = session_data.get("staging_size_gb", self.main_app.staging_size_gb)
+                self.main_app.manifest_tables = session_data.get("manifest_tables", False)
+                self.main_app.export_shards = session_data.get("export_shards", False)
+                self.main_app.filter_chain = session_data.get("filter_chain", "")
+                self.main_app.clip_filters = session_data.get("clip_filters", {})
+                self.main_app.export_throughput = session_data.get("export_throughput")
+                self.main_app.shard_size_mb = session_data.get("shard_size_mb", self.main_app.shard_size_mb)
+                self.main_app.scene_cuts = session_data.get("scene_cuts", {})
+                self.main_app.clip_metrics = session_data.get("clip_metrics", {})
+                self.main_app.clip_hashes = session_data.get("clip_hashes", {})
+                self.main_app.crop_tracks = session_data.get("crop_tracks", {})
+        if not self.main_app.workspace_folders and self.main_app.folder_path:
+            # Sessions from before workspaces held a single folder.
+            self.main_app.workspace_folders = [self.main_app.folder_path]
+        self.main_app.workspace_folders = [f for f in self.main_app.workspace_folders if os.path.exists(f)]
+        if self.main_app.workspace_folders:
+            self.main_app.workspace.load_folders()
 
     def save_session(self):
-        # Update the export_enabled flag from the UI before saving.
-        for i in range(self.main_app.video_list.count()):
-            item = self.main_app.video_list.item(i)
-            self.main_app.video_files[i]["export_enabled"] = (item.checkState() == Qt.CheckState.Checked)
-        # Update the mapping for the current folder.
-        self.main_app.folder_sessions[self.main_app.folder_path] = self.main_app.video_files
-        
+        """Schedule a session write; calls within a second of each other share one write."""
+        self.save_timer.start()
+
+    def write_session(self):
+        self.save_timer.stop()
         session_data = {
             "folder_path": self.main_app.folder_path,
             "video_files": self.main_app.video_files,
             "folder_sessions": self.main_app.folder_sessions,
+            "workspace_folders": self.main_app.workspace_folders,
+            "workspace_query": self.main_app.workspace_query,
+            "clip_info": self.main_app.clip_info,
             "crop_regions": self.main_app.crop_regions,
             "trim_points": self.main_app.trim_points,
             "longest_edge": self.main_app.longest_edge,
-            "trim_length": self.main_app.trim_length
+            "trim_length": self.main_app.trim_length,
+            "bucket_resolutions": self.main_app.bucket_resolutions,
+            "bucket_frames": self.main_app.bucket_frames,
+            "still_frames": self.main_app.still_frames,
+            "still_format": self.main_app.still_format,
+            "still_quality": self.main_app.still_quality,
+            "export_frames": self.main_app.export_frames,
+            "fast_uncropped": self.main_app.fast_uncropped,
+            "encoder_profile": self.main_app.encoder_profile,
+            "staging_enabled": self.main_app.staging_enabled,
+            "staging_dir": self.main_app.staging_dir,
+            "staging_size_gb": self.main_app.staging_size_gb,
+            "manifest_tables": self.main_app.manifest_tables,
+            "export_shards": self.main_app.export_shards,
+            "filter_chain": self.main_app.filter_chain,
+            "clip_filters": self.main_app.clip_filters,
+            "export_throughput": self.main_app.export_throughput,
+            "shard_size_mb": self.main_app.shard_size_mb,
+            "scene_cuts": self.main_app.scene_cuts,
+            "clip_metrics": self.main_app.clip_metrics,
+            "clip_hashes": self.main_app.clip_hashes,
+            "crop_tracks": self.main_app.crop_tracks
         }
-        with open(self.session_file, "w") as file:
-            json.dump(session_data, file)
+        with instrumentation.span("session_save"):
+            atomic_write_text(self.session_file, json.dumps(session_data))
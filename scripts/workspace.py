@@ -0,0 +1,310 @@
+# workspace.py
+import os, time, cv2, numpy as np
+from PyQt6.QtCore import QTimer, QItemSelection, QItemSelectionModel
+from scripts.background_pool import BackgroundPool
+from scripts.instrumentation import instrumentation
+
+# Resolution words match clips whose short edge is at least this many pixels.
+RESOLUTION_TOKENS = {"8k": 4320, "4k": 2160, "1440p": 1440, "1080p": 1080, "720p": 720, "480p": 480}
+# Boolean words -> (index column, value).
+FLAG_TOKENS = {
+    "checked": ("checked", True), "unchecked": ("checked", False),
+    "crop": ("cropped", True), "cropped": ("cropped", True), "nocrop": ("cropped", False),
+}
+INFO_FIELDS = ("width", "height", "fps", "frames")
+NUMERIC_FIELDS = ("width", "height", "fps", "frames", "duration", "trim")
+COMPARISONS = {
+    ">=": np.greater_equal, "<=": np.less_equal, "!=": np.not_equal,
+    ">": np.greater, "<": np.less, "=": np.equal,
+}
+
+
+def probe_info(video_path):
+    """Worker entry point: [width, height, fps, frame count] of a source, or None."""
+    cv2.setNumThreads(1)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    info = [cap.get(cv2.CAP_PROP_FRAME_WIDTH), cap.get(cv2.CAP_PROP_FRAME_HEIGHT),
+            cap.get(cv2.CAP_PROP_FPS), cap.get(cv2.CAP_PROP_FRAME_COUNT)]
+    cap.release()
+    return info
+
+
+def position_runs(positions):
+    """(start, count) of each run of consecutive positions in a sorted array."""
+    if not len(positions):
+        return []
+    breaks = np.flatnonzero(np.diff(positions) != 1) + 1
+    return [(int(run[0]), len(run)) for run in np.split(positions, breaks)]
+
+
+def parse_query(text):
+    """
+    Parse a search query into terms; all terms must match.
+
+    Words: checked/unchecked, crop/nocrop, a resolution (4k, 1080p, ... = short edge at
+    least that), field comparisons such as fps>=50, duration<10 (seconds) or trim>0,
+    folder:<text>, and anything else as a case-insensitive name substring.
+    """
+    terms = []
+    for token in text.lower().split():
+        if token in FLAG_TOKENS:
+            terms.append(("flag",) + FLAG_TOKENS[token])
+        elif token in RESOLUTION_TOKENS:
+            terms.append(("min_edge", RESOLUTION_TOKENS[token]))
+        elif token.startswith("folder:"):
+            terms.append(("folder", token[len("folder:"):]))
+        elif token.startswith(NUMERIC_FIELDS) and any(op in token for op in COMPARISONS):
+            op = next(op for op in COMPARISONS if op in token)
+            field, value = token.split(op, 1)
+            try:
+                if field not in NUMERIC_FIELDS:
+                    raise ValueError
+                terms.append(("compare", field, op, float(value)))
+            except ValueError:
+                print(f"[Warning] Ignoring invalid search term '{token}'")
+        else:
+            terms.append(("name", token))
+    return terms
+
+
+class ClipIndex:
+    """
+    Column arrays over every workspace entry so searches are vectorised numpy masks.
+
+    Static columns (name, folder, source metadata) are built once per workspace change;
+    export state, crop presence and trim point are refreshed per row for entries that
+    were touched since the last query, plus the clip on screen.
+    """
+
+    def __init__(self):
+        self.build([], [], {}, {}, {}, {})
+
+    def build(self, entries, entry_folders, folders, crop_regions, trim_points, clip_info):
+        self.entries = entries
+        self.rows = {entry["display_name"]: row for row, entry in enumerate(entries)}
+        self.source_rows = {}
+        for row, entry in enumerate(entries):
+            self.source_rows.setdefault(entry["original_path"], []).append(row)
+        self.folders = folders
+        self.folder = np.array(entry_folders, dtype=np.int32)
+        self.names = np.array([entry["display_name"].lower() for entry in entries], dtype=str)
+        self.checked = np.array([bool(entry.get("export_enabled")) for entry in entries], dtype=bool)
+        self.cropped = np.array([crop_regions.get(entry["display_name"]) is not None for entry in entries], dtype=bool)
+        self.trim = np.array([trim_points.get(entry["display_name"], 0) for entry in entries], dtype=np.int64)
+        self.info = np.full((len(entries), len(INFO_FIELDS)), np.nan)
+        for row, entry in enumerate(entries):
+            info = clip_info.get(entry["original_path"])
+            if info:
+                self.info[row] = info
+
+    def refresh_row(self, display_name, crop_regions, trim_points):
+        row = self.rows.get(display_name)
+        if row is None:
+            return
+        self.checked[row] = bool(self.entries[row].get("export_enabled"))
+        self.cropped[row] = crop_regions.get(display_name) is not None
+        self.trim[row] = trim_points.get(display_name, 0)
+
+    def set_info(self, source, info):
+        self.info[self.source_rows.get(source, [])] = info
+
+    def column(self, field):
+        if field == "trim":
+            return self.trim
+        if field == "duration":
+            fps = self.info[:, INFO_FIELDS.index("fps")]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return self.info[:, INFO_FIELDS.index("frames")] / fps
+        return self.info[:, INFO_FIELDS.index(field)]
+
+    def select(self, terms):
+        """Row numbers, in workspace order, of the entries matching every term."""
+        mask = np.ones(len(self.entries), dtype=bool)
+        for term in terms:
+            kind = term[0]
+            if kind == "flag":
+                column = self.checked if term[1] == "checked" else self.cropped
+                mask &= column == term[2]
+            elif kind == "min_edge":
+                mask &= np.minimum(self.column("width"), self.column("height")) >= term[1]
+            elif kind == "compare":
+                # Unknown metadata is NaN, which never satisfies a comparison.
+                mask &= COMPARISONS[term[2]](self.column(term[1]), term[3])
+            elif kind == "folder":
+                matching = [i for i, folder in enumerate(self.folders) if term[1] in folder.lower()]
+                mask &= np.isin(self.folder, matching)
+            else:
+                mask &= np.char.find(self.names, term[1]) >= 0
+        return np.flatnonzero(mask)
+
+
+class Workspace:
+    """
+    Several source folders open at once, with an indexed search that drives the clip list.
+
+    Each folder keeps its own entry list in folder_sessions; video_files is the filtered
+    view shown in the list, in the order set by sort_by. The list model draws its rows from
+    video_files, so a query is one model reset. Exports cover the checked entries of the whole
+    workspace and are written under the first folder.
+    """
+
+    def __init__(self, main_app):
+        self.main_app = main_app
+        self.index = ClipIndex()
+        self.dirty = set()
+        self.sort_key = None  # Entry -> sort key of the list order; None keeps workspace order.
+        self.rank = None      # Position of each index row in that order.
+        self.pool = BackgroundPool(self.store_info, self.info_finished, self.update_status)
+        self.search_timer = QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.apply_query)
+
+    def entries(self):
+        """Every entry of every workspace folder, in folder order."""
+        return self.index.entries
+
+    def open_folder(self, folder, add=False):
+        """Show a folder, either alone or added to the folders already open."""
+        if not add or not self.main_app.workspace_folders:
+            self.main_app.workspace_folders = []
+            self.main_app.folder_path = folder
+        if folder not in self.main_app.workspace_folders:
+            self.main_app.workspace_folders.append(folder)
+        self.load_folders()
+        self.main_app.loader.save_session()
+
+    def load_folders(self):
+        """Scan folders that have no saved entries yet and rebuild the index."""
+        taken = set()
+        for folder in self.main_app.workspace_folders:
+            taken.update(entry["display_name"] for entry in self.main_app.folder_sessions.get(folder, []))
+        for folder in self.main_app.workspace_folders:
+            if folder not in self.main_app.folder_sessions and os.path.isdir(folder):
+                self.main_app.folder_sessions[folder] = self.main_app.loader.scan_folder(folder, taken)
+        self.rebuild()
+
+    def rebuild(self):
+        entries, entry_folders, folders = [], [], []
+        for folder in self.main_app.workspace_folders:
+            folder_entries = self.main_app.folder_sessions.get(folder, [])
+            entries.extend(folder_entries)
+            entry_folders.extend([len(folders)] * len(folder_entries))
+            folders.append(folder)
+        with instrumentation.span("workspace_index"):
+            self.index.build(entries, entry_folders, folders, self.main_app.crop_regions,
+                             self.main_app.trim_points, self.main_app.clip_info)
+        self.dirty.clear()
+        self.rank_entries()
+
+    def sort_by(self, key):
+        """Order the list, and every later search result, by key(entry)."""
+        self.sort_key = key
+        self.rank_entries()
+
+    def rank_entries(self):
+        entries = self.index.entries
+        self.rank = None
+        if self.sort_key:
+            order = sorted(range(len(entries)), key=lambda row: self.sort_key(entries[row]))
+            self.rank = np.empty(len(entries), dtype=np.int64)
+            self.rank[order] = np.arange(len(entries))
+        self.apply_query()
+
+    def folder_of(self, display_name):
+        row = self.index.rows.get(display_name)
+        return self.index.folders[self.index.folder[row]] if row is not None else self.main_app.folder_path
+
+    def add_entry(self, entry, after):
+        """Append a new entry (e.g. a duplicate) to the folder of an existing one."""
+        self.main_app.folder_sessions.setdefault(self.folder_of(after["display_name"]), []).append(entry)
+        self.rebuild()
+
+    def touch(self, display_name):
+        """An entry's export state, crop or trim point changed outside the clip on screen."""
+        self.dirty.add(display_name)
+
+    def set_query(self, text):
+        self.main_app.workspace_query = text
+        self.search_timer.start()
+
+    def apply_query(self):
+        self.search_timer.stop()
+        started = time.perf_counter()
+        with instrumentation.span("workspace_query"):
+            self.dirty.add(self.main_app.current_video)
+            for display_name in self.dirty:
+                self.index.refresh_row(display_name, self.main_app.crop_regions, self.main_app.trim_points)
+            self.dirty.clear()
+            rows = self.index.select(parse_query(self.main_app.workspace_query))
+            if self.rank is not None:
+                rows = rows[np.argsort(self.rank[rows], kind="stable")]
+            self.show_rows(rows)
+            # New rows start visible; the "Hide below" metric filter applies to them too.
+            if self.main_app.quality_metrics.minimum() is not None:
+                self.main_app.quality_metrics.apply_filter()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.main_app.workspace_label.setText(f"{len(rows)} of {len(self.index.entries)} clip(s) in "
+                                             f"{len(self.index.folders)} folder(s) ({elapsed_ms:.1f} ms)")
+
+    def show_rows(self, rows):
+        """Make the list show these index rows, keeping the current row and the selection."""
+        entries = self.index.entries
+        video_list = self.main_app.video_list
+        model = self.main_app.clip_model
+        selected = [self.index.rows.get(self.main_app.video_files[index.row()]["display_name"])
+                    for index in video_list.selectionModel().selectedRows()
+                    if index.row() < len(self.main_app.video_files)]
+        # The model draws rows from video_files, so a new result is a single reset.
+        model.show_entries([entries[row] for row in rows])
+        positions = np.flatnonzero(np.isin(rows, [row for row in selected if row is not None]))
+        if len(positions):
+            selection = QItemSelection()
+            for start, count in position_runs(positions):
+                selection.select(model.index(start), model.index(start + count - 1))
+            video_list.selectionModel().select(selection, QItemSelectionModel.SelectionFlag.Select)
+        current = self.index.rows.get(self.main_app.current_video)
+        if current is not None:
+            position = np.flatnonzero(rows == current)
+            if len(position):
+                video_list.setCurrentRowOnly(int(position[0]))
+
+    def record_info(self, source, info):
+        """Remember metadata read while loading a clip, so searches need no probe."""
+        info = [float(value) for value in info]
+        if self.main_app.clip_info.get(source) != info:
+            self.main_app.clip_info[source] = info
+            self.index.set_info(source, info)
+
+    def index_metadata(self):
+        """Probe resolution, fps and length of every workspace source not probed yet."""
+        if self.pool.running:
+            print("Workspace metadata is already being indexed.")
+            return
+        sources = dict.fromkeys(entry["original_path"] for entry in self.index.entries)
+        jobs = [(source, (source,)) for source in sources if source not in self.main_app.clip_info]
+        if not jobs:
+            print("Workspace metadata is up to date.")
+            return
+        self.pool.submit_all(probe_info, jobs)
+
+    def store_info(self, source, info):
+        if info is None:
+            print(f"Could not probe {source}")
+            return
+        self.main_app.clip_info[source] = info
+
+    def info_finished(self):
+        self.main_app.loader.save_session()
+        self.rebuild()
+        print(f"Indexed metadata for {self.pool.total} source(s).")
+
+    def update_status(self, done, total):
+        if done < total:
+            self.main_app.workspace_label.setText(f"Indexing metadata {done}/{total}...")
+
+    def stop(self):
+        self.search_timer.stop()
+        self.pool.shutdown()